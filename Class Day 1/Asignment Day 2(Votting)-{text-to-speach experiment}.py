@@ -2,33 +2,235 @@
 # 🗳️ Enhanced Election Application — Interactive Menu System 🗳️
 # ------------------------------------------
 
-# Import required libraries
-import subprocess
-import sys
-
-# Try to import pyttsx3, install if not available
-try:
-    import pyttsx3
-except ImportError:
-    print("pyttsx3 not found. Installing it now...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pyttsx3"])
-    import pyttsx3  # Try importing again after installation
+import time
 
-# Function to make voice announcements
-def announce(msg):
+# Taken first, so the startup time covers the imports too
+script_start_time = time.perf_counter()
+
+# Import required libraries. The speech backend and the modules only needed
+# for audio are imported when first used, so the menu does not wait for them.
+import importlib.util
+import os
+import queue
+import threading
+
+# Longest time (seconds) from launch to the main menu before a warning is shown
+STARTUP_BUDGET = 0.05
+
+# Announcements waiting to be spoken, in order, as (message, kind) pairs. The
+# queue is kept short: when it is full the oldest waiting announcement is
+# dropped, since the booth has moved on.
+ANNOUNCEMENT_BACKLOG = 4
+# Kind of the announcements that only say where the menus are; a newer one
+# supersedes any still waiting
+MENU_ANNOUNCEMENT = "menu"
+announcements = queue.Queue(maxsize=ANNOUNCEMENT_BACKLOG)
+speech_thread = None
+
+# Pre-rendered announcements: each distinct message is synthesized to a WAV file
+# once, named after the message and the voice settings, and played from there on
+ANNOUNCEMENT_CACHE_DIR = "announcement_cache"
+# Command-line WAV players tried where winsound is not available
+WAV_PLAYERS = ("afplay", "aplay", "paplay")
+render_pool = None
+# The speech engine of a render pool worker process
+render_engine = None
+
+class SilentSpeechEngine:
+    """
+    Stand-in for a pyttsx3 engine where speech is not available; says nothing.
+    """
+    
+    def getProperty(self, name):
+        return None
+    
+    def say(self, msg):
+        pass
+    
+    def save_to_file(self, msg, path):
+        pass
+    
+    def runAndWait(self):
+        pass
+
+def load_speech_engine():
+    """
+    Import pyttsx3 and create an engine. Nothing is installed: without pyttsx3
+    or a working speech driver the booth stays silent.
+    
+    Returns:
+        pyttsx3.Engine or SilentSpeechEngine: The engine to speak with
+    """
+    try:
+        import pyttsx3
+        return pyttsx3.init()
+    except Exception:
+        return SilentSpeechEngine()
+
+def voice_settings(engine):
     """
-    Make a voice announcement using pyttsx3.
+    Get the settings that change how an engine sounds.
+    
+    Returns:
+        tuple: Voice, rate and volume
+    """
+    return engine.getProperty('voice'), engine.getProperty('rate'), engine.getProperty('volume')
+
+def cached_announcement_path(msg, settings):
+    """
+    Get the cache file for a message spoken with the given voice settings.
+    """
+    import hashlib
+    
+    key = hashlib.sha256(repr((msg, settings)).encode('utf-8')).hexdigest()
+    return os.path.join(ANNOUNCEMENT_CACHE_DIR, key + ".wav")
+
+def start_render_worker():
+    """
+    Render pool worker initializer: create the worker's speech engine.
+    """
+    global render_engine
+    render_engine = load_speech_engine()
+
+def render_announcement(msg):
+    """
+    Render a message to its cache file, unless it is already there. Runs in a
+    render pool worker.
+    
+    Returns:
+        str: Path of the cache file, None without a speech backend
+    """
+    if isinstance(render_engine, SilentSpeechEngine):
+        return None
+    path = cached_announcement_path(msg, voice_settings(render_engine))
+    if not os.path.exists(path):
+        # Rendered under a temporary name, so a half-written file is never played
+        partial_path = f"{path[:-4]}.{os.getpid()}.part.wav"
+        render_engine.save_to_file(msg, partial_path)
+        render_engine.runAndWait()
+        os.replace(partial_path, path)
+    return path
+
+def prerender_announcements(messages):
+    """
+    Fill the announcement cache in a process pool, in the background.
     
     Args:
-        msg (str): Message to be announced
+        messages (iterable): Messages that are going to be announced
     """
+    global render_pool
+    
+    if importlib.util.find_spec("pyttsx3") is None:
+        return
     try:
-        engine = pyttsx3.init()
-        engine.say(msg)
-        engine.runAndWait()
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        os.makedirs(ANNOUNCEMENT_CACHE_DIR, exist_ok=True)
+        if render_pool is None:
+            # Spawned, not forked: a fork could copy a lock the speech thread
+            # holds while it loads the backend, and the worker would hang on it
+            render_pool = ProcessPoolExecutor(initializer=start_render_worker,
+                                              mp_context=multiprocessing.get_context("spawn"))
+        for msg in dict.fromkeys(messages):
+            render_pool.submit(render_announcement, msg)
     except Exception as e:
-        print(f"Voice announcement failed: {e}")
-        # Continue with the program even if voice fails
+        # Announcements are synthesized as they are made instead
+        print(f"Preparing voice announcements failed: {e}")
+
+def play_wav(path):
+    """
+    Play a WAV file and wait for it to finish.
+    
+    Returns:
+        bool: True if the file was played, False if there is no way to play it
+    """
+    import shutil
+    import subprocess
+    
+    try:
+        import winsound
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+        return True
+    except ImportError:
+        pass
+    for player in WAV_PLAYERS:
+        player_path = shutil.which(player)
+        if player_path:
+            return subprocess.run([player_path, path], stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL).returncode == 0
+    return False
+
+def speak_announcements():
+    """
+    Speech thread body: create the one pyttsx3 engine and speak queued
+    announcements with it for as long as the program runs.
+    
+    Announcements are spoken in the order they were made. One with a kind is
+    skipped if a newer one of the same kind is already waiting. A message
+    already in the announcement cache is played from there.
+    """
+    engine = load_speech_engine()
+    if isinstance(engine, SilentSpeechEngine):
+        engine = None
+    else:
+        settings = voice_settings(engine)
+    
+    while True:
+        msg, kind = announcements.get()
+        with announcements.mutex:
+            superseded = kind is not None and any(waiting_kind == kind for _, waiting_kind in announcements.queue)
+        
+        if engine is not None and not superseded:
+            try:
+                cached_path = cached_announcement_path(msg, settings)
+                if not (os.path.exists(cached_path) and play_wav(cached_path)):
+                    engine.say(msg)
+                    engine.runAndWait()
+            except Exception as e:
+                print(f"Voice announcement failed: {e}")
+                # Continue with the program even if voice fails
+        
+        announcements.task_done()
+
+# Function to make voice announcements
+def announce(msg, kind=None):
+    """
+    Queue a voice announcement and return straight away; the speech thread
+    speaks it. If the queue is full the oldest waiting announcement is dropped.
+    
+    Args:
+        msg (str): Message to be announced
+        kind (str, optional): Kind of announcement, e.g. MENU_ANNOUNCEMENT; a
+            newer announcement of the same kind supersedes this one if it is
+            still waiting
+    """
+    global speech_thread
+    
+    if speech_thread is None:
+        speech_thread = threading.Thread(target=speak_announcements, name="announcer", daemon=True)
+        speech_thread.start()
+    
+    while True:
+        try:
+            announcements.put_nowait((msg, kind))
+            return
+        except queue.Full:
+            try:
+                announcements.get_nowait()
+                announcements.task_done()
+            except queue.Empty:
+                pass
+
+def finish_announcements(timeout=10):
+    """
+    Wait, up to timeout seconds, for the queued announcements to be spoken,
+    and stop rendering any that are not in the cache yet.
+    """
+    with announcements.all_tasks_done:
+        announcements.all_tasks_done.wait_for(lambda: not announcements.unfinished_tasks, timeout)
+    if render_pool is not None:
+        render_pool.shutdown(wait=False, cancel_futures=True)
 
 # ------------------------------------------
 # Functions for Data Management
@@ -653,10 +855,45 @@ def declare_winner():
 # Main Program Flow Functions
 # ------------------------------------------
 
+def election_announcements():
+    """
+    List the announcements an election with the current voters and
+    candidates can make, apart from the results.
+    
+    Returns:
+        list: Messages to be announced
+    """
+    messages = [
+        "Welcome to the Ericsson Mediation Election!",
+        "Candidates standing for election are: " + ", ".join([c.title() for c in candidates]),
+        "Let's begin voting! Each voter can vote only once.",
+        "Voting is now open. Please enter your name to cast your vote.",
+        "Authentication successful! Proceed to vote.",
+        "Please select your candidate from the list.",
+        "Vote cancelled.",
+        "All voters have completed their voting.",
+        "Please allow the next voter to proceed.",
+        "Voting failed: Candidate not recognized.",
+        "Authentication failed: SIGNUM mismatch. Vote not recorded.",
+        "Voting session ended. Let's look at the results.",
+        "Starting the election process",
+        "Opening admin menu. Authentication required.",
+        "Displaying registered voters",
+        "Displaying registered candidates",
+        "Displaying current election results",
+        "Thank you for using the Election System. Goodbye!",
+    ]
+    messages += [f"Hello {voter_name}. Please enter your SIGNUM for authentication." for voter_name in eligible_voters]
+    messages += [f"Congratulations! Your vote has been cast for {c.title()}" for c in candidates]
+    return messages
+
 def run_election():
     """
     Run the main election process from start to finish.
     """
+    # Render the announcements ahead of time, while voting goes on
+    prerender_announcements(election_announcements())
+    
     # Start with welcome message
     display_welcome_message()
     
@@ -776,28 +1013,33 @@ def menu_system():
     print(f"\n🗳️ {welcome_message} 🗳️")
     announce(welcome_message)
     
+    # Check how long the booth took to become usable
+    startup_time = time.perf_counter() - script_start_time
+    if startup_time > STARTUP_BUDGET:
+        print(f"⏱️ Startup took {startup_time * 1000:.0f} ms, over the {STARTUP_BUDGET * 1000:.0f} ms budget.")
+    
     while True:
         choice = display_main_menu()
         
         if choice == "1":
             # Start the election
-            announce("Starting the election process")
+            announce("Starting the election process", MENU_ANNOUNCEMENT)
             run_election()
         elif choice == "2":
             # Enter admin menu
-            announce("Opening admin menu. Authentication required.")
+            announce("Opening admin menu. Authentication required.", MENU_ANNOUNCEMENT)
             admin_menu_system()
         elif choice == "3":
             # View registered voters
-            announce("Displaying registered voters")
+            announce("Displaying registered voters", MENU_ANNOUNCEMENT)
             view_registered_voters()
         elif choice == "4":
             # View candidates
-            announce("Displaying registered candidates")
+            announce("Displaying registered candidates", MENU_ANNOUNCEMENT)
             view_candidates()
         elif choice == "5":
             # View current election results (NEW OPTION)
-            announce("Displaying current election results")
+            announce("Displaying current election results", MENU_ANNOUNCEMENT)
             view_current_results()
         elif choice == "6":
             # Exit the system
@@ -808,7 +1050,7 @@ def menu_system():
         else:
             error_message = "Invalid choice. Please select a number between 1 and 6."
             print(f"\n⚠️ {error_message}")
-            announce(error_message)
+            announce(error_message, MENU_ANNOUNCEMENT)
         
         # Pause before showing the menu again
         input("\nPress Enter to continue...")
@@ -816,4 +1058,8 @@ def menu_system():
 # ------------------------------------------
 # Start the Election Application
 # ------------------------------------------
-menu_system()
+# Guarded so that render pool workers can import this script
+if __name__ == "__main__":
+    menu_system()
+    # Let the goodbye message finish before the speech thread is stopped
+    finish_announcements()
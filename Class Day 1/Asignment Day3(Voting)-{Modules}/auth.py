@@ -2,8 +2,26 @@
 # Authentication Module
 # ------------------------------------------
 
+import console
 import data_manager
 
+# Admin credentials
+ADMIN_USERNAME = "1"
+ADMIN_PASSWORD = "12"
+
+def check_admin_credentials(username, password):
+    """
+    Check an administrator's username and password.
+    
+    Args:
+        username (str): Admin username
+        password (str): Admin password
+        
+    Returns:
+        bool: True if both are correct, False otherwise
+    """
+    return username == ADMIN_USERNAME and password == ADMIN_PASSWORD
+
 def authenticate_admin():
     """
     Authenticate an administrator using username and password.
@@ -14,16 +32,12 @@ def authenticate_admin():
     print("\n🔐 Admin Authentication Required 🔐")
     print("---------------------------------")
     
-    # Admin credentials
-    ADMIN_USERNAME = "1"
-    ADMIN_PASSWORD = "12"
-    
     # Get admin credentials
-    username = input("Enter admin username: ")
-    password = input("Enter admin password: ")
+    username = console.ask("Enter admin username: ")
+    password = console.ask("Enter admin password: ")
     
     # Validate credentials
-    if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
+    if check_admin_credentials(username, password):
         print("✅ Admin authentication successful.")
         return True
     else:
@@ -41,7 +55,23 @@ def authenticate_voter(voter_name, signum_credential):
     Returns:
         bool: True if authentication is successful, False otherwise
     """
-    if voter_name in data_manager.eligible_voters:
-        if signum_credential == data_manager.eligible_voters[voter_name]:
-            return True
-    return False
\ No newline at end of file
+    return find_authenticated_voter(voter_name, signum_credential) >= 0
+
+def find_authenticated_voter(voter_name, signum_credential):
+    """
+    Authenticate a voter and return their registry ID.
+    
+    Args:
+        voter_name (str): Name of the voter
+        signum_credential (str): SIGNUM credential provided by the voter
+        
+    Returns:
+        int: The voter's ID if they are eligible and the SIGNUM matches, -1 otherwise
+    """
+    voter_id = data_manager.registry.find(voter_name)
+    if voter_id >= 0 and data_manager.registry.is_eligible(voter_id):
+        if data_manager.voted_elsewhere(voter_id):
+            return -1
+        if signum_credential == data_manager.registry.signums[voter_id]:
+            return voter_id
+    return -1
\ No newline at end of file
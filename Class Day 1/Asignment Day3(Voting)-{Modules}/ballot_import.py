@@ -0,0 +1,124 @@
+# ------------------------------------------
+# Ballot Import Module - Records scanned ballots from CSV or JSONL files
+# ------------------------------------------
+#
+# Each ballot goes through the same checks as a vote at the booth: the voter
+# must be registered, must not have voted yet and must give the right SIGNUM,
+# and the candidate must be standing. Accepted ballots are counted straight
+# away and journaled in batches; rejected ones are written to a report.
+#
+#   CSV:   voter,signum,candidate        (an optional voter,signum,candidate
+#                                         header row is skipped and reported)
+#   JSONL: {"voter": "...", "signum": "...", "candidate": "..."}
+#
+# A ranked ballot lists the voter's further choices in order after the first:
+# as extra CSV columns, or as a "later_choices" list in JSONL.
+#
+# Approval and score ballots carry marks instead of a candidate, each either
+# a candidate name (an approval, scoring 1) or "name:score":
+#
+#   CSV:   voter,signum,mark,mark,...
+#   JSONL: {"voter": "...", "signum": "...", "marks": ["...", "...:3"]}
+
+import voter_import
+import engine
+
+# Number of ballots journaled together
+BALLOT_BATCH_SIZE = 10000
+
+BALLOT_FIELDS = ("voter", "signum", "candidate")
+LATER_CHOICES_FIELD = "later_choices"
+
+SCORED_BALLOT_FIELDS = ("voter", "signum")
+MARKS_FIELD = "marks"
+
+def parse_marks(marks):
+    """
+    Turn the marks of an approval or score ballot into (candidate name, score) pairs.
+
+    Args:
+        marks (list): Candidate names, each optionally followed by ":score"
+
+    Returns:
+        list: (candidate name, score) pairs; an unmarked score is 1
+    """
+    scores = []
+    for mark in marks:
+        candidate_name, separator, score = mark.rpartition(":")
+        if separator and score.strip().isdigit():
+            scores.append((candidate_name, int(score)))
+        elif mark.strip():
+            scores.append((mark, 1))
+    return scores
+
+def record_ballot_batch(entries, reject_file=None, scored=False):
+    """
+    Cast a batch of ballots and report the rejected ones in file order.
+
+    Args:
+        entries (list): (line number, values, problem) records from read_records()
+        reject_file: Open reject report, or None
+        scored (bool): The entries are approval or score ballots
+
+    Returns:
+        tuple: (number of ballots recorded, number of ballots rejected)
+    """
+    if scored:
+        result_codes = iter(engine.election.cast_scored_votes(
+            (values[0], values[1], parse_marks(values[2] if len(values) > 2 else ()))
+            for _, values, _ in entries if values is not None))
+    else:
+        result_codes = iter(engine.election.cast_votes(values for _, values, _ in entries if values is not None))
+    recorded_count = 0
+    rejected_count = 0
+    for line_number, values, problem in entries:
+        if values is not None:
+            result = next(result_codes)
+            if result == engine.OK:
+                recorded_count += 1
+                continue
+            problem = engine.RESULT_MESSAGES[result]
+        rejected_count += 1
+        if reject_file is not None:
+            reject_file.write(f"line {line_number}: {problem}\n")
+    return recorded_count, rejected_count
+
+def load_ballot_file(file_path, reject_path=None, batch_size=BALLOT_BATCH_SIZE, scored=False):
+    """
+    Record every valid ballot in a ballot file.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl ballot file
+        reject_path (str, optional): File to write one line per rejected ballot to
+        batch_size (int): Number of ballots journaled at a time
+        scored (bool): The file holds approval or score ballots
+
+    Returns:
+        tuple: (number of ballots recorded, number of ballots rejected)
+    """
+    recorded_count = 0
+    rejected_count = 0
+
+    reject_file = open(reject_path, 'w', encoding='utf-8') if reject_path else None
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            batch = []
+            if scored:
+                records = voter_import.read_records(file, SCORED_BALLOT_FIELDS, MARKS_FIELD)
+            else:
+                records = voter_import.read_records(file, BALLOT_FIELDS, LATER_CHOICES_FIELD)
+            for entry in records:
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    recorded, rejected = record_ballot_batch(batch, reject_file, scored)
+                    recorded_count += recorded
+                    rejected_count += rejected
+                    batch = []
+            recorded, rejected = record_ballot_batch(batch, reject_file, scored)
+            recorded_count += recorded
+            rejected_count += rejected
+    finally:
+        if reject_file is not None:
+            reject_file.close()
+
+    return recorded_count, rejected_count
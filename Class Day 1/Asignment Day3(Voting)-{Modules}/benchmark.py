@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# ------------------------------------------
+# Benchmark Module - Reproducible load test of the voting path
+# ------------------------------------------
+#
+# Builds a synthetic election (voters, candidates and a vote distribution
+# drawn from a fixed seed), drives the voting path through the same functions
+# the menus use, and prints one JSON report per roll size:
+#
+#   python benchmark.py --voters 1000 100000 1000000 --candidates 8 --seed 1
+#
+# Each operation reports its count, ops/sec and p50/p99 latency; each run
+# reports the process's peak RSS. Several roll sizes are run in separate
+# processes, so every peak RSS belongs to one size only. The admin paths are
+# driven with scripted answers to their prompts, and everything they print
+# is discarded.
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import console
+import data_manager
+import auth
+import voting
+import results
+import candidate_manager
+import voter_manager
+import file_manager
+from registry import VoterRegistry
+
+# Vote distributions: how likely each candidate is to be chosen, by place
+DISTRIBUTIONS = {
+    "uniform": lambda candidate_count: [1] * candidate_count,
+    "zipf": lambda candidate_count: [1 / place for place in range(1, candidate_count + 1)],
+    "close": lambda candidate_count: [1.0, 0.99] + [0.5] * (candidate_count - 2),
+}
+
+# Repetitions of the operations whose cost grows with the roll
+DEFAULT_SAMPLE_OPS = 10000
+DEFAULT_FILE_WRITES = 3
+DEFAULT_REMOVALS = 5
+
+def peak_rss():
+    """
+    Returns:
+        int: Peak resident set size of this process in bytes, or None where
+            it cannot be read
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def summarize(latencies, elapsed):
+    """
+    Summarize the per-call latencies of one operation.
+
+    Args:
+        latencies (array): Nanoseconds taken by each call
+        elapsed (float): Seconds taken by all the calls together
+
+    Returns:
+        dict: Count, ops/sec, p50 and p99 latency in microseconds
+    """
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "ops": count,
+        "ops_per_sec": round(count / elapsed, 1) if elapsed > 0 else None,
+        "p50_us": round(ordered[(count - 1) // 2] / 1000, 3) if count else None,
+        "p99_us": round(ordered[(count - 1) * 99 // 100] / 1000, 3) if count else None,
+    }
+
+def measure(operation, arguments):
+    """
+    Call an operation once per argument tuple, timing every call.
+
+    Args:
+        operation (callable): The function to time
+        arguments (iterable): An argument tuple per call
+
+    Returns:
+        dict: As from summarize()
+    """
+    latencies = array('q')
+    clock = time.perf_counter_ns
+    start_time = time.perf_counter()
+    for call_arguments in arguments:
+        call_start = clock()
+        operation(*call_arguments)
+        latencies.append(clock() - call_start)
+    return summarize(latencies, time.perf_counter() - start_time)
+
+def build_election(voter_count, candidate_count):
+    """
+    Replace the election data with a synthetic roll and candidates nobody has voted for.
+
+    Returns:
+        tuple: Voter names, SIGNUMs and candidate names
+    """
+    data_manager.initialize()
+    candidate_names = [f"candidate {number}" for number in range(candidate_count)]
+    data_manager.load_candidates(candidate_names, array('q', bytes(8 * candidate_count)), range(candidate_count))
+    voter_names = [f"voter {number}" for number in range(voter_count)]
+    signums = [f"e{number:07x}" for number in range(voter_count)]
+    data_manager.registry = VoterRegistry()
+    data_manager.registry.add_many(voter_names, signums)
+    return voter_names, signums, candidate_names
+
+def run_benchmark(voter_count, candidate_count, distribution, seed, sample_ops, file_writes, removals):
+    """
+    Run every operation against one synthetic election.
+
+    Returns:
+        dict: The report for this roll size
+    """
+    rng = random.Random(seed)
+    setup_start = time.perf_counter()
+    voter_names, signums, candidate_names = build_election(voter_count, candidate_count)
+    voting_order = list(range(voter_count))
+    rng.shuffle(voting_order)
+    choices = rng.choices(candidate_names, DISTRIBUTIONS[distribution](candidate_count), k=voter_count)
+    setup_seconds = time.perf_counter() - setup_start
+    operations = {}
+
+    # Authentication of voters who have not voted yet, one in ten with a wrong SIGNUM
+    sample = rng.sample(range(voter_count), min(sample_ops, voter_count))
+    operations["auth.authenticate_voter"] = measure(auth.authenticate_voter, (
+        (voter_names[voter_id], signums[voter_id] if voter_id % 10 else "wrong") for voter_id in sample))
+
+    # Every voter votes, in a shuffled order
+    operations["voting.record_vote"] = measure(voting.record_vote, (
+        (voter_names[voter_id], choices[voter_id]) for voter_id in voting_order))
+
+    operations["results.find_winners"] = measure(results.find_winners, [()] * sample_ops)
+
+    with console.scripted([]):
+        # A full state save every time, not a delta against the last one
+        def save_full_state():
+            file_manager.saved_state_path = None
+            file_manager.save_election_state()
+        operations["file_manager.save_election_state"] = measure(save_full_state, [()] * file_writes)
+        operations["file_manager.write_final_results"] = measure(file_manager.write_final_results, [()] * file_writes)
+
+    # Admin removals answer the admin login, the name and the confirmation
+    removed_voters = [voter_names[voter_id] for voter_id in voting_order[:removals]]
+    with console.scripted([answer for voter_name in removed_voters
+                           for answer in (auth.ADMIN_USERNAME, auth.ADMIN_PASSWORD, voter_name, "Y")]):
+        operations["voter_manager.remove_voter"] = measure(voter_manager.remove_voter, [()] * len(removed_voters))
+    removed_candidates = candidate_names[candidate_count - min(removals, candidate_count - 1):]
+    with console.scripted([answer for candidate_name in removed_candidates
+                           for answer in (auth.ADMIN_USERNAME, auth.ADMIN_PASSWORD, candidate_name, "Y")]):
+        operations["candidate_manager.remove_candidate"] = measure(candidate_manager.remove_candidate,
+                                                                   [()] * len(removed_candidates))
+
+    return {
+        "voters": voter_count,
+        "candidates": candidate_count,
+        "distribution": distribution,
+        "seed": seed,
+        "setup_seconds": round(setup_seconds, 3),
+        "operations": operations,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+def parse_arguments():
+    """
+    Parse the command-line options.
+
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+    parser = argparse.ArgumentParser(description="Load test of the election voting path")
+    parser.add_argument("--voters", metavar="N", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="roll sizes to run, each in its own process (default 1000 10000 100000)")
+    parser.add_argument("--candidates", metavar="N", type=int, default=8,
+                        help="number of candidates (default 8)")
+    parser.add_argument("--distribution", choices=sorted(DISTRIBUTIONS), default="zipf",
+                        help="how the votes are spread over the candidates (default zipf)")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="random seed for the roll, the votes and the samples (default 1)")
+    parser.add_argument("--sample-ops", metavar="N", type=int, default=DEFAULT_SAMPLE_OPS,
+                        help=f"authentications and winner lookups to time (default {DEFAULT_SAMPLE_OPS})")
+    parser.add_argument("--file-writes", metavar="N", type=int, default=DEFAULT_FILE_WRITES,
+                        help=f"writes of each file to time (default {DEFAULT_FILE_WRITES})")
+    parser.add_argument("--removals", metavar="N", type=int, default=DEFAULT_REMOVALS,
+                        help=f"voters and candidates to remove through the admin menu (default {DEFAULT_REMOVALS})")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the JSON report to FILE instead of standard output")
+    arguments = parser.parse_args()
+    if arguments.candidates < 2:
+        parser.error("--candidates must be at least 2")
+    return arguments
+
+def main():
+    arguments = parse_arguments()
+    script_path = os.path.abspath(__file__)
+    output_path = os.path.abspath(arguments.output) if arguments.output else None
+
+    if len(arguments.voters) == 1:
+        # The files the writers produce go to a scratch directory
+        working_directory = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix="election-benchmark-") as scratch_directory:
+            os.chdir(scratch_directory)
+            try:
+                runs = [run_benchmark(arguments.voters[0], arguments.candidates, arguments.distribution,
+                                      arguments.seed, arguments.sample_ops, arguments.file_writes,
+                                      arguments.removals)]
+            finally:
+                os.chdir(working_directory)
+    else:
+        runs = []
+        for voter_count in arguments.voters:
+            command = [sys.executable, script_path, "--voters", str(voter_count),
+                       "--candidates", str(arguments.candidates), "--distribution", arguments.distribution,
+                       "--seed", str(arguments.seed), "--sample-ops", str(arguments.sample_ops),
+                       "--file-writes", str(arguments.file_writes), "--removals", str(arguments.removals)]
+            finished = subprocess.run(command, capture_output=True, text=True, check=True)
+            runs.extend(json.loads(finished.stdout)["runs"])
+
+    report = {
+        "benchmark": "election voting path",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
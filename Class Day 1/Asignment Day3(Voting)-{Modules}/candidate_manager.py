@@ -2,8 +2,11 @@
 # Candidate Management Module
 # ------------------------------------------
 
+import console
 import data_manager
 import auth
+import journal
+import engine
 
 def add_candidate():
     """
@@ -25,17 +28,16 @@ def add_candidate():
         print(f"- {candidate_name.title()}")
     
     # Get new candidate name
-    new_candidate = input("\nEnter the name of the new candidate: ").lower().strip()
+    new_candidate = console.ask("\nEnter the name of the new candidate: ").lower().strip()
     
-    # Validate input
-    if not new_candidate:
+    # Add the new candidate with zero votes
+    result = engine.election.add_candidate(new_candidate)
+    if result == engine.EMPTY_NAME:
         return "⚠️ Candidate name cannot be empty."
-        
-    if new_candidate in data_manager.candidates:
+    if result == engine.ALREADY_CANDIDATE:
         return f"⚠️ {new_candidate.title()} is already a candidate."
-    
-    # Add the new candidate with zero votes
-    data_manager.candidates[new_candidate] = 0
+    if result != engine.OK:
+        return f"⚠️ Candidate name {engine.RESULT_MESSAGES[result]}."
     return f"✅ {new_candidate.title()} has been added as a candidate."
 
 def remove_candidate():
@@ -58,7 +60,7 @@ def remove_candidate():
         print(f"- {candidate_name.title()} (Current votes: {votes})")
     
     # Get candidate to remove
-    candidate_to_remove = input("\nEnter the name of the candidate to remove: ").lower().strip()
+    candidate_to_remove = console.ask("\nEnter the name of the candidate to remove: ").lower().strip()
     
     # Validate input
     if not candidate_to_remove:
@@ -69,20 +71,12 @@ def remove_candidate():
     
     # Check if candidate has votes
     if data_manager.candidates[candidate_to_remove] > 0:
-        confirm = input(f"⚠️ WARNING: {candidate_to_remove.title()} has {data_manager.candidates[candidate_to_remove]} votes. Removing will affect election results. Continue? (Y/N): ").upper()
+        confirm = console.ask(f"⚠️ WARNING: {candidate_to_remove.title()} has {data_manager.candidates[candidate_to_remove]} votes. Removing will affect election results. Continue? (Y/N): ").upper()
         if confirm != "Y":
             return "Candidate removal cancelled."
-        
-        # Need to update voting history to remove references to this candidate
-        voters_affected = [voter for voter, candidate in data_manager.voting_history.items() if candidate == candidate_to_remove]
-        for voter in voters_affected:
-            del data_manager.voting_history[voter]
-            # Make these voters eligible to vote again
-            if voter in data_manager.voter_credentials:
-                data_manager.eligible_voters[voter] = data_manager.voter_credentials[voter]
     
     # Remove the candidate
-    del data_manager.candidates[candidate_to_remove]
+    engine.election.remove_candidate(candidate_to_remove)
     
     return f"✅ {candidate_to_remove.title()} has been removed from the candidates list."
 
@@ -96,9 +90,33 @@ def leader_onboard(candidate_name):
     Returns:
         str: Confirmation message
     """
-    data_manager.candidates.update({candidate_name: 0})
+    data_manager.add_candidate_id(candidate_name)
+    data_manager.mark_changed("add_candidate", candidate_name)
+    journal.record("add_candidate", candidate=candidate_name)
     return "Leader name added"
 
+def withdraw_candidate(candidate_name):
+    """
+    Remove a candidate from the election and make their voters eligible again.
+    
+    Args:
+        candidate_name (str): Name of the candidate to remove
+    """
+    candidate_id = data_manager.candidate_ids[candidate_name]
+    
+    # Need to withdraw the ballots cast for this candidate, found through the
+    # inverted index rather than by scanning every ballot
+    voters_affected = data_manager.voters_for(candidate_id)
+    for voter_id in voters_affected:
+        data_manager.withdraw_ballot(voter_id)
+        # Make these voters eligible to vote again
+        data_manager.registry.set_eligible(voter_id)
+    
+    # Remove the candidate
+    data_manager.remove_candidate_id(candidate_name)
+    data_manager.mark_changed("remove_candidate", candidate_name)
+    journal.record("remove_candidate", candidate=candidate_name)
+
 def is_valid_candidate(candidate_name):
     """
     Check if the candidate name provided is a valid candidate in the election.
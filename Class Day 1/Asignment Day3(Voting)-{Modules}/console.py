@@ -0,0 +1,126 @@
+# ------------------------------------------
+# Console Module - Where the interactive menus read their answers from
+# ------------------------------------------
+#
+# Every prompt in the menus goes through ask(), which reads from the current
+# console: the terminal normally, or a recorded transcript while a session is
+# replayed. A replayed session runs at full speed with no terminal, and what
+# it prints is captured, so whole interactive flows (admin paths included) can
+# be benchmarked and compared against a known-good output.
+#
+# A transcript is a text file with one answer per line, in the order the
+# prompts ask for them: menu choices, names, SIGNUMs, confirmations and the
+# empty lines that answer "Press Enter to continue...".
+
+import contextlib
+import io
+import os
+
+class TerminalConsole:
+    """
+    Reads answers typed at the terminal.
+    """
+
+    def read(self, prompt):
+        return input(prompt)
+
+class ReplayConsole:
+    """
+    Answers prompts from a recorded transcript, one answer per prompt.
+    """
+
+    def __init__(self, answers, echo=True):
+        """
+        Args:
+            answers (iterable): The answers, in order
+            echo (bool): Print each prompt with its answer, as a terminal would show them
+        """
+        self.answers = iter(answers)
+        self.echo = echo
+
+    def read(self, prompt):
+        try:
+            answer = next(self.answers)
+        except StopIteration:
+            raise EOFError("the transcript has no answers left") from None
+        if self.echo:
+            print(prompt + answer)
+        return answer
+
+# The console ask() reads from
+current = TerminalConsole()
+
+def ask(prompt=""):
+    """
+    Prompt for one line of input on the current console.
+
+    Args:
+        prompt (str): Text shown before the answer
+
+    Returns:
+        str: The answer, without its line ending
+
+    Raises:
+        EOFError: If there is no more input
+    """
+    return current.read(prompt)
+
+@contextlib.contextmanager
+def scripted(answers, output=None, echo=True):
+    """
+    Answer the prompts made inside the with block from a list, and send
+    everything printed there to output.
+
+    Args:
+        answers (iterable): The answers, in order
+        output (file, optional): Where printed text goes; discarded if omitted
+        echo (bool): Print each prompt with its answer
+    """
+    global current
+
+    previous = current
+    current = ReplayConsole(answers, echo)
+    try:
+        if output is None:
+            with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+                yield
+        else:
+            with contextlib.redirect_stdout(output):
+                yield
+    finally:
+        current = previous
+
+def read_transcript(file_path):
+    """
+    Read a recorded session transcript.
+
+    Args:
+        file_path (str): Path to the transcript, one answer per line
+
+    Returns:
+        list: The answers, in order
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read().splitlines()
+
+def replay_session(answers, session):
+    """
+    Run an interactive flow with its answers taken from a transcript.
+
+    Args:
+        answers (list): The answers, in order
+        session (callable): The flow to run, e.g. main.menu_system
+
+    Returns:
+        tuple: Contains:
+            - str: Everything the flow printed, prompts and answers included
+            - bool: False if the transcript ran out before the flow finished
+    """
+    output = io.StringIO()
+    finished = True
+    with scripted(answers, output):
+        try:
+            session()
+        except EOFError:
+            finished = False
+    return output.getvalue(), finished
@@ -2,24 +2,585 @@
 # Data Management Module
 # ------------------------------------------
 
+import os
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+
+import journal
+import snapshot
+import results
+from registry import VoterRegistry, NO_VOTE
+from leaderboard import Leaderboard
+
 # Global variables for storing application data
-voter_credentials = {}
-candidates = {}
-eligible_voters = {}
-voting_history = {}
 
-def initialize():
+# Candidates are interned to small integer IDs; a removed candidate leaves a
+# free slot (name None, zero votes) that the next new candidate reuses
+candidate_ids = {}
+candidate_names = []
+vote_counts = array('q')
+free_candidate_ids = []
+
+# Inverted index: the voter IDs that voted for each candidate ID. A withdrawn
+# ballot leaves a stale entry behind; an entry is current only if the voter's
+# ballot still names that candidate. (A ballot is only withdrawn while its
+# candidate stays when the voter is removed, so a stale entry never revives.)
+candidate_voters = []
+
+# Live candidate IDs kept in order of votes, updated with every ballot
+leaderboard = Leaderboard(vote_counts)
+
+# Every voter's name, SIGNUM, ballot (chosen candidate ID) and eligibility
+# live in one registry indexed by voter ID
+registry = VoterRegistry()
+
+# Voter IDs in the order their ballots were cast. Withdrawn ballots leave
+# stale entries behind; an entry is current only if the registry's
+# vote_positions agrees.
+vote_order = array('i')
+votes_cast = 0
+
+# Ranked ballots: voter ID -> the voter's later choices in order, as a tuple of
+# candidate names (names rather than IDs, since a freed ID may be reused by a
+# new candidate). The first choice is the ballot in the registry; single-choice
+# ballots have no entry.
+ballot_rankings = {}
+
+# Approval and score ballots: one row of score_width bytes per ballot in
+# score_matrix, holding the voter's score (0-255) for each candidate ID, so a
+# candidate's total is the sum of one column. score_rows maps voter ID to row;
+# a withdrawn ballot's row is zeroed and left in place. The first choice is
+# still the ballot in the registry.
+score_width = 0
+score_matrix = bytearray()
+score_rows = {}
+
+# Voter IDs of the ballots cast since this polling station last exported its
+# count (see station_sync), in casting order, so an export only looks at them.
+# A voter whose ballot was withdrawn stays listed until the export skips them.
+unexported_ballots = array('i')
+
+# Tally and ballot claims shared with other booth processes (a
+# shared_tally.SharedTally), or None when this process counts alone
+shared_tally = None
+
+# Held while the election data is changed or copied, so a thread never sees
+# another thread's change half done. Single-threaded use never contends for it.
+state_lock = threading.RLock()
+
+class CandidateTally(Mapping):
+    """
+    Read-only view of the tally as {candidate name: votes}, in the order the
+    candidates were added.
+    """
+    
+    def __getitem__(self, candidate_name):
+        if shared_tally is not None:
+            return shared_tally.count(candidate_ids[candidate_name])
+        return vote_counts[candidate_ids[candidate_name]]
+    
+    def __contains__(self, candidate_name):
+        return candidate_name in candidate_ids
+    
+    def __iter__(self):
+        return iter(candidate_ids)
+    
+    def __len__(self):
+        return len(candidate_ids)
+
+class VoterCredentials(Mapping):
+    """
+    Read-only view of the registry as {voter name: SIGNUM}, in registration order.
+    """
+    
+    def __getitem__(self, voter_name):
+        voter_id = registry.find(voter_name)
+        if voter_id < 0:
+            raise KeyError(voter_name)
+        return registry.signums[voter_id]
+    
+    def __contains__(self, voter_name):
+        return registry.find(voter_name) >= 0
+    
+    def __iter__(self):
+        return map(registry.names.__getitem__, registry.voter_ids())
+    
+    def __len__(self):
+        return len(registry)
+
+class EligibleVoters(Mapping):
+    """
+    Read-only view of the voters who may still vote, as {voter name: SIGNUM}.
+    """
+    
+    def __getitem__(self, voter_name):
+        voter_id = registry.find(voter_name)
+        if voter_id < 0 or not registry.is_eligible(voter_id):
+            raise KeyError(voter_name)
+        return registry.signums[voter_id]
+    
+    def __contains__(self, voter_name):
+        voter_id = registry.find(voter_name)
+        return voter_id >= 0 and registry.is_eligible(voter_id)
+    
+    def __iter__(self):
+        return map(registry.names.__getitem__, registry.eligible_ids())
+    
+    def __len__(self):
+        return registry.eligible_count
+
+class VotingHistory(Mapping):
+    """
+    Read-only view of the ballots as {voter name: candidate name}, in the order
+    the votes were cast.
+    """
+    
+    def __getitem__(self, voter_name):
+        voter_id = registry.find(voter_name)
+        if voter_id < 0 or registry.ballots[voter_id] == NO_VOTE:
+            raise KeyError(voter_name)
+        return candidate_names[registry.ballots[voter_id]]
+    
+    def __contains__(self, voter_name):
+        voter_id = registry.find(voter_name)
+        return voter_id >= 0 and registry.ballots[voter_id] != NO_VOTE
+    
+    def __iter__(self):
+        vote_positions = registry.vote_positions
+        for position, voter_id in enumerate(vote_order):
+            if vote_positions[voter_id] == position:
+                yield registry.names[voter_id]
+    
+    def __len__(self):
+        return votes_cast
+
+candidates = CandidateTally()
+voter_credentials = VoterCredentials()
+eligible_voters = EligibleVoters()
+voting_history = VotingHistory()
+
+# Change tracking used for incremental saves. change_log lists every change
+# made after version change_log_start.
+MAX_CHANGE_LOG = 100000
+data_version = 0
+change_log = []
+change_log_start = 0
+
+class StateCopy:
+    """
+    A consistent copy of the election data, for reading on one thread while
+    another keeps changing the live data. state_lock is held only while the
+    copy is taken.
+
+    A plain copy takes the counts and the change log, so it holds the lock
+    for O(candidates + changes). A full copy also takes the columns needed to
+    list the ballots (voter names, ballots, voting order and eligibility) and
+    holds the lock for O(voters) more, but only for flat array and list
+    copies. SIGNUMs and the name index are not copied, and the per-voter
+    text is built from the copy after the lock is released.
+    """
+    
+    def __init__(self, full=False, recent_count=0, top_count=0):
+        """
+        Args:
+            full (bool): Also copy the ballots, voter names and voting order
+            recent_count (int): Number of most recent votes to copy
+            top_count (int): Number of leading candidates to copy, as from results.top_k()
+        """
+        with state_lock:
+            self.data_version = data_version
+            self.change_log = list(change_log)
+            self.change_log_start = change_log_start
+            self.candidates = dict(candidates.items())
+            self.leading_candidates, self.highest_vote_count = results.find_winners()
+            self.top_candidates = results.top_k(top_count)
+            self.voter_count = len(registry)
+            self.votes_cast = results.total_votes()
+            self.eligible_count = registry.eligible_count
+            self.recent_votes = recent_votes(recent_count)
+            self.registry = registry.ballot_copy() if full else None
+            self.vote_order = vote_order[:] if full else None
+            self.candidate_names = candidate_names[:] if full else None
+    
+    def voting_history(self):
+        """
+        Yield (voter name, candidate name) for each ballot in voting order. Full copies only.
+        """
+        vote_positions = self.registry.vote_positions
+        for position, voter_id in enumerate(self.vote_order):
+            if vote_positions[voter_id] == position:
+                yield self.registry.names[voter_id], self.candidate_names[self.registry.ballots[voter_id]]
+    
+    def eligible_voters(self):
+        """
+        Yield the names of the voters who may still vote. Full copies only.
+        """
+        return map(self.registry.names.__getitem__, self.registry.eligible_ids())
+
+def initialize(snapshot_path=None):
     """
     Initialize the application's data structures.
+    
+    Args:
+        snapshot_path (str, optional): Binary snapshot to restore from instead of
+            the built-in data, if the file exists
     """
-    global voter_credentials, candidates, eligible_voters, voting_history
+    global registry, vote_order, votes_cast, data_version, change_log_start, ballot_rankings
+    global score_width, score_matrix, unexported_ballots
+    
+    # Bring back a saved election if there is one
+    if snapshot_path and os.path.exists(snapshot_path):
+        restored = snapshot.read_snapshot(snapshot_path)
+        load_candidates(restored["candidate_names"], restored["vote_counts"], restored["candidate_order"],
+                        restored["candidate_voters"])
+        registry = restored["registry"]
+        vote_order = restored["vote_order"]
+        votes_cast = len(vote_order)
+        ballot_rankings = restored["ballot_rankings"]
+        score_width = restored["score_width"]
+        score_matrix = restored["score_matrix"]
+        score_rows.clear()
+        score_rows.update(restored["score_rows"])
+        unexported_ballots = restored["unexported_ballots"]
+        data_version = restored["data_version"]
+        # The state file has not seen this data yet, so the next save is a full one
+        change_log.clear()
+        change_log_start = data_version
+        return
     
     # Initialize the data
-    voter_credentials, candidates = initialize_data()
-    # Make a copy for tracking who is still eligible to vote
-    eligible_voters = voter_credentials.copy()
-    # Clear voting history
-    voting_history = {}
+    voter_database, candidate_database = initialize_data()
+    # Intern the candidates and register the voters; nobody has voted yet
+    candidate_list = list(candidate_database)
+    load_candidates(candidate_list, array('q', candidate_database.values()), range(len(candidate_list)))
+    registry = VoterRegistry()
+    registry.add_many(list(voter_database), list(voter_database.values()))
+    vote_order = array('i')
+    votes_cast = 0
+    ballot_rankings = {}
+    score_width = 0
+    score_matrix = bytearray()
+    score_rows.clear()
+    unexported_ballots = array('i')
+    # A reset cannot be described as a delta, so it forces a full save
+    mark_changed("reset")
+
+def load_candidates(names, counts, order, voters=None):
+    """
+    Replace the candidate tables.
+    
+    Args:
+        names (list): Candidate name per ID, None for a free slot
+        counts (array): Vote count per ID
+        order (iterable): Live candidate IDs in display order
+        voters (list, optional): Array of voter IDs per candidate ID; nobody
+            has voted if omitted
+    """
+    global candidate_names, vote_counts, candidate_voters, leaderboard
+    
+    candidate_names = names
+    vote_counts = counts
+    candidate_voters = voters if voters is not None else [array('i') for _ in names]
+    candidate_ids.clear()
+    candidate_ids.update((names[candidate_id], candidate_id) for candidate_id in order)
+    leaderboard = Leaderboard(vote_counts, candidate_ids.values())
+    free_candidate_ids[:] = [candidate_id for candidate_id, name in enumerate(names) if name is None]
+
+def add_candidate_id(candidate_name):
+    """
+    Give a new candidate an ID with zero votes, reusing a free slot if there is one.
+    
+    Args:
+        candidate_name (str): Name of the new candidate
+        
+    Returns:
+        int: The candidate's ID
+    """
+    if free_candidate_ids:
+        candidate_id = free_candidate_ids.pop()
+        candidate_names[candidate_id] = candidate_name
+        vote_counts[candidate_id] = 0
+    else:
+        candidate_id = len(candidate_names)
+        candidate_names.append(candidate_name)
+        vote_counts.append(0)
+        candidate_voters.append(array('i'))
+    candidate_ids[candidate_name] = candidate_id
+    leaderboard.add(candidate_id)
+    return candidate_id
+
+def remove_candidate_id(candidate_name):
+    """
+    Free a candidate's ID. Their ballots must already have been withdrawn.
+    
+    Args:
+        candidate_name (str): Name of the candidate to remove
+    """
+    candidate_id = candidate_ids.pop(candidate_name)
+    leaderboard.remove(candidate_id)
+    candidate_names[candidate_id] = None
+    vote_counts[candidate_id] = 0
+    candidate_voters[candidate_id] = array('i')
+    free_candidate_ids.append(candidate_id)
+    # The next candidate to take this ID starts with no scores
+    if candidate_id < score_width:
+        score_matrix[candidate_id::score_width] = bytes(len(score_matrix) // score_width)
+
+def cast_ballot(voter_id, candidate_id, later_choices=(), scores=()):
+    """
+    Store a voter's ballot, count it and close their eligibility.
+    
+    Args:
+        voter_id (int): ID of the voter
+        candidate_id (int): ID of the chosen candidate
+        later_choices (tuple): Names of the voter's further choices, in order
+        scores (tuple): (candidate name, score) pairs of an approval or score ballot
+    """
+    global votes_cast
+    
+    vote_counts[candidate_id] += 1
+    leaderboard.promote(candidate_id)
+    if shared_tally is not None:
+        shared_tally.add(candidate_id, 1)
+    candidate_voters[candidate_id].append(voter_id)
+    registry.ballots[voter_id] = candidate_id
+    registry.vote_positions[voter_id] = len(vote_order)
+    registry.clear_eligible(voter_id)
+    vote_order.append(voter_id)
+    votes_cast += 1
+    unexported_ballots.append(voter_id)
+    if later_choices:
+        ballot_rankings[voter_id] = later_choices
+    if scores:
+        store_scores(voter_id, scores)
+
+def cast_ballots(ballots):
+    """
+    Store and count a batch of ballots as cast_ballot() does for each, but
+    with the tally, the leaderboard and the voting order brought up to date
+    once for the whole batch. The voters' eligibility is left to the caller,
+    which closes each as it accepts the ballot so that a second ballot from
+    the same voter is refused.
+    
+    Args:
+        ballots (list): (voter ID, candidate ID, later choices) triples, in
+            voting order, with no voter more than once
+    """
+    global votes_cast
+    
+    ballot_column = registry.ballots
+    vote_positions = registry.vote_positions
+    position = len(vote_order)
+    for voter_id, candidate_id, later_choices in ballots:
+        candidate_voters[candidate_id].append(voter_id)
+        ballot_column[voter_id] = candidate_id
+        vote_positions[voter_id] = position
+        position += 1
+        if later_choices:
+            ballot_rankings[voter_id] = later_choices
+    voter_ids = array('i', [voter_id for voter_id, _, _ in ballots])
+    vote_order.extend(voter_ids)
+    unexported_ballots.extend(voter_ids)
+    votes_cast += len(ballots)
+    
+    added_votes = Counter(candidate_id for _, candidate_id, _ in ballots)
+    if len(ballots) <= len(leaderboard):
+        # A batch smaller than the field moves its candidates one step at a time
+        for _, candidate_id, _ in ballots:
+            vote_counts[candidate_id] += 1
+            leaderboard.promote(candidate_id)
+    else:
+        # A larger one is counted per candidate and the field re-sorted once
+        for candidate_id, vote_count in added_votes.items():
+            vote_counts[candidate_id] += vote_count
+        leaderboard.recount()
+    if shared_tally is not None:
+        for candidate_id, vote_count in added_votes.items():
+            shared_tally.add(candidate_id, vote_count)
+
+def store_scores(voter_id, scores):
+    """
+    Add a row to the score matrix for a voter's approval or score ballot.
+    
+    Args:
+        voter_id (int): ID of the voter
+        scores (tuple): (candidate name, score) pairs; unlisted candidates score 0
+    """
+    global score_width, score_matrix
+    
+    if score_width < len(candidate_names):
+        # Widen every row, doubling so that new candidates rarely force a copy
+        new_width = max(8, 2 * score_width, len(candidate_names))
+        widened = bytearray(len(score_matrix) // max(score_width, 1) * new_width)
+        for row in range(len(score_matrix) // max(score_width, 1)):
+            widened[row * new_width:row * new_width + score_width] = score_matrix[row * score_width:(row + 1) * score_width]
+        score_width, score_matrix = new_width, widened
+    
+    row_start = len(score_matrix)
+    score_matrix.extend(bytes(score_width))
+    for candidate_name, score in scores:
+        score_matrix[row_start + candidate_ids[candidate_name]] = score
+    score_rows[voter_id] = row_start // score_width
+
+def claim_ballot(voter_id):
+    """
+    Make sure no other booth process has taken a voter's ballot, and take it
+    for this one. Always succeeds when the tally is not shared.
+    
+    Args:
+        voter_id (int): ID of an eligible voter
+        
+    Returns:
+        bool: True if the ballot may be cast here; otherwise the voter has
+            voted at another booth and is no longer eligible here either
+    """
+    if shared_tally is None or shared_tally.claim(voter_id):
+        return True
+    registry.clear_eligible(voter_id)
+    return False
+
+def voted_elsewhere(voter_id):
+    """
+    Check whether an eligible voter has voted at another booth process sharing
+    the tally; if so they stop being eligible here too.
+    
+    Args:
+        voter_id (int): ID of a voter who is eligible in this process
+        
+    Returns:
+        bool: True if the ballot was taken by another booth
+    """
+    if shared_tally is not None and shared_tally.has_voted(voter_id):
+        registry.clear_eligible(voter_id)
+        return True
+    return False
+
+def withdraw_ballot(voter_id):
+    """
+    Take back a voter's ballot and its vote. The voter's eligibility is left
+    to the caller.
+    
+    Args:
+        voter_id (int): ID of the voter
+        
+    Returns:
+        int: ID of the candidate the ballot was for
+    """
+    global votes_cast
+    
+    candidate_id = registry.ballots[voter_id]
+    vote_counts[candidate_id] -= 1
+    leaderboard.demote(candidate_id)
+    if shared_tally is not None:
+        shared_tally.add(candidate_id, -1)
+        shared_tally.release(voter_id)
+    registry.ballots[voter_id] = NO_VOTE
+    registry.vote_positions[voter_id] = NO_VOTE
+    votes_cast -= 1
+    ballot_rankings.pop(voter_id, None)
+    row = score_rows.pop(voter_id, None)
+    if row is not None:
+        score_matrix[row * score_width:(row + 1) * score_width] = bytes(score_width)
+    
+    # Drop stale entries once they make up most of the voting order
+    if len(vote_order) > 64 and votes_cast < len(vote_order) // 2:
+        compact_vote_order()
+    if len(candidate_voters[candidate_id]) > 64 and vote_counts[candidate_id] < len(candidate_voters[candidate_id]) // 2:
+        candidate_voters[candidate_id] = array('i', voters_for(candidate_id))
+    return candidate_id
+
+def voters_for(candidate_id):
+    """
+    Get the IDs of the voters whose ballot is for a candidate, in time
+    proportional to that candidate's votes.
+    
+    Args:
+        candidate_id (int): ID of the candidate
+        
+    Returns:
+        list: Voter IDs in the order their ballots were cast
+    """
+    ballots = registry.ballots
+    return [voter_id for voter_id in candidate_voters[candidate_id] if ballots[voter_id] == candidate_id]
+
+def compact_vote_order():
+    """
+    Rebuild vote_order without the entries of withdrawn ballots.
+    """
+    global vote_order
+    
+    vote_positions = registry.vote_positions
+    vote_order = array('i', (voter_id for position, voter_id in enumerate(vote_order)
+                             if vote_positions[voter_id] == position))
+    for position, voter_id in enumerate(vote_order):
+        vote_positions[voter_id] = position
+
+def recent_votes(count):
+    """
+    Get the most recently cast ballots without walking the whole history.
+    
+    Args:
+        count (int): Maximum number of ballots to return
+        
+    Returns:
+        list: (voter name, candidate name) pairs, oldest first
+    """
+    recent = []
+    position = len(vote_order) - 1
+    while position >= 0 and len(recent) < count:
+        voter_id = vote_order[position]
+        if registry.vote_positions[voter_id] == position:
+            recent.append((registry.names[voter_id], candidate_names[registry.ballots[voter_id]]))
+        position -= 1
+    recent.reverse()
+    return recent
+
+def mark_changed(operation, *details):
+    """
+    Bump the data version and remember what changed since the last save.
+    
+    Args:
+        operation (str): Kind of change, e.g. "vote" or "add_voter"
+        *details: Names involved in the change
+    """
+    global data_version, change_log_start
+    
+    data_version += 1
+    if operation == "reset" or len(change_log) >= MAX_CHANGE_LOG:
+        # Too much to describe incrementally; the next save writes everything
+        change_log.clear()
+        change_log_start = data_version
+    else:
+        change_log.append((data_version, operation, details))
+
+def forget_exported_ballots(exported_count):
+    """
+    Drop the ballots a station export has covered from the unexported list.
+    
+    Args:
+        exported_count (int): Number of entries the export covered; ballots
+            cast since are kept for the next export
+    """
+    with state_lock:
+        del unexported_ballots[:exported_count]
+
+def clear_change_log(saved_version):
+    """
+    Forget recorded changes once they have been saved.
+    
+    Args:
+        saved_version (int): Data version the save covered; later changes are kept
+    """
+    global change_log_start
+    
+    with state_lock:
+        saved_count = 0
+        while saved_count < len(change_log) and change_log[saved_count][0] <= saved_version:
+            saved_count += 1
+        del change_log[:saved_count]
+        change_log_start = max(change_log_start, saved_version)
 
 def initialize_data():
     """
@@ -59,4 +620,5 @@ def reset_data():
     Reset all application data to initial state.
     """
     initialize()
+    journal.record("reset")
     print("✅ All data has been reset to initial state.")
\ No newline at end of file
@@ -0,0 +1,616 @@
+# ------------------------------------------
+# Election Engine Module - Headless API over the election data
+# ------------------------------------------
+#
+# ElectionEngine performs every election operation without printing or
+# prompting: each call validates its arguments, applies the change through the
+# same functions the menus use (so it is journaled and saved as usual) and
+# returns a result code. The console menus are a front-end over the shared
+# `election` instance; services and benchmarks can drive it directly.
+#
+# The election data lives in data_manager, so every engine shares one election.
+# Each method holds data_manager.state_lock while it reads or changes that
+# data, so engine calls may come from several threads.
+
+import data_manager
+import auth
+import voting
+import candidate_manager
+import voter_manager
+import results
+import journal
+import snapshot
+
+# Result codes
+OK = "ok"
+NOT_REGISTERED = "not_registered"
+ALREADY_VOTED = "already_voted"
+SIGNUM_MISMATCH = "signum_mismatch"
+UNKNOWN_CANDIDATE = "unknown_candidate"
+EMPTY_NAME = "empty_name"
+EMPTY_SIGNUM = "empty_signum"
+RESERVED_NAME = "reserved_name"
+INVALID_CHARACTERS = "invalid_characters"
+ALREADY_REGISTERED = "already_registered"
+SIGNUM_IN_USE = "signum_in_use"
+ALREADY_CANDIDATE = "already_candidate"
+INVALID_SCORE = "invalid_score"
+NO_CHOICE = "no_choice"
+
+# Highest score a score ballot may give a candidate (an approval counts as 1)
+MAX_SCORE = 10
+
+# Plain-text explanation of each result code, e.g. for reject reports
+RESULT_MESSAGES = {
+    OK: "accepted",
+    NOT_REGISTERED: "voter is not in the voters list",
+    ALREADY_VOTED: "voter has already voted",
+    SIGNUM_MISMATCH: "SIGNUM mismatch",
+    UNKNOWN_CANDIDATE: "candidate not recognized",
+    EMPTY_NAME: "name is empty",
+    EMPTY_SIGNUM: "SIGNUM is empty",
+    RESERVED_NAME: "'end' is reserved for stopping the election",
+    INVALID_CHARACTERS: "contains a control character",
+    ALREADY_REGISTERED: "voter is already registered",
+    SIGNUM_IN_USE: "SIGNUM is already in use",
+    ALREADY_CANDIDATE: "candidate is already standing",
+    INVALID_SCORE: f"score must be a whole number from 0 to {MAX_SCORE}",
+    NO_CHOICE: "ballot gives no candidate a score",
+}
+
+# Names and SIGNUMs may not contain these (NUL separates strings in snapshots)
+FORBIDDEN_CHARACTERS = ("\0", "\n", "\r")
+
+# Number of voters registered per batch by add_voters()
+VOTER_BATCH_SIZE = 50000
+
+def normalise(text):
+    """
+    Bring a name or SIGNUM to the form it is stored in.
+    """
+    return text.lower().strip()
+
+def check_new_voter(voter_name, signum, batch_names=(), known_signums=()):
+    """
+    Validate a normalised voter name and SIGNUM before registration.
+
+    Args:
+        voter_name (str): Normalised voter name
+        signum (str): Normalised SIGNUM
+        batch_names (set): Names accepted but not yet registered
+        known_signums (set): SIGNUMs that may not be reused
+
+    Returns:
+        str: OK, or the result code explaining why the voter is rejected
+    """
+    if not voter_name:
+        return EMPTY_NAME
+    if not signum:
+        return EMPTY_SIGNUM
+    if voter_name == "end":
+        return RESERVED_NAME
+    if any(character in voter_name or character in signum for character in FORBIDDEN_CHARACTERS):
+        return INVALID_CHARACTERS
+    if voter_name in batch_names or data_manager.registry.find(voter_name) >= 0:
+        return ALREADY_REGISTERED
+    if signum in known_signums:
+        return SIGNUM_IN_USE
+    return OK
+
+def rank_later_choices(candidate_name, later_choices):
+    """
+    Normalise the further choices of a ranked ballot. Blank entries, repeats
+    and repeats of the first choice are dropped.
+
+    Args:
+        candidate_name (str): Normalised first choice
+        later_choices (iterable): Further candidate names, in order of preference
+
+    Returns:
+        tuple: The normalised choices, or None if one is not a candidate
+    """
+    candidate_ids = data_manager.candidate_ids
+    ranking = {candidate_name: None}
+    for choice in map(normalise, later_choices):
+        if not choice:
+            continue
+        if choice not in candidate_ids:
+            return None
+        ranking[choice] = None
+    return tuple(ranking)[1:]
+
+def check_scores(scores):
+    """
+    Validate the marks of an approval or score ballot. A candidate marked
+    twice keeps the later score; zero scores are dropped.
+
+    Args:
+        scores (iterable): (candidate name, score) pairs
+
+    Returns:
+        tuple: (OK or the result code explaining why the ballot is rejected,
+            the first choice, the normalised (candidate name, score) pairs)
+    """
+    candidate_ids = data_manager.candidate_ids
+    marks = {}
+    for candidate_name, score in scores:
+        candidate_name = normalise(candidate_name)
+        if candidate_name not in candidate_ids:
+            return UNKNOWN_CANDIDATE, None, None
+        if type(score) is not int or not 0 <= score <= MAX_SCORE:
+            return INVALID_SCORE, None, None
+        marks[candidate_name] = score
+    marks = {candidate_name: score for candidate_name, score in marks.items() if score}
+    if not marks:
+        return NO_CHOICE, None, None
+    # The highest score counts as the first choice; the first marked wins a tie
+    return OK, max(marks, key=marks.get), tuple(marks.items())
+
+def voter_rejection(voter_name):
+    """
+    Explain why a voter could not be authenticated.
+
+    Args:
+        voter_name (str): Normalised voter name
+
+    Returns:
+        str: SIGNUM_MISMATCH, ALREADY_VOTED or NOT_REGISTERED
+    """
+    voter_id = data_manager.registry.find(voter_name)
+    if voter_id < 0:
+        return NOT_REGISTERED
+    if data_manager.registry.is_eligible(voter_id):
+        return SIGNUM_MISMATCH
+    return ALREADY_VOTED
+
+class ElectionEngine:
+    """
+    Election operations that return result codes instead of printing.
+    Names, SIGNUMs and candidates are matched case-insensitively.
+    """
+
+    def __init__(self, snapshot_path=None, journal_path=None):
+        # None means the default file; it is looked up when used, since the
+        # shared instance is created while journal and snapshot may still be loading
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+
+    def start(self):
+        """
+        Load the last snapshot, replay the journal on top of it, fold in the
+        journals of any booths that shared a tally, and open the journal for
+        new changes.
+        """
+        journal_path = self.journal_path or journal.JOURNAL_FILE
+        # Nothing is loaded yet, so the versions start again from the snapshot
+        # or from the built-in data, as in a fresh process
+        data_manager.data_version = 0
+        data_manager.initialize(self.snapshot_path or snapshot.SNAPSHOT_FILE)
+        journal.replay(journal_path)
+        for booth_path in journal.booth_journal_paths(journal_path):
+            journal.replay(booth_path, skip_saved=False)
+        journal.open_journal(journal_path)
+
+    def checkpoint(self):
+        """
+        Write a snapshot and drop the journal records it covers, including
+        the booth journals folded in by start(), as snapshot.save_checkpoint()
+        does.
+
+        Returns:
+            bool: True if the snapshot was written, False otherwise
+        """
+        return snapshot.save_checkpoint(self.snapshot_path or snapshot.SNAPSHOT_FILE)
+
+    def share_tally(self, name):
+        """
+        Count together with other booth processes on this host through the
+        shared memory block called name, creating it if this is the first booth.
+        This booth then journals to its own booth journal, and its votes reach
+        the main journal the next time the election is started on its own.
+
+        Call this after start(). The candidates and voters must not change
+        while the tally is shared.
+
+        Returns:
+            int: This booth's shard number
+
+        Raises:
+            RuntimeError: If a shared tally is not supported on this platform,
+                or every shard is taken
+        """
+        # Only booths need the shared tally, and it needs POSIX file locks
+        import shared_tally
+
+        with data_manager.state_lock:
+            try:
+                tally = shared_tally.SharedTally(name, len(data_manager.candidate_names),
+                                                 len(data_manager.registry.names), create=True)
+                tally.load(data_manager.vote_counts, data_manager.registry.eligible)
+            except FileExistsError:
+                tally = shared_tally.SharedTally(name)
+            data_manager.shared_tally = tally
+            journal.open_journal(journal.booth_journal_path(tally.shard, self.journal_path or journal.JOURNAL_FILE))
+            return tally.shard
+
+    def close(self):
+        """
+        Commit and close the journal, and leave a shared tally.
+        """
+        journal.close_journal()
+        with data_manager.state_lock:
+            if data_manager.shared_tally is not None:
+                data_manager.shared_tally.close()
+                data_manager.shared_tally = None
+
+    def authenticate_admin(self, username, password):
+        """
+        Check administrator credentials.
+
+        Returns:
+            bool: True if they are correct
+        """
+        return auth.check_admin_credentials(username, password)
+
+    def authenticate_voter(self, voter_name, signum):
+        """
+        Check that a voter may vote and gave the right SIGNUM.
+
+        Returns:
+            str: OK, SIGNUM_MISMATCH, ALREADY_VOTED or NOT_REGISTERED
+        """
+        voter_name = normalise(voter_name)
+        with data_manager.state_lock:
+            if auth.find_authenticated_voter(voter_name, normalise(signum)) >= 0:
+                return OK
+            return voter_rejection(voter_name)
+
+    def cast_vote(self, voter_name, signum, candidate_name, later_choices=()):
+        """
+        Authenticate a voter and record their vote.
+
+        Args:
+            later_choices (iterable): Further candidates in order of preference,
+                for a ranked ballot
+
+        Returns:
+            str: OK, UNKNOWN_CANDIDATE, SIGNUM_MISMATCH, ALREADY_VOTED or NOT_REGISTERED
+        """
+        voter_name = normalise(voter_name)
+        candidate_name = normalise(candidate_name)
+        with data_manager.state_lock:
+            voter_id = auth.find_authenticated_voter(voter_name, normalise(signum))
+            if voter_id < 0:
+                return voter_rejection(voter_name)
+            if candidate_name not in data_manager.candidate_ids:
+                return UNKNOWN_CANDIDATE
+            later_choices = rank_later_choices(candidate_name, later_choices)
+            if later_choices is None:
+                return UNKNOWN_CANDIDATE
+            if not data_manager.claim_ballot(voter_id):
+                return ALREADY_VOTED
+            voting.record_vote(voter_name, candidate_name, later_choices)
+        return OK
+
+    def cast_votes(self, votes):
+        """
+        Authenticate and record a batch of votes. The accepted votes are
+        journaled as a single record, which is much cheaper than one each.
+
+        Args:
+            votes (iterable): (voter name, SIGNUM, candidate name) triples; a
+                ranked ballot adds its later choices as a fourth item
+
+        Returns:
+            list: Result code for each vote, as from cast_vote()
+
+        Raises:
+            Exception: Whatever stopped the batch part way. Its result_codes
+                attribute holds the codes for the votes handled before it;
+                those votes stay recorded, the rest were not looked at
+        """
+        candidate_ids = data_manager.candidate_ids
+        result_codes = []
+        ballots = []
+        voter_names = []
+        candidate_names = []
+        batch_later_choices = []
+        with data_manager.state_lock:
+            try:
+                for vote in votes:
+                    voter_name = normalise(vote[0])
+                    signum = vote[1]
+                    candidate_name = normalise(vote[2])
+                    later_choices = rank_later_choices(candidate_name, vote[3]) if len(vote) > 3 and vote[3] else ()
+                    voter_id = auth.find_authenticated_voter(voter_name, normalise(signum))
+                    if voter_id < 0:
+                        result_codes.append(voter_rejection(voter_name))
+                    elif candidate_name not in candidate_ids or later_choices is None:
+                        result_codes.append(UNKNOWN_CANDIDATE)
+                    elif not data_manager.claim_ballot(voter_id):
+                        result_codes.append(ALREADY_VOTED)
+                    else:
+                        # Closed at once, so a second vote by the same voter in this batch is refused;
+                        # the ballots are counted together when the batch is done
+                        data_manager.registry.clear_eligible(voter_id)
+                        ballots.append((voter_id, candidate_ids[candidate_name], later_choices))
+                        voter_names.append(voter_name)
+                        candidate_names.append(candidate_name)
+                        batch_later_choices.append(later_choices)
+                        result_codes.append(OK)
+            except Exception as e:
+                e.result_codes = result_codes
+                raise
+            finally:
+                # Votes already accepted must be counted and journaled even if the batch failed part way
+                if ballots:
+                    data_manager.cast_ballots(ballots)
+                    voting.log_vote_batch(voter_names, candidate_names, batch_later_choices)
+        return result_codes
+
+    def cast_scored_vote(self, voter_name, signum, scores):
+        """
+        Authenticate a voter and record their approval or score ballot.
+
+        Args:
+            scores (iterable): (candidate name, score) pairs; an approval
+                ballot gives each approved candidate 1
+
+        Returns:
+            str: OK, INVALID_SCORE, NO_CHOICE, UNKNOWN_CANDIDATE, SIGNUM_MISMATCH,
+                ALREADY_VOTED or NOT_REGISTERED
+        """
+        voter_name = normalise(voter_name)
+        with data_manager.state_lock:
+            voter_id = auth.find_authenticated_voter(voter_name, normalise(signum))
+            if voter_id < 0:
+                return voter_rejection(voter_name)
+            result, candidate_name, scores = check_scores(scores)
+            if result == OK and not data_manager.claim_ballot(voter_id):
+                result = ALREADY_VOTED
+            if result == OK:
+                voting.record_vote(voter_name, candidate_name, (), scores)
+        return result
+
+    def cast_scored_votes(self, votes):
+        """
+        Authenticate and record a batch of approval or score ballots, journaled
+        as a single record.
+
+        Args:
+            votes (iterable): (voter name, SIGNUM, (candidate name, score) pairs) triples
+
+        Returns:
+            list: Result code for each ballot, as from cast_scored_vote()
+
+        Raises:
+            Exception: Whatever stopped the batch part way, with result_codes
+                for the ballots handled before it, as from cast_votes()
+        """
+        candidate_ids = data_manager.candidate_ids
+        result_codes = []
+        voter_names = []
+        candidate_names = []
+        batch_scores = []
+        with data_manager.state_lock:
+            try:
+                for voter_name, signum, scores in votes:
+                    voter_name = normalise(voter_name)
+                    voter_id = auth.find_authenticated_voter(voter_name, normalise(signum))
+                    if voter_id < 0:
+                        result_codes.append(voter_rejection(voter_name))
+                        continue
+                    result, candidate_name, scores = check_scores(scores)
+                    if result == OK and not data_manager.claim_ballot(voter_id):
+                        result = ALREADY_VOTED
+                    if result != OK:
+                        result_codes.append(result)
+                        continue
+                    data_manager.cast_ballot(voter_id, candidate_ids[candidate_name], (), scores)
+                    voter_names.append(voter_name)
+                    candidate_names.append(candidate_name)
+                    batch_scores.append(scores)
+                    result_codes.append(OK)
+            except Exception as e:
+                e.result_codes = result_codes
+                raise
+            finally:
+                if voter_names:
+                    voting.log_vote_batch(voter_names, candidate_names, scores=batch_scores)
+        return result_codes
+
+    def add_voter(self, voter_name, signum):
+        """
+        Register one voter.
+
+        Returns:
+            str: OK, or the result code from check_new_voter()
+        """
+        voter_name = normalise(voter_name)
+        signum = normalise(signum)
+        with data_manager.state_lock:
+            result = check_new_voter(voter_name, signum)
+            if result == OK:
+                voter_manager.register_voter(voter_name, signum)
+        return result
+
+    def add_voters(self, voters, batch_size=VOTER_BATCH_SIZE):
+        """
+        Register voters in bulk. Unlike add_voter(), this also rejects SIGNUMs
+        that are already in use.
+
+        Args:
+            voters (iterable): (voter name, SIGNUM) pairs
+            batch_size (int): Number of voters registered at a time
+
+        Returns:
+            tuple: (number of voters added, list of (position, result code)
+                for each rejected pair)
+        """
+        with data_manager.state_lock:
+            known_signums = set(filter(None, data_manager.registry.signums))
+            batch_names = []
+            batch_signums = []
+            batch_name_set = set()
+            added_count = 0
+            rejected = []
+
+            for position, (voter_name, signum) in enumerate(voters):
+                voter_name = normalise(voter_name)
+                signum = normalise(signum)
+                result = check_new_voter(voter_name, signum, batch_name_set, known_signums)
+                if result != OK:
+                    rejected.append((position, result))
+                    continue
+
+                batch_names.append(voter_name)
+                batch_signums.append(signum)
+                batch_name_set.add(voter_name)
+                known_signums.add(signum)
+
+                if len(batch_names) >= batch_size:
+                    voter_manager.register_voters(batch_names, batch_signums)
+                    added_count += len(batch_names)
+                    batch_names, batch_signums = [], []
+                    batch_name_set.clear()
+
+            if batch_names:
+                voter_manager.register_voters(batch_names, batch_signums)
+                added_count += len(batch_names)
+            return added_count, rejected
+
+    def remove_voter(self, voter_name):
+        """
+        Remove a voter, withdrawing their vote if they cast one.
+
+        Returns:
+            str: OK or NOT_REGISTERED
+        """
+        voter_name = normalise(voter_name)
+        with data_manager.state_lock:
+            if data_manager.registry.find(voter_name) < 0:
+                return NOT_REGISTERED
+            voter_manager.deregister_voter(voter_name)
+        return OK
+
+    def add_candidate(self, candidate_name):
+        """
+        Add a candidate with no votes.
+
+        Returns:
+            str: OK, EMPTY_NAME, INVALID_CHARACTERS or ALREADY_CANDIDATE
+        """
+        candidate_name = normalise(candidate_name)
+        if not candidate_name:
+            return EMPTY_NAME
+        if any(character in candidate_name for character in FORBIDDEN_CHARACTERS):
+            return INVALID_CHARACTERS
+        with data_manager.state_lock:
+            if candidate_name in data_manager.candidate_ids:
+                return ALREADY_CANDIDATE
+            candidate_manager.leader_onboard(candidate_name)
+        return OK
+
+    def remove_candidate(self, candidate_name):
+        """
+        Remove a candidate; their voters become eligible to vote again.
+
+        Returns:
+            str: OK or UNKNOWN_CANDIDATE
+        """
+        candidate_name = normalise(candidate_name)
+        with data_manager.state_lock:
+            if candidate_name not in data_manager.candidate_ids:
+                return UNKNOWN_CANDIDATE
+            candidate_manager.withdraw_candidate(candidate_name)
+        return OK
+
+    def tally(self):
+        """
+        Returns:
+            dict: {candidate name: votes} in display order
+        """
+        with data_manager.state_lock:
+            return dict(data_manager.candidates)
+
+    def winners(self):
+        """
+        Returns:
+            tuple: (names of the leading candidates, their vote count)
+        """
+        with data_manager.state_lock:
+            return results.find_winners()
+
+    def progress(self):
+        """
+        Returns:
+            dict: Registered voters, votes cast and voters still eligible
+        """
+        with data_manager.state_lock:
+            return {
+                "voters": len(data_manager.registry),
+                "votes_cast": results.total_votes(),
+                "eligible": data_manager.registry.eligible_count,
+            }
+
+    def voters_for(self, candidate_name):
+        """
+        Returns:
+            list: Names of the voters who voted for the candidate, in voting
+                order; empty if they are not a candidate
+        """
+        candidate_name = normalise(candidate_name)
+        with data_manager.state_lock:
+            candidate_id = data_manager.candidate_ids.get(candidate_name)
+            if candidate_id is None:
+                return []
+            return [data_manager.registry.names[voter_id] for voter_id in data_manager.voters_for(candidate_id)]
+
+    def instant_runoff(self):
+        """
+        Returns:
+            tuple: (names of the winner(s), list of rounds), as from results.instant_runoff()
+        """
+        with data_manager.state_lock:
+            return results.instant_runoff()
+
+    def single_transferable_vote(self, seat_count):
+        """
+        Returns:
+            tuple: (names elected, list of counts, quota), as from
+                results.single_transferable_vote()
+
+        Raises:
+            ValueError: If seat_count is less than 1
+        """
+        with data_manager.state_lock:
+            return results.single_transferable_vote(seat_count)
+
+    def schulze(self):
+        """
+        Returns:
+            tuple: (names of the winner(s), Schulze standings, Condorcet winner
+                or None), as from results.schulze()
+        """
+        with data_manager.state_lock:
+            return results.schulze()
+
+    def score_totals(self):
+        """
+        Returns:
+            dict: {candidate name: total score} over the approval and score
+                ballots, as from results.score_totals()
+        """
+        with data_manager.state_lock:
+            return results.score_totals()
+
+    def recent_votes(self, count):
+        """
+        Returns:
+            list: The last count (voter name, candidate name) pairs, oldest first
+        """
+        with data_manager.state_lock:
+            return data_manager.recent_votes(count)
+
+# The election driven by the console menus
+election = ElectionEngine()
@@ -7,56 +7,239 @@ import datetime
 import data_manager
 import results
 
+# Number of delta segments appended before the state file is rewritten in full
+COMPACT_AFTER_SEGMENTS = 20
+
+# What the last save_election_state() call wrote
+saved_state_path = None
+saved_state_version = None
+delta_segment_count = 0
+
+# How each kind of change is described in a delta segment
+CHANGE_DESCRIPTIONS = {
+    "vote": "{0} voted for {1}",
+    "ballot_batch": "{0} ballots were recorded in one batch",
+    "add_voter": "{0} was registered as a voter",
+    "import_voters": "{0} voters were registered from a roll file",
+    "remove_voter": "{0} was removed from the voter registry",
+    "add_candidate": "{0} was added as a candidate",
+    "remove_candidate": "{0} was removed as a candidate (their voters may vote again)",
+}
 
 def save_election_state(file_path="election_state.txt"):
     """
     Save the current state of the election (who has voted, who hasn't, current results)
     This can be called periodically during the election.
     
+    Only the changes since the previous save are appended to the file as a delta
+    segment; every COMPACT_AFTER_SEGMENTS saves the file is rewritten in full.
+    Nothing is written if the data has not changed.
+    
+    The file is written from a data_manager.StateCopy, so votes recorded by
+    other threads meanwhile are neither held up nor half included.
+    
     Args:
         file_path (str): Path to the file where state should be saved
     """
+    global saved_state_path, saved_state_version, delta_segment_count
+    
     try:
-        with open(file_path, 'w') as file:
-            # Write timestamp
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            file.write(f"Election State as of {timestamp}\n")
-            file.write("=" * 50 + "\n\n")
-            
-            # Write current vote counts
-            file.write("Current Vote Counts:\n")
-            file.write("-----------------\n")
-            for candidate, votes in data_manager.candidates.items():
-                file.write(f"{candidate.title()}: {votes} votes\n")
-            file.write("\n")
-            
-            # Write who has voted
-            file.write("Voters who have cast their votes:\n")
-            file.write("-----------------------------\n")
-            if data_manager.voting_history:
-                for voter, candidate in data_manager.voting_history.items():
-                    file.write(f"{voter.title()} voted for {candidate.title()}\n")
-            else:
-                file.write("No votes have been cast yet.\n")
-            file.write("\n")
-            
-            # Write who hasn't voted yet
-            file.write("Eligible voters who have not yet voted:\n")
-            file.write("-----------------------------------\n")
-            if data_manager.eligible_voters:
-                for voter in data_manager.eligible_voters.keys():
-                    file.write(f"{voter.title()}\n")
-            else:
-                file.write("All registered voters have cast their votes.\n")
-            
-            file.write("\n" + "=" * 50 + "\n")
-            
+        same_file = saved_state_path == file_path and os.path.exists(file_path)
+        state = data_manager.StateCopy()
+        
+        # Skip the save entirely when nothing has changed
+        if same_file and saved_state_version == state.data_version:
+            print(f"\nℹ️ Election state unchanged since last save to {file_path}")
+            return True
+        
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if (same_file and saved_state_version >= state.change_log_start
+                and delta_segment_count < COMPACT_AFTER_SEGMENTS):
+            with open(file_path, 'a') as file:
+                write_state_delta(file, timestamp, state)
+            delta_segment_count += 1
+        else:
+            state = data_manager.StateCopy(full=True)
+            with open(file_path, 'w') as file:
+                write_full_state(file, timestamp, state)
+            delta_segment_count = 0
+        
+        saved_state_path = file_path
+        saved_state_version = state.data_version
+        data_manager.clear_change_log(state.data_version)
+        
         print(f"\n✅ Election state saved to {file_path}")
         return True
     except Exception as e:
         print(f"\n❌ Error saving election state: {str(e)}")
         return False
 
+def write_state_delta(file, timestamp, state):
+    """
+    Append the changes made since the previous save to an open state file.
+    
+    Args:
+        file: File object opened for appending
+        timestamp (str): Time of this save
+        state (data_manager.StateCopy): Data to save
+    """
+    file.write(f"\nChanges up to version {state.data_version} as of {timestamp}\n")
+    file.write("-" * 50 + "\n")
+    for _, operation, details in state.change_log:
+        names = [name.title() for name in details]
+        file.write(CHANGE_DESCRIPTIONS[operation].format(*names) + "\n")
+    
+    # Vote counts are small enough to repeat in every segment
+    file.write("\nCurrent Vote Counts: ")
+    file.write(", ".join(f"{candidate.title()}: {votes}" for candidate, votes in state.candidates.items()))
+    file.write("\n" + "=" * 50 + "\n")
+
+def write_full_state(file, timestamp, state):
+    """
+    Write a complete snapshot of the election to an open state file.
+    
+    Args:
+        file: File object opened for writing
+        timestamp (str): Time of this save
+        state (data_manager.StateCopy): Full copy of the data to save
+    """
+    # Write timestamp
+    file.write(f"Election State as of {timestamp} (version {state.data_version})\n")
+    file.write("=" * 50 + "\n\n")
+    
+    # Write current vote counts
+    file.write("Current Vote Counts:\n")
+    file.write("-----------------\n")
+    for candidate, votes in state.candidates.items():
+        file.write(f"{candidate.title()}: {votes} votes\n")
+    file.write("\n")
+    
+    # Write who has voted
+    file.write("Voters who have cast their votes:\n")
+    file.write("-----------------------------\n")
+    if state.votes_cast:
+        for voter, candidate in state.voting_history():
+            file.write(f"{voter.title()} voted for {candidate.title()}\n")
+    else:
+        file.write("No votes have been cast yet.\n")
+    file.write("\n")
+    
+    # Write who hasn't voted yet
+    file.write("Eligible voters who have not yet voted:\n")
+    file.write("-----------------------------------\n")
+    if state.eligible_count:
+        for voter in state.eligible_voters():
+            file.write(f"{voter.title()}\n")
+    else:
+        file.write("All registered voters have cast their votes.\n")
+    
+    file.write("\n" + "=" * 50 + "\n")
+
+def write_runoff_rounds(file, winning_candidates, rounds):
+    """
+    Write every round of the instant-runoff count and its winner(s) to an open results file.
+    
+    Args:
+        file: File object opened for writing
+        winning_candidates (list): Names of the winner(s)
+        rounds (list): The rounds, as from results.instant_runoff()
+    """
+    file.write("INSTANT RUNOFF ROUNDS\n")
+    file.write("-" * 25 + "\n")
+    for round_number, count in enumerate(rounds, 1):
+        file.write(f"Round {round_number}: ")
+        file.write(", ".join(f"{candidate.title()}: {votes}" for candidate, votes in count["tally"].items()))
+        if count["exhausted"]:
+            file.write(f" (exhausted: {count['exhausted']})")
+        if count["eliminated"]:
+            file.write(f" - {count['eliminated'].title()} eliminated")
+        file.write("\n")
+    if len(winning_candidates) == 1:
+        file.write(f"🏆 WINNER BY INSTANT RUNOFF: {winning_candidates[0].title()}\n")
+    else:
+        file.write("🤝 TIE RESULT: The instant runoff ends in a tie between:\n")
+        for candidate in winning_candidates:
+            file.write(f"- {candidate.title()}\n")
+
+def write_stv_counts(file, elected, rounds, quota):
+    """
+    Write every count of the single transferable vote and the elected
+    candidates to an open results file.
+    
+    Args:
+        file: File object opened for writing
+        elected (list): Names of the elected candidates, in the order elected
+        rounds (list): The counts, as from results.single_transferable_vote()
+        quota (int): The Droop quota
+    """
+    file.write(f"SINGLE TRANSFERABLE VOTE COUNTS (quota {quota})\n")
+    file.write("-" * 25 + "\n")
+    for round_number, count in enumerate(rounds, 1):
+        file.write(f"Count {round_number}: ")
+        file.write(", ".join(f"{candidate.title()}: {votes:g}" for candidate, votes in count["tally"].items()))
+        if count["exhausted"]:
+            file.write(f" (exhausted: {count['exhausted']:g})")
+        if count["elected"]:
+            file.write(" - elected: " + ", ".join(candidate.title() for candidate in count["elected"]))
+        if count["eliminated"]:
+            file.write(f" - {count['eliminated'].title()} eliminated")
+        file.write("\n")
+    file.write(f"🏛️ ELECTED TO THE {results.seats} SEATS:\n")
+    for candidate in elected:
+        file.write(f"- {candidate.title()}\n")
+
+def write_schulze_ranking(file, winning_candidates, standings, condorcet_winner):
+    """
+    Write the Schulze ranking and its winner(s) to an open results file.
+    
+    Args:
+        file: File object opened for writing
+        winning_candidates (list): Names of the Schulze winner(s)
+        standings (list): (candidate name, wins) pairs, as from results.schulze()
+        condorcet_winner (str): Name of the Condorcet winner, or None
+    """
+    file.write("SCHULZE RANKING (candidates beaten by strongest path)\n")
+    file.write("-" * 25 + "\n")
+    for candidate, wins in standings:
+        file.write(f"{candidate.title()}: {wins}\n")
+    if condorcet_winner is not None:
+        file.write(f"🏆 CONDORCET WINNER: {condorcet_winner.title()}\n")
+    elif len(winning_candidates) == 1:
+        file.write(f"🏆 SCHULZE WINNER (no Condorcet winner): {winning_candidates[0].title()}\n")
+    else:
+        file.write("🤝 TIE RESULT: No Condorcet winner, and the Schulze method ties between:\n")
+        for candidate in winning_candidates:
+            file.write(f"- {candidate.title()}\n")
+
+def write_score_totals(file, totals, elected, tied, last_seat_total):
+    """
+    Write the approval or score totals and the winner(s) to an open results file.
+    
+    Args:
+        file: File object opened for writing
+        totals (dict): {candidate name: total}, as from results.score_totals()
+        elected (list): Names of the candidates elected outright
+        tied (list): Names of the candidates tied for the remaining seats
+        last_seat_total (int): Total of the last seat
+    """
+    unit = "approvals" if results.voting_method == results.APPROVAL else "points"
+    file.write(f"TOTAL {unit.upper()}\n")
+    file.write("-" * 20 + "\n")
+    for candidate, total in sorted(totals.items(), key=lambda item: -item[1]):
+        file.write(f"{candidate.title()}: {total} {unit}\n")
+    if len(elected) == 1 and results.seats == 1:
+        file.write(f"🏆 WINNER: {elected[0].title()} with {totals[elected[0]]} {unit}\n")
+        return
+    if elected:
+        file.write(f"🏛️ ELECTED TO THE {results.seats} SEAT(S):\n")
+        for candidate in elected:
+            file.write(f"- {candidate.title()} ({totals[candidate]} {unit})\n")
+    if tied:
+        file.write(f"🤝 TIE RESULT: The following candidates tied with {last_seat_total} {unit} each "
+                   f"for the last {results.seats - len(elected)} seat(s):\n")
+        for candidate in tied:
+            file.write(f"- {candidate.title()}\n")
+
 def write_final_results(file_path="results.txt"):
     """
     Write the final election results to a file.
@@ -71,6 +254,19 @@ def write_final_results(file_path="results.txt"):
     try:
         # Get winners information
         winning_candidates, highest_vote_count = results.find_winners()
+        elected, tied, last_seat_votes = results.find_seat_winners(results.seats)
+        if results.voting_method == results.INSTANT_RUNOFF:
+            winning_candidates, rounds = results.instant_runoff()
+            elected, tied = winning_candidates, []
+        elif results.voting_method == results.SINGLE_TRANSFERABLE_VOTE:
+            elected, rounds, quota = results.single_transferable_vote(results.seats)
+            tied = []
+        elif results.voting_method == results.SCHULZE:
+            winning_candidates, standings, condorcet_winner = results.schulze()
+            elected, tied = winning_candidates, []
+        elif results.voting_method in (results.APPROVAL, results.SCORE):
+            totals = results.score_totals()
+            elected, tied, last_seat_votes = results.select_seats(totals, results.seats)
         
         with open(file_path, 'w') as file:
             # Write header
@@ -80,26 +276,55 @@ def write_final_results(file_path="results.txt"):
             
             # Write summary statistics
             total_voters = len(data_manager.voter_credentials)
-            votes_cast = len(data_manager.voting_history)
+            votes_cast = results.total_votes()
             
             file.write(f"Total registered voters: {total_voters}\n")
             file.write(f"Total votes cast: {votes_cast}\n")
             participation_rate = (votes_cast / total_voters * 100) if total_voters > 0 else 0
             file.write(f"Voter participation rate: {participation_rate:.1f}%\n\n")
             
+            # Write the front runners of a large field
+            if len(data_manager.candidates) > results.TOP_CANDIDATES_SHOWN:
+                file.write(f"TOP {results.TOP_CANDIDATES_SHOWN} STANDINGS\n")
+                file.write("-" * 20 + "\n")
+                for place, candidate, vote_count in results.top_k(results.TOP_CANDIDATES_SHOWN):
+                    file.write(f"{place}. {candidate.title()}: {vote_count} votes\n")
+                file.write("\n")
+            
             # Write final vote tally
             file.write("FINAL VOTE TALLY\n")
             file.write("-" * 20 + "\n")
             for candidate, vote_count in data_manager.candidates.items():
                 file.write(f"{candidate.title()}: {vote_count} votes")
-                if vote_count == highest_vote_count and vote_count > 0:
+                if results.seats > 1 or results.voting_method != results.PLURALITY:
+                    won = candidate in elected
+                else:
+                    won = vote_count == highest_vote_count and vote_count > 0
+                if won:
                     file.write(" 🏆")
                 file.write("\n")
             file.write("\n")
             
             # Write the winner(s)
-            if not data_manager.voting_history:
+            if not votes_cast:
                 file.write("⚠️ No votes were cast in this election.\n")
+            elif results.voting_method == results.INSTANT_RUNOFF:
+                write_runoff_rounds(file, winning_candidates, rounds)
+            elif results.voting_method == results.SINGLE_TRANSFERABLE_VOTE:
+                write_stv_counts(file, elected, rounds, quota)
+            elif results.voting_method == results.SCHULZE:
+                write_schulze_ranking(file, winning_candidates, standings, condorcet_winner)
+            elif results.voting_method in (results.APPROVAL, results.SCORE):
+                write_score_totals(file, totals, elected, tied, last_seat_votes)
+            elif results.seats > 1:
+                file.write(f"🏛️ ELECTED TO THE {results.seats} SEATS:\n")
+                for candidate in elected:
+                    file.write(f"- {candidate.title()} ({data_manager.candidates[candidate]} votes)\n")
+                if tied:
+                    file.write(f"🤝 TIE RESULT: The following candidates tied with {last_seat_votes} votes each "
+                               f"for the last {results.seats - len(elected)} seat(s):\n")
+                    for candidate in tied:
+                        file.write(f"- {candidate.title()}\n")
             elif len(winning_candidates) == 1:
                 file.write(f"🏆 WINNER: {winning_candidates[0].title()} with {highest_vote_count} votes\n")
             else:
@@ -0,0 +1,291 @@
+# ------------------------------------------
+# Vote Journal Module - Append-only record of every change to the election
+# ------------------------------------------
+
+import glob
+import json
+import os
+import threading
+import time
+
+import data_manager
+import voting
+import candidate_manager
+import voter_manager
+
+# Journal settings
+JOURNAL_FILE = "election_journal.jsonl"
+COMMIT_INTERVAL = 0.2   # Longest time (seconds) a record may wait for its fsync
+COMMIT_BATCH = 256      # Number of records that forces an immediate fsync
+
+# Journal state
+journal_file = None
+pending_records = 0
+last_commit_time = 0.0
+commit_timer = None
+journal_lock = threading.Lock()
+
+def open_journal(file_path=JOURNAL_FILE):
+    """
+    Open the journal for appending. Until this is called, record() does nothing,
+    which is what lets replay() re-apply old entries without writing them again.
+
+    Args:
+        file_path (str): Path to the journal file
+    """
+    global journal_file, pending_records, last_commit_time
+
+    close_journal()
+    journal_file = open(file_path, 'a', encoding='utf-8')
+    pending_records = 0
+    last_commit_time = time.monotonic()
+
+def record(operation, **details):
+    """
+    Append one change to the journal.
+
+    Records are handed to the OS straight away but only fsynced once per commit
+    window (group commit), so a crash loses at most COMMIT_INTERVAL seconds of votes.
+
+    Each record carries the data version after the change, so replay can skip
+    anything already covered by a snapshot.
+
+    Args:
+        operation (str): Kind of change, e.g. "vote" or "add_voter"
+        **details: Values needed to apply the change again on replay
+    """
+    global pending_records, commit_timer
+
+    if journal_file is None:
+        return
+
+    line = json.dumps({"op": operation, "v": data_manager.data_version, **details}, ensure_ascii=False)
+    with journal_lock:
+        journal_file.write(line + "\n")
+        journal_file.flush()
+        pending_records += 1
+
+        # Commit now if the batch is full or the window has already elapsed
+        if pending_records >= COMMIT_BATCH or time.monotonic() - last_commit_time >= COMMIT_INTERVAL:
+            _commit_locked()
+        elif commit_timer is None:
+            # Otherwise make sure this record is synced when the window closes
+            commit_timer = threading.Timer(COMMIT_INTERVAL, commit)
+            commit_timer.daemon = True
+            commit_timer.start()
+
+def commit():
+    """
+    Force all pending journal records to disk.
+    """
+    with journal_lock:
+        _commit_locked()
+
+def _commit_locked():
+    """
+    Flush and fsync pending records. Caller must hold journal_lock.
+    """
+    global pending_records, last_commit_time, commit_timer
+
+    if commit_timer is not None:
+        commit_timer.cancel()
+        commit_timer = None
+
+    if journal_file is not None and pending_records:
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+    pending_records = 0
+    last_commit_time = time.monotonic()
+
+def close_journal():
+    """
+    Commit any pending records and close the journal.
+    """
+    global journal_file
+
+    with journal_lock:
+        _commit_locked()
+        if journal_file is not None:
+            journal_file.close()
+            journal_file = None
+
+def journal_length():
+    """
+    Number of bytes written to the journal so far.
+    """
+    with journal_lock:
+        return journal_file.tell() if journal_file is not None else 0
+
+def truncate_journal(covered_length=None):
+    """
+    Discard the journal records a snapshot covers.
+
+    Args:
+        covered_length (int, optional): Journal length when the snapshot's data
+            was copied; records written after that are kept. By default every
+            record is discarded.
+    """
+    with journal_lock:
+        _commit_locked()
+        if journal_file is None:
+            return
+        # Records appended while the snapshot was being written are not in it
+        kept_records = b""
+        if covered_length is not None and covered_length < journal_file.tell():
+            with open(journal_file.name, 'rb') as file:
+                file.seek(covered_length)
+                kept_records = file.read()
+        journal_file.seek(0)
+        journal_file.truncate()
+        journal_file.write(kept_records.decode('utf-8'))
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+
+def current_scores(scores):
+    """
+    Keep the (candidate name, score) pairs of a journaled ballot whose
+    candidate is still standing.
+    """
+    return tuple((candidate_name, score) for candidate_name, score in scores
+                 if candidate_manager.is_valid_candidate(candidate_name))
+
+def apply_record(entry):
+    """
+    Re-apply a single journal entry to the in-memory election data.
+
+    Args:
+        entry (dict): Decoded journal record
+
+    Returns:
+        bool: True if the entry was applied, False if it no longer fits the data
+    """
+    operation = entry.get("op")
+
+    if operation == "vote":
+        voter_name, candidate_name = entry["voter"], entry["candidate"]
+        if not voting.is_eligible_to_vote(voter_name) or not candidate_manager.is_valid_candidate(candidate_name):
+            return False
+        voting.record_vote(voter_name, candidate_name, tuple(entry.get("later_choices", ())),
+                           current_scores(entry.get("scores", ())))
+    elif operation == "votes":
+        voter_names, candidate_names, batch_later_choices, batch_scores = [], [], [], []
+        later_choices = entry.get("later_choices") or [()] * len(entry["voters"])
+        scores = entry.get("scores") or [()] * len(entry["voters"])
+        for voter_name, candidate_name, choices, marks in zip(entry["voters"], entry["candidates"], later_choices, scores):
+            if voting.is_eligible_to_vote(voter_name) and candidate_manager.is_valid_candidate(candidate_name):
+                marks = current_scores(marks)
+                data_manager.cast_ballot(data_manager.registry.find(voter_name), data_manager.candidate_ids[candidate_name],
+                                         tuple(choices), marks)
+                voter_names.append(voter_name)
+                candidate_names.append(candidate_name)
+                batch_later_choices.append(choices)
+                batch_scores.append(marks)
+        if not voter_names:
+            return False
+        voting.log_vote_batch(voter_names, candidate_names, batch_later_choices, batch_scores)
+    elif operation == "add_candidate":
+        if candidate_manager.is_valid_candidate(entry["candidate"]):
+            return False
+        candidate_manager.leader_onboard(entry["candidate"])
+    elif operation == "remove_candidate":
+        if not candidate_manager.is_valid_candidate(entry["candidate"]):
+            return False
+        candidate_manager.withdraw_candidate(entry["candidate"])
+    elif operation == "add_voter":
+        if entry["voter"] in data_manager.voter_credentials:
+            return False
+        voter_manager.register_voter(entry["voter"], entry["signum"])
+    elif operation == "add_voters":
+        new_voters = [(voter_name, signum) for voter_name, signum in zip(entry["voters"], entry["signums"])
+                      if voter_name not in data_manager.voter_credentials]
+        if not new_voters:
+            return False
+        voter_manager.register_voters(*map(list, zip(*new_voters)))
+    elif operation == "remove_voter":
+        if entry["voter"] not in data_manager.voter_credentials:
+            return False
+        voter_manager.deregister_voter(entry["voter"])
+    elif operation == "reset":
+        # Versions carry on from the reset's, so later records follow it
+        data_manager.data_version = max(data_manager.data_version, entry.get("v", 1) - 1)
+        data_manager.initialize()
+    else:
+        return False
+    return True
+
+def booth_journal_path(shard, file_path=JOURNAL_FILE):
+    """
+    Journal of one booth process sharing a tally, e.g. election_journal.booth2.jsonl.
+    """
+    base, extension = os.path.splitext(file_path)
+    return f"{base}.booth{shard}{extension}"
+
+def booth_journal_paths(file_path=JOURNAL_FILE):
+    """
+    Paths of the booth journals left next to a journal.
+    """
+    base, extension = os.path.splitext(file_path)
+    return sorted(glob.glob(f"{glob.escape(base)}.booth[0-9]*{glob.escape(extension)}"))
+
+def replay(file_path=JOURNAL_FILE, skip_saved=True):
+    """
+    Rebuild the election data by re-applying the journal entries that are newer
+    than the loaded data. Call this after data_manager.initialize() and before
+    open_journal().
+
+    Booth journals are replayed with skip_saved off: the booths numbered their
+    changes independently, so versions cannot tell what is saved, but a vote
+    already applied no longer fits the data and is skipped anyway.
+
+    A "reset" record is a barrier: it is always applied, and so is every
+    record after it. The journal holds every change made since a reset it
+    still holds, so those records rebuild the data whatever the snapshot
+    covered, and no record is judged against versions from before the reset.
+
+    A torn final line (a crash in the middle of a write) is cut off so that new
+    records are appended after the last complete entry.
+
+    Args:
+        file_path (str): Path to the journal file
+        skip_saved (bool): Skip entries whose version the loaded data covers
+
+    Returns:
+        int: Number of entries applied
+    """
+    if not os.path.exists(file_path):
+        return 0
+
+    loaded_version = data_manager.data_version
+    highest_version = loaded_version
+    applied_count = 0
+    valid_length = 0
+    with open(file_path, 'rb') as file:
+        for raw_line in file:
+            if not raw_line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(raw_line)
+            except ValueError:
+                break
+            valid_length += len(raw_line)
+            if entry.get("op") == "reset":
+                skip_saved = False
+            # Skip changes that are already part of the loaded snapshot
+            if skip_saved and entry.get("v", loaded_version + 1) <= loaded_version:
+                continue
+            if apply_record(entry):
+                applied_count += 1
+            if isinstance(entry.get("v"), int):
+                highest_version = max(highest_version, entry["v"])
+
+    # New records must be numbered after every record already in the journal
+    data_manager.data_version = max(data_manager.data_version, highest_version)
+
+    # Drop anything after the last complete record
+    if valid_length != os.path.getsize(file_path):
+        with open(file_path, 'r+b') as file:
+            file.truncate(valid_length)
+
+    if applied_count:
+        print(f"♻️ Recovered {applied_count} journal entries from {file_path}")
+    return applied_count
@@ -0,0 +1,153 @@
+# ------------------------------------------
+# Leaderboard Module - Candidates kept in order of votes as the votes come in
+# ------------------------------------------
+#
+# `ranked` lists the live candidate IDs from most to fewest votes, so
+# candidates with equal counts sit in one run. A vote only ever moves a count
+# by one, and that is done by swapping the candidate to the edge of its run and
+# moving the run boundary, so the order never has to be sorted again:
+#
+#   before:  [ A:5 | B:4  C:4  D:4 | E:2 ]     D gets a vote
+#   swap:    [ A:5 | D:4  C:4  B:4 | E:2 ]     D to the front of the 4s
+#   after:   [ A:5  D:5 | C:4  B:4 | E:2 ]     the 5s' run grows by one
+#
+# The leader, the tie for first and any candidate's rank are then O(1) reads,
+# and the full standings are a walk of `ranked`.
+
+from array import array
+
+# Marks a candidate ID that is not on the leaderboard
+NOT_RANKED = -1
+
+class Leaderboard:
+    """
+    Live candidate IDs ordered by vote count, highest first. Reads the counts
+    from the vote_counts array it is given; call promote() or demote() after
+    changing a count by one.
+    """
+
+    __slots__ = ("vote_counts", "ranked", "positions", "run_start", "run_end")
+
+    def __init__(self, vote_counts, candidate_ids=()):
+        """
+        Args:
+            vote_counts (array): Vote count per candidate ID
+            candidate_ids (iterable): IDs of the live candidates
+        """
+        self.vote_counts = vote_counts
+        # Highest count first; ties in ID order
+        self.ranked = sorted(candidate_ids, key=lambda candidate_id: (-vote_counts[candidate_id], candidate_id))
+        self.positions = array('i', [NOT_RANKED]) * len(vote_counts)
+        # First and last position of the run of candidates with each count
+        self.run_start = {}
+        self.run_end = {}
+        for position, candidate_id in enumerate(self.ranked):
+            self.positions[candidate_id] = position
+            count = vote_counts[candidate_id]
+            self.run_start.setdefault(count, position)
+            self.run_end[count] = position
+
+    def __len__(self):
+        return len(self.ranked)
+
+    def _swap(self, candidate_id, position):
+        # Exchange a candidate with whoever is at position
+        other_id = self.ranked[position]
+        old_position = self.positions[candidate_id]
+        self.ranked[old_position] = other_id
+        self.positions[other_id] = old_position
+        self.ranked[position] = candidate_id
+        self.positions[candidate_id] = position
+
+    def _leave_run(self, count, position):
+        # Shrink the run of count by its edge at position, dropping it if empty
+        if self.run_start[count] == self.run_end[count]:
+            del self.run_start[count]
+            del self.run_end[count]
+        elif self.run_start[count] == position:
+            self.run_start[count] += 1
+        else:
+            self.run_end[count] -= 1
+
+    def _join_run(self, count, position):
+        # Grow the run of count by the neighbouring position, creating it if needed
+        if count not in self.run_start:
+            self.run_start[count] = self.run_end[count] = position
+        elif position < self.run_start[count]:
+            self.run_start[count] = position
+        else:
+            self.run_end[count] = position
+
+    def promote(self, candidate_id):
+        """
+        Move a candidate up after their count rose by one.
+        """
+        count = self.vote_counts[candidate_id]
+        position = self.run_start[count - 1]
+        self._swap(candidate_id, position)
+        self._leave_run(count - 1, position)
+        self._join_run(count, position)
+
+    def demote(self, candidate_id):
+        """
+        Move a candidate down after their count fell by one.
+        """
+        count = self.vote_counts[candidate_id]
+        position = self.run_end[count + 1]
+        self._swap(candidate_id, position)
+        self._leave_run(count + 1, position)
+        self._join_run(count, position)
+
+    def add(self, candidate_id):
+        """
+        Put a new candidate with no votes at the bottom.
+        """
+        if candidate_id >= len(self.positions):
+            self.positions.extend(array('i', [NOT_RANKED]) * (candidate_id + 1 - len(self.positions)))
+        position = len(self.ranked)
+        self.ranked.append(candidate_id)
+        self.positions[candidate_id] = position
+        self._join_run(0, position)
+
+    def remove(self, candidate_id):
+        """
+        Take a candidate with no votes off the board.
+        """
+        # Candidates with no votes are the last run, so swap to the very end
+        position = len(self.ranked) - 1
+        self._swap(candidate_id, position)
+        self._leave_run(0, position)
+        self.ranked.pop()
+        self.positions[candidate_id] = NOT_RANKED
+
+    def recount(self):
+        """
+        Put every candidate back in order after counts moved by more than one,
+        e.g. a batch of ballots counted together: one sort of the field
+        however many votes moved.
+        """
+        self.__init__(self.vote_counts, self.ranked)
+
+    def top_count(self):
+        """
+        Returns:
+            int: The highest vote count, or 0 if there are no candidates
+        """
+        return self.vote_counts[self.ranked[0]] if self.ranked else 0
+
+    def leaders(self):
+        """
+        Returns:
+            list: IDs of every candidate with the highest vote count
+        """
+        if not self.ranked:
+            return []
+        return self.ranked[:self.run_end[self.top_count()] + 1]
+
+    def rank_of(self, candidate_id):
+        """
+        Returns:
+            int: 1 for the leader(s); tied candidates share a rank, and the
+                next rank skips the places they fill (1, 2, 2, 4)
+        """
+        return self.run_start[self.vote_counts[candidate_id]] + 1
@@ -3,6 +3,13 @@
 # 🗳️ Enhanced Election Application — Interactive Menu System 🗳️
 # ------------------------------------------
 
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import console
 import data_manager
 import auth
 import candidate_manager
@@ -11,6 +18,11 @@ import ui
 import voting
 import results
 import file_manager
+import snapshot
+import ballot_import
+import engine
+import server
+import station_sync
 
 def admin_menu_system():
     """
@@ -44,15 +56,20 @@ def admin_menu_system():
             # Save current election state
             print("\n💾 Saving current election state...")
             file_manager.save_election_state()
+            snapshot.save_checkpoint()
         elif choice == "6":
+            # Import voters in bulk
+            result = voter_manager.import_voters()
+            print(result)
+        elif choice == "7":
             # Return to main menu
             print("\n🔙 Returning to main menu...")
             break
         else:
-            print("\n⚠️ Invalid choice. Please select a number between 1 and 6.")
+            print("\n⚠️ Invalid choice. Please select a number between 1 and 7.")
         
         # Pause before showing the admin menu again
-        input("\nPress Enter to continue...")
+        console.ask("\nPress Enter to continue...")
 
 def run_election():
     """
@@ -72,7 +89,7 @@ def run_election():
     
     # Begin the voting loop
     while data_manager.eligible_voters:
-        voter_name = input('\nEnter your name to cast your vote (or type "END" to stop voting):\n').lower()
+        voter_name = console.ask('\nEnter your name to cast your vote (or type "END" to stop voting):\n').lower()
 
         # Handle early termination command
         if voter_name == "end":
@@ -106,12 +123,175 @@ def end_election():
     ui.display_voting_history()
     
     # Write final results to file if there were any votes cast
-    if data_manager.voting_history:
+    if results.total_votes():
         print("\nWriting final results to results.txt...")
         file_manager.write_final_results()
     else:
         print("\nNo votes were cast, so no results file was created.")
 
+def ingest_ballot_file(file_path):
+    """
+    Record the ballots in a file without any interactive prompts.
+    
+    Args:
+        file_path (str): Path to a .csv or .jsonl ballot file
+    
+    Returns:
+        bool: True if the file was processed, False otherwise
+    """
+    reject_path = file_path + ".rejects.txt"
+    print(f"\n📥 Recording ballots from {file_path}...")
+    
+    start_time = time.perf_counter()
+    try:
+        scored = results.voting_method in (results.APPROVAL, results.SCORE)
+        recorded_count, rejected_count = ballot_import.load_ballot_file(file_path, reject_path, scored=scored)
+    except Exception as e:
+        print(f"❌ Error reading ballots: {str(e)}")
+        return False
+    elapsed = time.perf_counter() - start_time
+    
+    rate = (recorded_count + rejected_count) / elapsed if elapsed > 0 else 0
+    print(f"✅ {recorded_count} ballots recorded in {elapsed:.2f}s ({rate:,.0f} ballots/s).")
+    if rejected_count:
+        print(f"⚠️ {rejected_count} ballots were rejected; see {reject_path} for details.")
+    return True
+
+def export_station_counts(station, file_path):
+    """
+    Write this polling station's counters and new voters for the central
+    count, to the next numbered file after file_path.
+    
+    Args:
+        station (str): Name of this polling station
+        file_path (str): Path the numbered export files are named after
+    
+    Returns:
+        bool: True if the delta was written, False otherwise
+    """
+    try:
+        delta, export_path = station_sync.export_station_delta(station, file_path)
+    except Exception as e:
+        print(f"❌ Error exporting the station count: {str(e)}")
+        return False
+    print(f"✅ {len(delta['counters'][station])} candidate counts and {len(delta['voted'][station])} new voters "
+          f"of station {station} written to {export_path}")
+    return True
+
+def merge_station_counts(paths):
+    """
+    Merge station exports into the central count. A directory is followed,
+    merging each export that appears in it, until Ctrl+C.
+    
+    Args:
+        paths (list): Export files, or a single directory
+    
+    Returns:
+        bool: True if the exports were merged, False otherwise
+    """
+    try:
+        if len(paths) == 1 and os.path.isdir(paths[0]):
+            print(f"👀 Merging station exports as they arrive in {paths[0]} (Ctrl+C to stop)")
+            station_sync.follow_station_exports(paths[0], ui.display_station_counts)
+            return True
+        merged = station_sync.merge_station_files(paths)
+    except Exception as e:
+        print(f"❌ Error merging station counts: {str(e)}")
+        return False
+    ui.display_station_counts(merged)
+    return True
+
+def replay_sessions(transcript_path, session_count=1, output_path=None):
+    """
+    Replay a recorded menu session from a transcript, without a terminal.
+    
+    Every session starts from the built-in election data and journals
+    nothing, and the files it saves go to a scratch directory that is removed
+    afterwards. The output of the last session is written to output_path (or
+    printed), and the replay rate is reported on standard error.
+    
+    Args:
+        transcript_path (str): Path to the transcript, one answer per line
+        session_count (int): Number of times to replay the session
+        output_path (str, optional): File for the captured output
+    
+    Returns:
+        bool: True if every session finished before the transcript ran out
+    """
+    try:
+        answers = console.read_transcript(transcript_path)
+    except OSError as e:
+        print(f"❌ Error reading the transcript: {str(e)}", file=sys.stderr)
+        return False
+    
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="election-replay-") as scratch_directory:
+        os.chdir(scratch_directory)
+        try:
+            start_time = time.perf_counter()
+            for _ in range(session_count):
+                data_manager.initialize()
+                file_manager.saved_state_path = None
+                output, finished = console.replay_session(answers, menu_system)
+            elapsed = time.perf_counter() - start_time
+        finally:
+            os.chdir(working_directory)
+    
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output, end="")
+    rate = session_count / elapsed if elapsed > 0 else 0
+    print(f"✅ {session_count} sessions replayed in {elapsed:.2f}s ({rate:,.0f} sessions/s).", file=sys.stderr)
+    if not finished:
+        print(f"⚠️ {transcript_path} ran out of answers before the session ended.", file=sys.stderr)
+    return finished
+
+def parse_arguments():
+    """
+    Parse the command-line options.
+    
+    Returns:
+        argparse.Namespace: The parsed options
+    """
+    parser = argparse.ArgumentParser(description="Ericsson Mediation Election System")
+    parser.add_argument("--ballots", metavar="FILE",
+                        help="record the ballots in a CSV or JSONL file (voter, signum, candidate; "
+                             "voter, signum, marks for approval and score ballots) and exit")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="accept votes from polling terminals on HOST:PORT or a Unix socket path")
+    parser.add_argument("--seats", metavar="N", type=int, default=1,
+                        help="number of seats being filled (default 1); the N candidates with the most votes win")
+    parser.add_argument("--method", default=results.PLURALITY,
+                        choices=(results.PLURALITY, results.INSTANT_RUNOFF, results.SINGLE_TRANSFERABLE_VOTE,
+                                 results.SCHULZE, results.APPROVAL, results.SCORE),
+                        help="how the ballots are counted: most first choices wins (plurality, the default); "
+                             "over ranked ballots: instant runoff (irv), single transferable vote for --seats "
+                             "(stv) or the Schulze method (schulze); or the highest total of approval (approval) "
+                             "or score (score) ballots")
+    parser.add_argument("--shared-tally", metavar="NAME",
+                        help="count together with the other booth processes on this host that give the same NAME")
+    parser.add_argument("--station", metavar="NAME",
+                        help="name of this polling station, for --export-station")
+    parser.add_argument("--export-station", metavar="FILE",
+                        help="write this station's counters and new voters to the next numbered file after FILE "
+                             "(A.json -> A.000001.json, ...) for the central count and exit")
+    parser.add_argument("--merge-stations", metavar="PATH", nargs="+",
+                        help="merge station exports into the central count and exit; "
+                             "given a directory, keep merging the exports that arrive in it")
+    parser.add_argument("--replay", metavar="TRANSCRIPT",
+                        help="replay a recorded menu session (one answer per line) from the built-in data "
+                             "and print its output")
+    parser.add_argument("--sessions", metavar="N", type=int, default=1,
+                        help="number of times to replay the session (default 1)")
+    parser.add_argument("--replay-output", metavar="FILE",
+                        help="write the replayed session's output to FILE instead of standard output")
+    arguments = parser.parse_args()
+    if arguments.export_station and not arguments.station:
+        parser.error("--export-station needs --station")
+    return arguments
+
 def menu_system():
     """
     Main menu system that controls the flow of the application.
@@ -144,13 +324,47 @@ def menu_system():
             print("\n⚠️ Invalid choice. Please select a number between 1 and 6.")
         
         # Pause before showing the menu again
-        input("\nPress Enter to continue...")
+        console.ask("\nPress Enter to continue...")
 
 # ------------------------------------------
 # Start the Election Application
 # ------------------------------------------
 if __name__ == "__main__":
-    # Initialize the data first
-    data_manager.initialize()
+    arguments = parse_arguments()
+    results.seats = max(arguments.seats, 1)
+    results.voting_method = arguments.method
+    if arguments.replay:
+        # Replayed sessions leave the saved election alone
+        sys.exit(0 if replay_sessions(arguments.replay, max(arguments.sessions, 1), arguments.replay_output) else 1)
+    # Restore the last snapshot, recover anything journaled since (up to a
+    # crash) and start journaling new changes
+    engine.election.start()
+    if arguments.shared_tally:
+        try:
+            booth = engine.election.share_tally(arguments.shared_tally)
+        except RuntimeError as error:
+            print(f"❌ {error}")
+            engine.election.close()
+            sys.exit(1)
+        print(f"🔗 Booth {booth + 1} counting with the shared tally '{arguments.shared_tally}'")
     # Start the menu system
-    menu_system()
+    try:
+        if arguments.ballots:
+            # Non-interactive ballot ingestion
+            ingest_ballot_file(arguments.ballots)
+        elif arguments.export_station:
+            # Send this station's count on to the central count
+            export_station_counts(arguments.station, arguments.export_station)
+        elif arguments.merge_stations:
+            merge_station_counts(arguments.merge_stations)
+        elif arguments.serve:
+            # Polling terminals vote over the network
+            server.run_server(arguments.serve)
+        else:
+            menu_system()
+        # Leave a snapshot behind so the next start does not need the journal;
+        # booths sharing a tally leave theirs to the next start on its own
+        if not arguments.shared_tally:
+            snapshot.save_checkpoint()
+    finally:
+        engine.election.close()
@@ -0,0 +1,253 @@
+# ------------------------------------------
+# Voter Registry Module - One compact table for every registered voter
+# ------------------------------------------
+#
+# Each voter has an integer ID, and everything about them lives in parallel
+# arrays indexed by that ID: name, SIGNUM, ballot and place in the voting order,
+# plus one bit in an eligibility bitmap. Names are found through an
+# open-addressing hash index stored in an int32 array rather than a dict, so
+# there is no per-voter dict entry or int object.
+#
+# The index hashes names with CRC-32, which (unlike hash()) is the same in
+# every process, so it can be saved in a snapshot and loaded back as-is.
+
+import zlib
+from array import array
+
+# Marks a voter who has not cast a ballot
+NO_VOTE = -1
+
+# Index slot markers
+EMPTY_SLOT = -1
+DELETED_SLOT = -2
+
+def name_hash(voter_name):
+    """
+    Hash a voter name the same way in every process.
+    """
+    return zlib.crc32(voter_name.encode('utf-8'))
+
+class VoterRegistry:
+    """
+    Voter names, SIGNUMs, ballots and eligibility in parallel arrays indexed by voter ID.
+    Removed voters keep their ID with a name of None.
+    """
+
+    __slots__ = ("names", "signums", "ballots", "vote_positions", "eligible",
+                 "eligible_count", "voter_count", "index", "index_used")
+
+    def __init__(self):
+        self.names = []
+        self.signums = []
+        self.ballots = array('i')
+        self.vote_positions = array('i')
+        self.eligible = bytearray()
+        self.eligible_count = 0
+        self.voter_count = 0
+        self.index = array('i', [EMPTY_SLOT]) * 8
+        self.index_used = 0
+
+    def __len__(self):
+        return self.voter_count
+
+    def find(self, voter_name):
+        """
+        Look up a voter's ID.
+
+        Args:
+            voter_name (str): Name of the voter
+
+        Returns:
+            int: The voter's ID, or -1 if they are not registered
+        """
+        index = self.index
+        mask = len(index) - 1
+        slot = name_hash(voter_name) & mask
+        while True:
+            voter_id = index[slot]
+            if voter_id == EMPTY_SLOT:
+                return -1
+            if voter_id != DELETED_SLOT and self.names[voter_id] == voter_name:
+                return voter_id
+            slot = (slot + 1) & mask
+
+    def add(self, voter_name, signum):
+        """
+        Register a voter as eligible to vote. The caller checks they are not already registered.
+
+        Args:
+            voter_name (str): Name of the voter
+            signum (str): SIGNUM credential for the voter
+
+        Returns:
+            int: The new voter's ID
+        """
+        voter_id = len(self.names)
+        self.names.append(voter_name)
+        self.signums.append(signum)
+        self.ballots.append(NO_VOTE)
+        self.vote_positions.append(NO_VOTE)
+        if voter_id % 8 == 0:
+            self.eligible.append(0)
+        self.voter_count += 1
+        self.set_eligible(voter_id)
+
+        # Keep the index at most half full so probe chains stay short
+        if (self.index_used + 1) * 2 > len(self.index):
+            self.rebuild_index()
+        else:
+            self._insert(voter_id)
+        return voter_id
+
+    def add_many(self, voter_names, signums):
+        """
+        Register a batch of new, distinct voters as eligible to vote.
+
+        Args:
+            voter_names (list): Names of the voters
+            signums (list): SIGNUM credential for each voter
+
+        Returns:
+            int: ID of the first new voter; the rest follow in order
+        """
+        first_id = len(self.names)
+        added = len(voter_names)
+        self.names.extend(voter_names)
+        self.signums.extend(signums)
+        self.ballots.extend(array('i', [NO_VOTE]) * added)
+        self.vote_positions.extend(array('i', [NO_VOTE]) * added)
+        self.voter_count += added
+
+        # Set the new eligibility bits, a whole byte at a time where possible
+        end_id = first_id + added
+        self.eligible.extend(bytes((end_id + 7) // 8 - len(self.eligible)))
+        voter_id = first_id
+        while voter_id < end_id and (voter_id & 7 or end_id - voter_id < 8):
+            self.eligible[voter_id >> 3] |= 1 << (voter_id & 7)
+            voter_id += 1
+        full_bytes = (end_id - voter_id) // 8
+        self.eligible[voter_id >> 3:(voter_id >> 3) + full_bytes] = b"\xff" * full_bytes
+        for voter_id in range(voter_id + 8 * full_bytes, end_id):
+            self.eligible[voter_id >> 3] |= 1 << (voter_id & 7)
+        self.eligible_count += added
+
+        if (self.index_used + added) * 2 > len(self.index):
+            self.rebuild_index()
+        else:
+            for voter_id in range(first_id, end_id):
+                self._insert(voter_id)
+        return first_id
+
+    def remove(self, voter_id):
+        """
+        Remove a voter. Their ballot must already have been withdrawn.
+
+        Args:
+            voter_id (int): ID of the voter
+        """
+        index = self.index
+        mask = len(index) - 1
+        slot = name_hash(self.names[voter_id]) & mask
+        while index[slot] != voter_id:
+            slot = (slot + 1) & mask
+        index[slot] = DELETED_SLOT
+
+        self.clear_eligible(voter_id)
+        self.names[voter_id] = None
+        self.signums[voter_id] = None
+        self.voter_count -= 1
+
+    def copy(self):
+        """
+        Return an independent copy of the registry.
+        """
+        duplicate = VoterRegistry()
+        duplicate.names = self.names[:]
+        duplicate.signums = self.signums[:]
+        duplicate.ballots = self.ballots[:]
+        duplicate.vote_positions = self.vote_positions[:]
+        duplicate.eligible = self.eligible[:]
+        duplicate.eligible_count = self.eligible_count
+        duplicate.voter_count = self.voter_count
+        duplicate.index = self.index[:]
+        duplicate.index_used = self.index_used
+        return duplicate
+
+    def ballot_copy(self):
+        """
+        Return a copy of the names, ballots and eligibility only, for reading
+        who voted for whom. The SIGNUMs and the hash index are left out, so
+        the copy is cheaper than copy() and cannot look voters up by name.
+        """
+        duplicate = VoterRegistry()
+        duplicate.names = self.names[:]
+        duplicate.ballots = self.ballots[:]
+        duplicate.vote_positions = self.vote_positions[:]
+        duplicate.eligible = self.eligible[:]
+        duplicate.eligible_count = self.eligible_count
+        duplicate.voter_count = self.voter_count
+        return duplicate
+
+    def is_eligible(self, voter_id):
+        """
+        Check the voter's bit in the eligibility bitmap.
+        """
+        return self.eligible[voter_id >> 3] & (1 << (voter_id & 7)) != 0
+
+    def set_eligible(self, voter_id):
+        """
+        Mark a voter as still able to vote.
+        """
+        if not self.is_eligible(voter_id):
+            self.eligible[voter_id >> 3] |= 1 << (voter_id & 7)
+            self.eligible_count += 1
+
+    def clear_eligible(self, voter_id):
+        """
+        Mark a voter as no longer able to vote.
+        """
+        if self.is_eligible(voter_id):
+            self.eligible[voter_id >> 3] &= ~(1 << (voter_id & 7))
+            self.eligible_count -= 1
+
+    def voter_ids(self):
+        """
+        Yield the IDs of all registered voters in registration order.
+        """
+        for voter_id, voter_name in enumerate(self.names):
+            if voter_name is not None:
+                yield voter_id
+
+    def eligible_ids(self):
+        """
+        Yield the IDs of all eligible voters in registration order, skipping
+        eight voters at a time where nobody is eligible.
+        """
+        for byte_index, bits in enumerate(self.eligible):
+            if bits:
+                for bit in range(8):
+                    if bits & (1 << bit):
+                        yield (byte_index << 3) | bit
+
+    def rebuild_index(self):
+        """
+        Rebuild the hash index over every registered voter, dropping deleted
+        markers and growing it if needed.
+        """
+        size = 8
+        while size < 2 * (self.voter_count + 1):
+            size *= 2
+        self.index = array('i', [EMPTY_SLOT]) * size
+        self.index_used = 0
+        for voter_id in self.voter_ids():
+            self._insert(voter_id)
+
+    def _insert(self, voter_id):
+        index = self.index
+        mask = len(index) - 1
+        slot = name_hash(self.names[voter_id]) & mask
+        while index[slot] >= 0:
+            slot = (slot + 1) & mask
+        if index[slot] == EMPTY_SLOT:
+            self.index_used += 1
+        index[slot] = voter_id
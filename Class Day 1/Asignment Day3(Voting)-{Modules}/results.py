@@ -2,8 +2,62 @@
 # Results Processing Module
 # ------------------------------------------
 
+import heapq
+from collections import Counter, defaultdict
+from fractions import Fraction
+
 import data_manager
 
+# Larger fields show only this many candidates in ranked summaries
+TOP_CANDIDATES_SHOWN = 10
+
+# Number of seats being filled; main sets this from --seats
+seats = 1
+
+# How the ballots are counted; main sets this from --method
+PLURALITY = "plurality"
+INSTANT_RUNOFF = "irv"
+SINGLE_TRANSFERABLE_VOTE = "stv"
+SCHULZE = "schulze"
+APPROVAL = "approval"
+SCORE = "score"
+voting_method = PLURALITY
+
+def shared_ranking():
+    """
+    Rank the candidates on the shared tally, which counts every booth's votes
+    where the leaderboard sees only this booth's.
+    
+    Returns:
+        list: (candidate ID, votes) pairs, most votes first, ties in display order
+    """
+    vote_counts = data_manager.shared_tally.combined_counts()
+    return sorted(((candidate_id, vote_counts[candidate_id]) for candidate_id in data_manager.candidate_ids.values()),
+                  key=lambda item: -item[1])
+
+def check_ballots_visible():
+    """
+    Check that every ballot is here to be counted by preference or score.
+    
+    Raises:
+        RuntimeError: If this booth shares its tally, since only the first
+            choices of the other booths' ballots reach it
+    """
+    if data_manager.shared_tally is not None:
+        raise RuntimeError("the ballots cast at the other booths are not here to count; "
+                           "count them once the booths stop sharing the tally")
+
+def total_votes():
+    """
+    Get the number of ballots counted, over every booth while the tally is shared.
+    
+    Returns:
+        int: The number of ballots
+    """
+    if data_manager.shared_tally is not None:
+        return sum(votes for _, votes in shared_ranking())
+    return data_manager.votes_cast
+
 def get_max_votes():
     """
     Get the maximum number of votes received by any candidate.
@@ -11,7 +65,9 @@ def get_max_votes():
     Returns:
         int: The highest vote count
     """
-    return max(data_manager.candidates.values()) if data_manager.candidates else 0
+    if data_manager.shared_tally is not None:
+        return find_winners()[1]
+    return data_manager.leaderboard.top_count()
 
 def find_winners():
     """
@@ -22,14 +78,585 @@ def find_winners():
             - list: Names of candidates with the highest votes
             - int: The maximum vote count
     """
-    highest_vote_count = get_max_votes()
-    winning_candidates = []
+    if data_manager.shared_tally is not None:
+        # The leaderboard only sees this booth's votes; the shared tally sees every booth's
+        vote_counts = data_manager.shared_tally.combined_counts()
+        live_ids = data_manager.candidate_ids.values()
+        highest_vote_count = max((vote_counts[candidate_id] for candidate_id in live_ids), default=0)
+        leader_ids = sorted(candidate_id for candidate_id in live_ids if vote_counts[candidate_id] == highest_vote_count)
+        return [data_manager.candidate_names[candidate_id] for candidate_id in leader_ids], highest_vote_count
+    
+    # The leaderboard keeps the tie for first together at its head
+    leader_ids = sorted(data_manager.leaderboard.leaders())
+    winning_candidates = [data_manager.candidate_names[candidate_id] for candidate_id in leader_ids]
+    return winning_candidates, get_max_votes()
+
+def ranked_standings():
+    """
+    Get every candidate's votes, most votes first, without sorting.
+    
+    Returns:
+        list: (candidate name, votes) pairs
+    """
+    candidate_names = data_manager.candidate_names
+    if data_manager.shared_tally is not None:
+        return [(candidate_names[candidate_id], votes) for candidate_id, votes in shared_ranking()]
+    vote_counts = data_manager.vote_counts
+    return [(candidate_names[candidate_id], vote_counts[candidate_id]) for candidate_id in data_manager.leaderboard.ranked]
+
+def rank_of(candidate_name):
+    """
+    Get a candidate's place in the standings. Tied candidates share a place
+    and the next place skips the ones they fill (1, 2, 2, 4).
     
-    for candidate_name, votes in data_manager.candidates.items():
-        if votes == highest_vote_count:
-            winning_candidates.append(candidate_name)
-            
-    return winning_candidates, highest_vote_count
+    Args:
+        candidate_name (str): Name of the candidate
+        
+    Returns:
+        int: The candidate's place, or None if they are not standing
+    """
+    candidate_id = data_manager.candidate_ids.get(candidate_name)
+    if candidate_id is None:
+        return None
+    if data_manager.shared_tally is not None:
+        vote_counts = data_manager.shared_tally.combined_counts()
+        return 1 + sum(vote_counts[other_id] > vote_counts[candidate_id]
+                       for other_id in data_manager.candidate_ids.values())
+    return data_manager.leaderboard.rank_of(candidate_id)
+
+def rank_range(first_place, last_place):
+    """
+    Get the candidates in a stretch of the standings, in time proportional to
+    the stretch rather than the whole field.
+    
+    Args:
+        first_place (int): First position wanted, counting the leader as 1
+        last_place (int): Last position wanted, inclusive
+        
+    Returns:
+        list: (place, candidate name, votes) tuples, most votes first
+    """
+    candidate_names = data_manager.candidate_names
+    if data_manager.shared_tally is not None:
+        standings = []
+        place = 0
+        for position, (candidate_id, votes) in enumerate(shared_ranking(), 1):
+            if position == 1 or votes != standings[-1][2]:
+                place = position
+            standings.append((place, candidate_names[candidate_id], votes))
+        return standings[max(first_place, 1) - 1:max(last_place, 0)]
+    
+    leaderboard = data_manager.leaderboard
+    vote_counts = data_manager.vote_counts
+    return [(leaderboard.rank_of(candidate_id), candidate_names[candidate_id], vote_counts[candidate_id])
+            for candidate_id in leaderboard.ranked[max(first_place, 1) - 1:max(last_place, 0)]]
+
+def top_k(k):
+    """
+    Get the k candidates with the most votes.
+    
+    Args:
+        k (int): Number of candidates wanted
+        
+    Returns:
+        list: (place, candidate name, votes) tuples, most votes first
+    """
+    return rank_range(1, k)
+
+def select_seats(tally, seat_count):
+    """
+    Pick the candidates with the most votes from any tally, by heap selection
+    (O(C log seats)) rather than sorting the whole field.
+    
+    Args:
+        tally (dict): {candidate name: votes}
+        seat_count (int): Number of seats to fill
+        
+    Returns:
+        tuple: Contains:
+            - list: Names of the candidates elected outright, most votes first
+            - list: Names of the candidates tied for the remaining seats
+            - int: The vote count of the last seat
+    """
+    front_runners = heapq.nlargest(seat_count, tally.items(), key=lambda item: item[1])
+    if not front_runners:
+        return [], [], 0
+    last_seat_votes = front_runners[-1][1]
+    elected = [candidate for candidate, votes in front_runners if votes > last_seat_votes]
+    tied = [candidate for candidate, votes in tally.items() if votes == last_seat_votes]
+    # A tie that fits in the seats left is no tie at all
+    if len(elected) + len(tied) <= seat_count:
+        return elected + tied, [], last_seat_votes
+    return elected, tied, last_seat_votes
+
+def find_seat_winners(seat_count, tally=None):
+    """
+    Find the candidates who fill the seats, and any tie for the last of them.
+    
+    Args:
+        seat_count (int): Number of seats to fill
+        tally (dict, optional): {candidate name: votes} to use instead of the live tally
+        
+    Returns:
+        tuple: As from select_seats()
+    """
+    if tally is not None:
+        return select_seats(tally, seat_count)
+    if data_manager.shared_tally is not None:
+        return select_seats(dict(ranked_standings()), seat_count)
+    
+    # The live tally is already ranked, so the seats are its head
+    leaderboard = data_manager.leaderboard
+    ranked = leaderboard.ranked
+    if not ranked or seat_count <= 0:
+        return [], [], 0
+    candidate_names = data_manager.candidate_names
+    last_seat_votes = data_manager.vote_counts[ranked[min(seat_count, len(ranked)) - 1]]
+    first_tied = leaderboard.run_start[last_seat_votes]
+    last_tied = leaderboard.run_end[last_seat_votes]
+    if last_tied < seat_count:
+        return [candidate_names[candidate_id] for candidate_id in ranked[:last_tied + 1]], [], last_seat_votes
+    elected = [candidate_names[candidate_id] for candidate_id in ranked[:first_tied]]
+    tied = [candidate_names[candidate_id] for candidate_id in sorted(ranked[first_tied:last_tied + 1])]
+    return elected, tied, last_seat_votes
+
+def ballot_groups():
+    """
+    Group the ballots by preference order, so that each distinct ranking is
+    counted once with a weight instead of once per ballot. Choices that are no
+    longer standing are left out.
+    
+    Returns:
+        Counter: {tuple of candidate IDs, first choice first: number of ballots}
+    
+    Raises:
+        RuntimeError: If the tally is shared, as from check_ballots_visible()
+    """
+    check_ballots_visible()
+    candidate_ids = data_manager.candidate_ids
+    ballots = data_manager.registry.ballots
+    ballot_rankings = data_manager.ballot_rankings
+    
+    # Ranked ballots are grouped on their names first, which runs at C speed,
+    # so only the distinct rankings are turned into candidate IDs
+    named_groups = Counter(zip(map(ballots.__getitem__, ballot_rankings), ballot_rankings.values()))
+    groups = Counter()
+    ranked_first_choices = Counter()
+    for (first_choice, later_choices), ballot_count in named_groups.items():
+        ranking = (first_choice,) + tuple(candidate_ids[name] for name in later_choices if name in candidate_ids)
+        groups[ranking] += ballot_count
+        ranked_first_choices[first_choice] += ballot_count
+    
+    # Every other ballot names a single candidate, so the tally already groups them
+    vote_counts = data_manager.vote_counts
+    for candidate_id in candidate_ids.values():
+        single_choice_count = vote_counts[candidate_id] - ranked_first_choices[candidate_id]
+        if single_choice_count:
+            groups[(candidate_id,)] += single_choice_count
+    return groups
+
+def instant_runoff():
+    """
+    Count the ballots by instant runoff: while nobody holds a majority of the
+    ballots still in play, the candidate with the fewest votes is eliminated
+    and their ballots move to each ballot's next choice still standing.
+    
+    Ballots are grouped by ranking and kept in one pile per candidate, so each
+    round only re-routes the eliminated candidate's pile. A tie for the fewest
+    votes eliminates the candidate who had fewer votes in the first round, then
+    the one added last.
+    
+    Returns:
+        tuple: Contains:
+            - list: Names of the winner(s); more than one if the last
+              candidates standing are tied
+            - list: One dict per round with "tally" ({candidate name: votes},
+              most votes first), "eliminated" (name or None) and "exhausted"
+              (ballots with no choice left standing)
+    """
+    candidate_names = data_manager.candidate_names
+    order = {candidate_id: position for position, candidate_id in enumerate(data_manager.candidate_ids.values())}
+    
+    # Pile of (ranking, position of the current choice, ballots) per candidate
+    piles = {candidate_id: [] for candidate_id in order}
+    totals = dict.fromkeys(order, 0)
+    for ranking, ballot_count in ballot_groups().items():
+        piles[ranking[0]].append((ranking, 0, ballot_count))
+        totals[ranking[0]] += ballot_count
+    first_round = dict(totals)
+    exhausted = 0
+    rounds = []
+    
+    while totals:
+        standings = sorted(totals.items(), key=lambda item: (-item[1], order[item[0]]))
+        tally = {candidate_names[candidate_id]: votes for candidate_id, votes in standings}
+        active_ballots = sum(totals.values())
+        leader_id, leader_votes = standings[0]
+        
+        # A majority wins; so does the last candidate, and a tie between all who remain
+        if 2 * leader_votes > active_ballots or len(totals) == 1:
+            rounds.append({"tally": tally, "eliminated": None, "exhausted": exhausted})
+            return [candidate_names[leader_id]], rounds
+        if standings[-1][1] == leader_votes:
+            rounds.append({"tally": tally, "eliminated": None, "exhausted": exhausted})
+            return [candidate_names[candidate_id] for candidate_id, _ in standings], rounds
+        
+        eliminated_id = min(totals, key=lambda candidate_id: (totals[candidate_id], first_round[candidate_id],
+                                                               -order[candidate_id]))
+        rounds.append({"tally": tally, "eliminated": candidate_names[eliminated_id], "exhausted": exhausted})
+        del totals[eliminated_id]
+        
+        # Move only the eliminated candidate's ballots on to their next choice
+        for ranking, position, ballot_count in piles.pop(eliminated_id):
+            position += 1
+            while position < len(ranking) and ranking[position] not in totals:
+                position += 1
+            if position < len(ranking):
+                piles[ranking[position]].append((ranking, position, ballot_count))
+                totals[ranking[position]] += ballot_count
+            else:
+                exhausted += ballot_count
+    return [], rounds
+
+def droop_quota(ballot_count, seat_count):
+    """
+    Smallest whole number of votes that only seat_count candidates can reach.
+    """
+    return ballot_count // (seat_count + 1) + 1
+
+def single_transferable_vote(seat_count):
+    """
+    Fill seat_count seats by single transferable vote, with the Droop quota
+    and Gregory surplus transfers in exact fractions.
+    
+    A candidate who reaches the quota is elected, and the votes they hold
+    beyond it move on at a fractional value: every ballot in their pile
+    carries on at surplus / their total. When nobody reaches the quota, the
+    candidate with the fewest votes is eliminated (ties as in instant_runoff())
+    and their ballots move on at full value.
+    
+    Each candidate's pile maps the rest of a ranking, after that candidate, to
+    the vote value it holds, so ballots that agree from there on are moved as
+    one entry and a transfer touches only the pile it empties.
+    
+    Args:
+        seat_count (int): Number of seats to fill
+        
+    Returns:
+        tuple: Contains:
+            - list: Names of the elected candidates, in the order elected
+            - list: One dict per count with "tally" ({candidate name: votes
+              rounded to 2 places}, most votes first), "elected" (list of
+              names), "eliminated" (name or None) and "exhausted" (votes with
+              no choice left standing, rounded)
+            - int: The quota
+    
+    Raises:
+        ValueError: If seat_count is less than 1
+    """
+    if seat_count < 1:
+        raise ValueError(f"cannot fill {seat_count} seats")
+    candidate_names = data_manager.candidate_names
+    order = {candidate_id: position for position, candidate_id in enumerate(data_manager.candidate_ids.values())}
+    
+    piles = {candidate_id: defaultdict(int) for candidate_id in order}
+    ballot_count = 0
+    for ranking, group_size in ballot_groups().items():
+        piles[ranking[0]][ranking[1:]] += group_size
+        ballot_count += group_size
+    totals = {candidate_id: sum(pile.values()) for candidate_id, pile in piles.items()}
+    first_count = dict(totals)
+    quota = droop_quota(ballot_count, seat_count)
+    elected = []
+    exhausted = 0
+    rounds = []
+    
+    def transfer(candidate_id, value):
+        # Move a pile on to each entry's next choice still standing, at value per vote
+        nonlocal exhausted
+        for later_choices, votes in piles.pop(candidate_id).items():
+            votes *= value
+            for position, choice in enumerate(later_choices):
+                if choice in totals:
+                    piles[choice][later_choices[position + 1:]] += votes
+                    totals[choice] += votes
+                    break
+            else:
+                exhausted += votes
+    
+    def record_round(newly_elected, eliminated_id):
+        standings = sorted(totals.items(), key=lambda item: (-item[1], order[item[0]]))
+        rounds.append({
+            "tally": {candidate_names[candidate_id]: round(float(votes), 2) for candidate_id, votes in standings},
+            "elected": [candidate_names[candidate_id] for candidate_id in newly_elected],
+            "eliminated": candidate_names[eliminated_id] if eliminated_id is not None else None,
+            "exhausted": round(float(exhausted), 2),
+        })
+    
+    # Surpluses still to be transferred, as (candidate ID, votes held)
+    surpluses = []
+    while len(elected) < seat_count and totals:
+        # Everyone left fills the remaining seats
+        if len(elected) + len(totals) <= seat_count:
+            newly_elected = sorted(totals, key=lambda candidate_id: (-totals[candidate_id], order[candidate_id]))
+            record_round(newly_elected, None)
+            elected += newly_elected
+            break
+        
+        newly_elected = sorted((candidate_id for candidate_id, votes in totals.items() if votes >= quota),
+                               key=lambda candidate_id: (-totals[candidate_id], order[candidate_id]))
+        if newly_elected:
+            record_round(newly_elected, None)
+            for candidate_id in newly_elected:
+                elected.append(candidate_id)
+                surpluses.append((candidate_id, totals.pop(candidate_id)))
+            continue
+        
+        if surpluses:
+            # The largest surplus moves first
+            surpluses.sort(key=lambda surplus: surplus[1])
+            candidate_id, votes = surpluses.pop()
+            if votes > quota:
+                transfer(candidate_id, Fraction(votes - quota, votes))
+            else:
+                piles.pop(candidate_id)
+            continue
+        
+        eliminated_id = min(totals, key=lambda candidate_id: (totals[candidate_id], first_count[candidate_id],
+                                                               -order[candidate_id]))
+        record_round([], eliminated_id)
+        del totals[eliminated_id]
+        transfer(eliminated_id, 1)
+    
+    return [candidate_names[candidate_id] for candidate_id in elected], rounds, quota
+
+def pairwise_preferences():
+    """
+    Count, for every pair of candidates, how many ballots rank one above the
+    other. A ballot ranks every candidate it lists above every one it leaves out.
+    
+    Each distinct ranking is counted once with its weight. Rather than adding
+    the weight to each of the C - p candidates below position p, it is added
+    once to the row's base count and taken back for the p candidates above, so
+    a ranking of k choices costs O(k^2) whatever the size of the field.
+    
+    Returns:
+        tuple: Contains:
+            - list: Candidate IDs in display order
+            - list: Matrix as a list of rows; entry [i][j] is the number of
+              ballots preferring the i-th candidate to the j-th
+    """
+    candidate_ids = list(data_manager.candidate_ids.values())
+    index = {candidate_id: position for position, candidate_id in enumerate(candidate_ids)}
+    size = len(candidate_ids)
+    base = [0] * size
+    corrections = defaultdict(int)
+    
+    for ranking, ballot_count in ballot_groups().items():
+        positions = [index[candidate_id] for candidate_id in ranking]
+        for rank, preferred in enumerate(positions):
+            base[preferred] += ballot_count
+            # Not preferred to itself or to anyone ranked above it
+            for above in positions[:rank + 1]:
+                corrections[preferred, above] -= ballot_count
+    
+    matrix = [[votes] * size for votes in base]
+    for (preferred, other), ballot_count in corrections.items():
+        matrix[preferred][other] += ballot_count
+    for position in range(size):
+        matrix[position][position] = 0
+    return candidate_ids, matrix
+
+def schulze():
+    """
+    Rank the candidates by the Schulze method over the pairwise preferences.
+    
+    The strength of a path from one candidate to another is its weakest
+    pairwise win. Rather than a Floyd-Warshall pass over every triple, the
+    wins are added strongest first while the candidates each one can reach
+    are kept as bitsets: the strongest path between a pair is the win that
+    first connects them, and a win between candidates already connected
+    changes nothing and is skipped.
+    
+    Returns:
+        tuple: Contains:
+            - list: Names of the winner(s); a Condorcet winner is always the sole winner
+            - list: (candidate name, number of candidates they beat) pairs,
+              most wins first
+            - str: Name of the Condorcet winner, who beats every other
+              candidate head to head, or None if there is none
+    """
+    candidate_ids, matrix = pairwise_preferences()
+    candidate_names = data_manager.candidate_names
+    size = len(candidate_ids)
+    
+    condorcet_winner = None
+    for position in range(size):
+        if all(matrix[position][other] > matrix[other][position] for other in range(size) if other != position):
+            condorcet_winner = candidate_names[candidate_ids[position]]
+    
+    # Only a pairwise win is a link in a path
+    links = sorted(((votes, position, other) for position, row in enumerate(matrix)
+                    for other, votes in enumerate(row) if votes > matrix[other][position]), reverse=True)
+    strength = [[0] * size for _ in range(size)]
+    reaches = [0] * size
+    reached_by = [1 << position for position in range(size)]
+    for votes, start, end in links:
+        if reaches[start] >> end & 1:
+            continue
+        # Everyone who reaches start now reaches end and everything end reaches
+        targets = reaches[end] | 1 << end
+        sources = reached_by[start]
+        while sources:
+            source_bit = sources & -sources
+            sources ^= source_bit
+            source = source_bit.bit_length() - 1
+            new_targets = targets & ~reaches[source] & ~source_bit
+            reaches[source] |= new_targets
+            while new_targets:
+                target_bit = new_targets & -new_targets
+                new_targets ^= target_bit
+                target = target_bit.bit_length() - 1
+                strength[source][target] = votes
+                reached_by[target] |= source_bit
+    
+    wins = [sum(strength[position][other] > strength[other][position] for other in range(size))
+            for position in range(size)]
+    ranking = sorted(range(size), key=lambda position: -wins[position])
+    standings = [(candidate_names[candidate_ids[position]], wins[position]) for position in ranking]
+    winners = [candidate_names[candidate_ids[position]] for position in range(size)
+               if all(strength[position][other] >= strength[other][position] for other in range(size))]
+    return winners, standings, condorcet_winner
+
+def score_totals():
+    """
+    Total the approval and score ballots. Each candidate's total is the sum
+    of their column of the score matrix, taken as one strided slice and
+    summed in C rather than ballot by ballot.
+    
+    Returns:
+        dict: {candidate name: total score} in display order
+    
+    Raises:
+        RuntimeError: If the tally is shared, as from check_ballots_visible()
+    """
+    check_ballots_visible()
+    score_width = data_manager.score_width
+    score_matrix = data_manager.score_matrix
+    return {candidate_name: sum(score_matrix[candidate_id::score_width]) if candidate_id < score_width else 0
+            for candidate_name, candidate_id in data_manager.candidate_ids.items()}
+
+def declare_score_winners(seat_count):
+    """
+    Declare the winner(s) of an approval or score election, filling seat_count
+    seats with the highest totals.
+    
+    Args:
+        seat_count (int): Number of seats being filled
+    """
+    totals = score_totals()
+    unit = "approvals" if voting_method == APPROVAL else "points"
+    elected, tied, last_seat_votes = select_seats(totals, seat_count)
+    
+    print(f"\n📊 Total {unit}:")
+    for candidate_name, total in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f"- {candidate_name.title()}: {total} {unit}")
+    
+    if len(elected) == 1 and seat_count == 1:
+        print(f"\n🏆 Winner of the election is: {elected[0].title()} with {totals[elected[0]]} {unit}!")
+        return
+    if elected:
+        print(f"\n🏛️ Elected to the {seat_count} seat(s):")
+        for candidate_name in elected:
+            print(f"- {candidate_name.title()} ({totals[candidate_name]} {unit})")
+    if tied:
+        print(f"\n🤝 Tied with {last_seat_votes} {unit} each for the last {seat_count - len(elected)} seat(s):")
+        for candidate_name in tied:
+            print(f"- {candidate_name.title()}")
+
+def declare_schulze_winner():
+    """
+    Declare the Schulze winner(s) and the Schulze ranking.
+    """
+    winning_candidates, standings, condorcet_winner = schulze()
+    
+    print("\n⚔️ Schulze ranking (candidates beaten by strongest path):")
+    for candidate_name, wins in standings:
+        print(f"- {candidate_name.title()}: {wins}")
+    
+    if condorcet_winner is not None:
+        print(f"\n🏆 {condorcet_winner.title()} is the Condorcet winner, beating every other candidate head to head!")
+    elif len(winning_candidates) == 1:
+        print(f"\n🏆 There is no Condorcet winner; the Schulze winner is: {winning_candidates[0].title()}!")
+    else:
+        print("\n🤝 There is no Condorcet winner, and the Schulze method ties between:")
+        for candidate_name in winning_candidates:
+            print(f"- {candidate_name.title()}")
+
+def declare_stv_winners(seat_count):
+    """
+    Declare the candidates elected by single transferable vote and show each count.
+    
+    Args:
+        seat_count (int): Number of seats being filled
+    """
+    elected, rounds, quota = single_transferable_vote(seat_count)
+    
+    print(f"\n📏 Quota: {quota} votes")
+    for round_number, count in enumerate(rounds, 1):
+        print(f"\n🔁 Count {round_number}:")
+        for candidate_name, votes in count["tally"].items():
+            print(f"- {candidate_name.title()}: {votes:g} votes")
+        if count["exhausted"]:
+            print(f"  ({count['exhausted']:g} votes have no choice left standing)")
+        for candidate_name in count["elected"]:
+            print(f"✅ {candidate_name.title()} is elected.")
+        if count["eliminated"]:
+            print(f"❌ {count['eliminated'].title()} is eliminated.")
+    
+    print(f"\n🏛️ Elected to the {seat_count} seats by single transferable vote:")
+    for candidate_name in elected:
+        print(f"- {candidate_name.title()}")
+
+def declare_runoff_winner():
+    """
+    Declare the instant-runoff winner(s) and show how each round went.
+    """
+    winning_candidates, rounds = instant_runoff()
+    
+    for round_number, count in enumerate(rounds, 1):
+        print(f"\n🔁 Round {round_number}:")
+        for candidate_name, votes in count["tally"].items():
+            print(f"- {candidate_name.title()}: {votes} votes")
+        if count["exhausted"]:
+            print(f"  ({count['exhausted']} ballots have no choice left standing)")
+        if count["eliminated"]:
+            print(f"❌ {count['eliminated'].title()} is eliminated.")
+    
+    if len(winning_candidates) == 1:
+        print(f"\n🏆 Winner of the election by instant runoff is: {winning_candidates[0].title()}!")
+    else:
+        print("\n🤝 The instant runoff ends in a tie between the following candidates:")
+        for candidate_name in winning_candidates:
+            print(f"- {candidate_name.title()}")
+
+def declare_seat_winners(seat_count):
+    """
+    Declare the candidates elected to a multi-seat body and any tie for the last seat(s).
+    
+    Args:
+        seat_count (int): Number of seats being filled
+    """
+    elected, tied, last_seat_votes = find_seat_winners(seat_count)
+    
+    print(f"\n🏛️ Elected to the {seat_count} seats:")
+    for candidate_name in elected:
+        print(f"- {candidate_name.title()} ({data_manager.candidates[candidate_name]} votes)")
+    if tied:
+        open_seats = seat_count - len(elected)
+        print(f"\n🤝 Tied with {last_seat_votes} votes each for the last {open_seats} seat(s):")
+        for candidate_name in tied:
+            print(f"- {candidate_name.title()}")
 
 def declare_winner():
     """
@@ -37,10 +664,32 @@ def declare_winner():
     """
     winning_candidates, highest_vote_count = find_winners()
     
-    if not data_manager.voting_history:
+    if not total_votes():
         print("\n⚠️ No votes were cast in this election.")
         return
     
+    if voting_method != PLURALITY:
+        try:
+            check_ballots_visible()
+        except RuntimeError as error:
+            print(f"\n⚠️ Only the plurality count can be made here: {error}.")
+            return
+    if voting_method == INSTANT_RUNOFF:
+        declare_runoff_winner()
+        return
+    if voting_method == SINGLE_TRANSFERABLE_VOTE:
+        declare_stv_winners(seats)
+        return
+    if voting_method == SCHULZE:
+        declare_schulze_winner()
+        return
+    if voting_method in (APPROVAL, SCORE):
+        declare_score_winners(seats)
+        return
+    if seats > 1:
+        declare_seat_winners(seats)
+        return
+    
     # Check if there is a single winner or multiple winners (tie)
     if len(winning_candidates) == 1:
         print(f"\n🏆 Winner of the election is: {winning_candidates[0].title()} with {highest_vote_count} votes!")
@@ -0,0 +1,170 @@
+# ------------------------------------------
+# Polling Server Module - Accepts votes from many terminals at once
+# ------------------------------------------
+#
+# Terminals connect over TCP or a Unix socket and send one JSON request per
+# line; each gets one JSON response line, in order, so requests may be
+# pipelined:
+#
+#   {"op": "vote", "voter": "...", "signum": "...", "candidate": "...", "id": 7}
+#   -> {"result": "ok", "id": 7}
+#
+# A ranked vote adds "later_choices": [...], the further candidates in order;
+# an approval or score ballot gives "scores": {"candidate": score, ...}
+# in place of "candidate".
+# Other operations: "authenticate" (voter, signum), "candidates", "tally",
+# "winners", "runoff", "stv" (seats), "schulze", "scores" and "progress". "id" is optional and echoed back unchanged.
+#
+# Every connection is served by the same asyncio event loop, and requests are
+# handled to completion without awaiting, so the election data is only ever
+# changed by one request at a time and needs no locks.
+
+import asyncio
+import json
+import os
+import signal
+
+import data_manager
+import engine
+
+# Result code for a request that cannot be understood
+BAD_REQUEST = "bad_request"
+
+# Result code for a request that failed while being carried out
+SERVER_ERROR = "server_error"
+
+# Longest request line accepted, in bytes
+MAX_REQUEST_SIZE = 64 * 1024
+
+# Bytes read from a terminal at a time
+READ_SIZE = 64 * 1024
+
+# Pending connections the OS queues before accept()
+CONNECTION_BACKLOG = 4096
+
+def handle_request(line):
+    """
+    Carry out one request line and build its response line.
+
+    Args:
+        line (bytes): JSON request
+
+    Returns:
+        bytes: JSON response, newline terminated
+    """
+    try:
+        request = json.loads(line)
+        operation = request["op"]
+        if operation == "vote" and "scores" in request:
+            scores = request["scores"].items()
+            response = {"result": engine.election.cast_scored_vote(request["voter"], request["signum"], scores)}
+        elif operation == "vote":
+            later_choices = request.get("later_choices", [])
+            if not isinstance(later_choices, list):
+                raise TypeError("later_choices")
+            response = {"result": engine.election.cast_vote(request["voter"], request["signum"], request["candidate"],
+                                                            later_choices)}
+        elif operation == "authenticate":
+            response = {"result": engine.election.authenticate_voter(request["voter"], request["signum"])}
+        elif operation == "candidates":
+            response = {"result": engine.OK, "candidates": list(data_manager.candidate_ids)}
+        elif operation == "tally":
+            response = {"result": engine.OK, "tally": engine.election.tally()}
+        elif operation == "winners":
+            winning_candidates, highest_vote_count = engine.election.winners()
+            response = {"result": engine.OK, "winners": winning_candidates, "votes": highest_vote_count}
+        elif operation == "runoff":
+            winning_candidates, rounds = engine.election.instant_runoff()
+            response = {"result": engine.OK, "winners": winning_candidates, "rounds": rounds}
+        elif operation == "stv":
+            elected, rounds, quota = engine.election.single_transferable_vote(int(request["seats"]))
+            response = {"result": engine.OK, "elected": elected, "rounds": rounds, "quota": quota}
+        elif operation == "schulze":
+            winning_candidates, standings, condorcet_winner = engine.election.schulze()
+            response = {"result": engine.OK, "winners": winning_candidates, "standings": standings,
+                        "condorcet_winner": condorcet_winner}
+        elif operation == "scores":
+            response = {"result": engine.OK, "scores": engine.election.score_totals()}
+        elif operation == "progress":
+            response = {"result": engine.OK, **engine.election.progress()}
+        else:
+            response = {"result": BAD_REQUEST}
+        if "id" in request:
+            response["id"] = request["id"]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        response = {"result": BAD_REQUEST}
+    except Exception as error:
+        # Only this request fails; the rest of its batch is still answered
+        print(f"⚠️ Request failed: {error!r}")
+        response = {"result": SERVER_ERROR}
+    return json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n"
+
+async def serve_terminal(reader, writer):
+    """
+    Answer requests from one terminal until it disconnects.
+
+    Every complete request that has arrived is answered before the next read,
+    and the responses go back in a single write, so pipelined requests cost
+    one send between them rather than one each.
+    """
+    partial_line = b""
+    try:
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                break
+            lines = (partial_line + data).split(b"\n")
+            partial_line = lines.pop()
+            if len(partial_line) > MAX_REQUEST_SIZE:
+                break
+            if lines:
+                writer.write(b"".join(map(handle_request, lines)))
+                # Only waits when the terminal is not reading its responses
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(address):
+    """
+    Accept terminals on an address until SIGINT or SIGTERM.
+
+    Args:
+        address (str): "host:port" for TCP, otherwise the path of a Unix socket
+    """
+    unix_socket = ":" not in address
+    if not unix_socket:
+        host, port = address.rsplit(":", 1)
+        server = await asyncio.start_server(serve_terminal, host or None, int(port),
+                                            backlog=CONNECTION_BACKLOG)
+    else:
+        if os.path.exists(address):
+            os.remove(address)
+        server = await asyncio.start_unix_server(serve_terminal, address,
+                                                 backlog=CONNECTION_BACKLOG)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except NotImplementedError:
+            # Windows event loops take no signal handlers
+            signal.signal(signal_number, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+    print(f"🖥️ Accepting polling terminals on {address} (Ctrl+C to stop)")
+    async with server:
+        await stop.wait()
+    if unix_socket:
+        os.remove(address)
+    print("\n🔚 Polling server stopped.")
+
+def run_server(address):
+    """
+    Run the polling server in the current thread until it is stopped.
+
+    Args:
+        address (str): "host:port" for TCP, otherwise the path of a Unix socket
+    """
+    asyncio.run(serve(address))
@@ -0,0 +1,185 @@
+# ------------------------------------------
+# Shared Tally Module - One tally for several booth processes on one host
+# ------------------------------------------
+#
+# Booth processes (each running the normal menus on its own terminal) attach
+# to one block of shared memory:
+#
+#   header            int64 magic, shards, candidate slots, voter slots
+#   counts            int64 x shards x candidate slots
+#   voted             uint8 x voter slots      1 once any booth took the ballot
+#
+# Each booth owns one shard (a row of counts) and only ever adds to its own
+# row, so increments need no locking; a reader sums the rows. A voter's ballot
+# is claimed with a test-and-set on their voted byte, made safe across
+# processes by a POSIX byte-range lock on a lock file at the voter's ID. No
+# central process is involved: a vote costs one lock, one byte and one add.
+#
+# A booth holds the lock on its shard's own byte for as long as it is attached,
+# so a shard is free exactly when no live process holds it, and the OS frees
+# it if a booth dies. The candidates and the voters roll must not change while
+# booths share a tally.
+
+import os
+import struct
+import tempfile
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import fcntl
+except ImportError:
+    # The ballot claims rest on POSIX byte-range locks
+    fcntl = None
+
+SHARED_TALLY_MAGIC = 0x454C454354534854  # "ELECTSHT"
+
+# Number of booth processes that can share one tally
+DEFAULT_SHARDS = 16
+
+HEADER = struct.Struct("<qqqq")
+
+# Lock-file offset of shard 0's ownership lock; voter locks sit below it
+SHARD_LOCK_BASE = 1 << 40
+
+class SharedTally:
+    """
+    A tally and ballot claims shared between booth processes through
+    multiprocessing.shared_memory.
+    """
+
+    def __init__(self, name, candidate_slots=0, voter_slots=0, shards=DEFAULT_SHARDS, create=False):
+        """
+        Args:
+            name (str): Name of the shared memory block
+            candidate_slots (int): Number of candidate IDs (when creating)
+            voter_slots (int): Number of voter IDs (when creating)
+            shards (int): Largest number of booths (when creating)
+            create (bool): Create the block instead of attaching to it
+
+        Raises:
+            FileExistsError: If create is set and the block already exists
+            FileNotFoundError: If attaching and the block does not exist
+            RuntimeError: If every shard is already taken, or this platform
+                has no POSIX file locks
+        """
+        if fcntl is None:
+            raise RuntimeError("a shared tally is not supported on this platform")
+        size = HEADER.size + 8 * shards * candidate_slots + voter_slots
+        self.memory = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        # Booths decide between themselves when the block goes away (see close())
+        resource_tracker.unregister(self.memory._name, "shared_memory")
+        if create:
+            HEADER.pack_into(self.memory.buf, 0, SHARED_TALLY_MAGIC, shards, candidate_slots, voter_slots)
+        magic, self.shards, self.candidate_slots, self.voter_slots = HEADER.unpack_from(self.memory.buf, 0)
+        if magic != SHARED_TALLY_MAGIC:
+            self.memory.close()
+            raise ValueError(f"{name} is not a shared election tally")
+
+        counts_end = HEADER.size + 8 * self.shards * self.candidate_slots
+        self.rows = [self.memory.buf[HEADER.size + 8 * shard * self.candidate_slots:
+                                     HEADER.size + 8 * (shard + 1) * self.candidate_slots].cast('q')
+                     for shard in range(self.shards)]
+        self.voted = self.memory.buf[counts_end:counts_end + self.voter_slots]
+
+        self.lock_file = open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), 'a+b')
+        self.shard = self._take_shard()
+        self.counts = self.rows[self.shard]
+
+    def _take_shard(self):
+        # The first shard whose ownership lock is free becomes this booth's
+        for shard in range(self.shards):
+            try:
+                fcntl.lockf(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, SHARD_LOCK_BASE + shard)
+                return shard
+            except OSError:
+                continue
+        self.close()
+        raise RuntimeError(f"all {self.shards} booths of the shared tally are in use")
+
+    def load(self, vote_counts, eligible):
+        """
+        Fill a newly created block from the election data it starts with.
+        Claims are only ever added, so a booth that attached in the meantime
+        keeps any ballot it already took.
+
+        Args:
+            vote_counts (array): Vote count per candidate ID
+            eligible (bytearray): Eligibility bitmap, one bit per voter ID
+        """
+        self.counts[:len(vote_counts)] = vote_counts
+        for byte_index, bits in enumerate(eligible):
+            if bits != 0xFF:
+                for voter_id in range(byte_index << 3, min((byte_index + 1) << 3, self.voter_slots)):
+                    if not bits >> (voter_id & 7) & 1:
+                        self.voted[voter_id] = 1
+
+    def claim(self, voter_id):
+        """
+        Take a voter's ballot for this booth, unless some booth already has.
+
+        Returns:
+            bool: True if the ballot is now this booth's to cast
+        """
+        fcntl.lockf(self.lock_file, fcntl.LOCK_EX, 1, voter_id)
+        try:
+            if self.voted[voter_id]:
+                return False
+            self.voted[voter_id] = 1
+            return True
+        finally:
+            fcntl.lockf(self.lock_file, fcntl.LOCK_UN, 1, voter_id)
+
+    def release(self, voter_id):
+        """
+        Give back a voter's ballot after it was withdrawn.
+        """
+        self.voted[voter_id] = 0
+
+    def has_voted(self, voter_id):
+        """
+        Check whether any booth has taken a voter's ballot.
+        """
+        return self.voted[voter_id] != 0
+
+    def add(self, candidate_id, amount):
+        """
+        Change a candidate's count in this booth's shard.
+        """
+        self.counts[candidate_id] += amount
+
+    def count(self, candidate_id):
+        """
+        Returns:
+            int: A candidate's votes over every booth
+        """
+        return sum(row[candidate_id] for row in self.rows)
+
+    def combined_counts(self):
+        """
+        Returns:
+            list: Vote count per candidate ID over every booth
+        """
+        return [sum(column) for column in zip(*self.rows)]
+
+    def close(self):
+        """
+        Detach from the block, and remove it if no other booth is attached.
+        """
+        for view in self.rows:
+            view.release()
+        self.voted.release()
+        self.rows = []
+        last_booth = True
+        for shard in range(self.shards):
+            try:
+                fcntl.lockf(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, SHARD_LOCK_BASE + shard)
+            except OSError:
+                last_booth = False
+                break
+        self.memory.close()
+        if last_booth:
+            # unlink() unregisters the block again
+            resource_tracker.register(self.memory._name, "shared_memory")
+            self.memory.unlink()
+            os.remove(self.lock_file.name)
+        self.lock_file.close()
@@ -0,0 +1,284 @@
+# ------------------------------------------
+# Snapshot Module - Binary save/restore of the complete election data
+# ------------------------------------------
+#
+# File layout (little-endian, every section starts on an 8-byte boundary):
+#
+#   header            magic, format version, data version and section sizes
+#   string offsets    uint64 x (strings + 1)   start of each string in the blob
+#   string blob       UTF-8 strings, each followed by a NUL byte: one name per
+#                     candidate ID, then one name and one SIGNUM per voter ID,
+#                     then the later choices of every ranked ballot
+#   candidates        int64 votes x C, uint32 live candidate ID x L (display order)
+#   voters            int32 ballot x V, int32 vote position x V, eligibility bitmap
+#   name index        int32 x index size      the registry's hash index
+#   vote order        int32 voter ID x H      (voting order)
+#   candidate voters  uint32 length x C, then int32 voter IDs  (inverted index,
+#                     one run per candidate ID, stale entries included)
+#   ranked ballots    int32 voter ID x R, uint32 number of later choices x R
+#   score ballots     int32 voter ID x S (-1 for a withdrawn row), then the
+#                     score matrix, uint8 x S x score width
+#   unexported        int32 voter ID x E      ballots cast since the station's
+#                     last export
+#
+# Records are fixed-width and stored per ID, so free candidate slots and removed
+# voters keep their place (with an empty name). Restoring is a single decode of
+# the string blob plus memcpy of each column out of an mmap; no text is parsed
+# and no per-voter dict is built.
+
+import mmap
+import os
+import struct
+from array import array
+from itertools import accumulate
+
+import data_manager
+import journal
+from registry import VoterRegistry
+
+SNAPSHOT_FILE = "election_snapshot.bin"
+SNAPSHOT_MAGIC = b"ELECTSNP"
+SNAPSHOT_FORMAT_VERSION = 7
+
+# magic, format version, data version, strings, blob bytes, candidate slots,
+# live candidates, voter slots, live voters, eligible voters, votes cast,
+# index size, used index slots, ranked ballots, score rows, score width,
+# unexported ballots
+HEADER = struct.Struct("<8sIQQQIIIIIIIIIIII")
+
+def _padding(size):
+    """
+    Number of zero bytes needed to bring a section of the given size to an 8-byte boundary.
+    """
+    return -size % 8
+
+def write_snapshot(file_path=SNAPSHOT_FILE):
+    """
+    Write the current election data to a binary snapshot file.
+
+    The file is written under a temporary name and then renamed, so a crash
+    never leaves a half-written snapshot in place.
+
+    The data is copied first and the file built from the copy, so other
+    threads are held up only for the copy.
+
+    Args:
+        file_path (str): Path to the snapshot file
+
+    Returns:
+        int: Length of the journal when the data was copied; the snapshot
+            covers every record up to there
+    """
+    with data_manager.state_lock:
+        # Drop stale entries so the vote order only lists current ballots
+        if data_manager.votes_cast != len(data_manager.vote_order):
+            data_manager.compact_vote_order()
+
+        covered_length = journal.journal_length()
+        data_version = data_manager.data_version
+        registry = data_manager.registry.copy()
+        candidate_names = data_manager.candidate_names[:]
+        vote_counts = data_manager.vote_counts[:]
+        candidate_order = array('I', data_manager.candidate_ids.values())
+        vote_order = data_manager.vote_order[:]
+        candidate_voter_counts = array('I', map(len, data_manager.candidate_voters))
+        candidate_voters = array('i')
+        for voter_ids in data_manager.candidate_voters:
+            candidate_voters += voter_ids
+        ranked_voters = array('i', data_manager.ballot_rankings)
+        later_choices = list(data_manager.ballot_rankings.values())
+        score_width = data_manager.score_width
+        score_matrix = bytes(data_manager.score_matrix)
+        score_voters = array('i', [-1]) * (len(score_matrix) // score_width if score_width else 0)
+        for voter_id, row in data_manager.score_rows.items():
+            score_voters[row] = voter_id
+        unexported_ballots = data_manager.unexported_ballots[:]
+
+    candidate_slots = len(candidate_names)
+    voter_slots = len(registry.names)
+
+    # String table: candidate names, then voter names, then SIGNUMs, one per ID
+    strings = [name or "" for name in candidate_names]
+    strings += [name or "" for name in registry.names]
+    strings += [signum or "" for signum in registry.signums]
+    strings += [choice for choices in later_choices for choice in choices]
+
+    # Encode the string blob and the offset of every string inside it
+    blob = "".join(text + "\0" for text in strings).encode('utf-8')
+    string_offsets = array('Q', accumulate(map(len, map(str.encode, strings)), lambda total, size: total + size + 1, initial=0))
+
+    sections = [
+        string_offsets, blob,
+        vote_counts, candidate_order,
+        registry.ballots, registry.vote_positions, bytes(registry.eligible),
+        registry.index,
+        vote_order,
+        candidate_voter_counts, candidate_voters,
+        ranked_voters, array('I', map(len, later_choices)),
+        score_voters, score_matrix,
+        unexported_ballots,
+    ]
+
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, data_version,
+            len(strings), len(blob), candidate_slots, len(candidate_order),
+            voter_slots, len(registry), registry.eligible_count, len(vote_order),
+            len(registry.index), registry.index_used, len(ranked_voters),
+            len(score_voters), score_width, len(unexported_ballots),
+        ))
+        file.write(b"\0" * _padding(HEADER.size))
+        for section in sections:
+            data = section if isinstance(section, bytes) else section.tobytes()
+            file.write(data)
+            file.write(b"\0" * _padding(len(data)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, file_path)
+    return covered_length
+
+def read_snapshot(file_path=SNAPSHOT_FILE):
+    """
+    Restore election data from a binary snapshot file through a memory map.
+
+    Args:
+        file_path (str): Path to the snapshot file
+
+    Returns:
+        dict: The candidate tables expected by data_manager.load_candidates(),
+            the voter registry, the vote order, the ranked and score ballots,
+            the ballots not yet exported and the data version
+
+    Raises:
+        ValueError: If the file is not a snapshot this version can read
+    """
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        (magic, format_version, data_version, string_count, blob_size, candidate_slots,
+         candidate_count, voter_slots, voter_count, eligible_count, vote_count,
+         index_size, index_used, ranked_count, score_row_count, score_width,
+         unexported_count) = HEADER.unpack_from(mapped, 0)
+        if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{file_path} is not a supported election snapshot")
+
+        view = memoryview(mapped)
+        position = HEADER.size + _padding(HEADER.size)
+        columns = []
+
+        def take(size, typecode=None):
+            nonlocal position
+            section = view[position:position + size]
+            position += size + _padding(size)
+            if typecode is not None:
+                section = section.cast(typecode)
+                columns.append(section)
+            return section
+
+        def copy(size, typecode):
+            # Columns that stay mutable are copied out of the map in one memcpy
+            column = array(typecode)
+            section = take(size)
+            column.frombytes(section)
+            section.release()
+            return column
+
+        try:
+            take(8 * (string_count + 1)).release()
+            blob = take(blob_size)
+            # Strings are NUL-terminated, so one decode and split recovers them all
+            strings = str(blob, 'utf-8').split("\0")
+            blob.release()
+
+            vote_counts = copy(8 * candidate_slots, 'q')
+            candidate_order = take(4 * candidate_count, 'I')
+
+            registry = VoterRegistry()
+            registry.ballots = copy(4 * voter_slots, 'i')
+            registry.vote_positions = copy(4 * voter_slots, 'i')
+            bitmap = take((voter_slots + 7) // 8)
+            registry.eligible = bytearray(bitmap)
+            bitmap.release()
+            registry.index = copy(4 * index_size, 'i')
+            registry.index_used = index_used
+            registry.eligible_count = eligible_count
+            registry.voter_count = voter_count
+            vote_order = copy(4 * vote_count, 'i')
+            candidate_voter_counts = take(4 * candidate_slots, 'I')
+            voter_runs = take(4 * sum(candidate_voter_counts))
+            candidate_voters = []
+            start = 0
+            for run_length in candidate_voter_counts:
+                voter_ids = array('i')
+                voter_ids.frombytes(voter_runs[start:start + 4 * run_length])
+                candidate_voters.append(voter_ids)
+                start += 4 * run_length
+            voter_runs.release()
+            ranked_voters = take(4 * ranked_count, 'i')
+            choice_counts = take(4 * ranked_count, 'I')
+            score_voters = take(4 * score_row_count, 'i')
+            score_rows = {voter_id: row for row, voter_id in enumerate(score_voters) if voter_id >= 0}
+            matrix = take(score_row_count * score_width)
+            score_matrix = bytearray(matrix)
+            matrix.release()
+            unexported_ballots = copy(4 * unexported_count, 'i')
+
+            # Empty names mark free candidate slots and removed voters
+            candidate_names = [name or None for name in strings[:candidate_slots]]
+            registry.names = strings[candidate_slots:candidate_slots + voter_slots]
+            registry.signums = strings[candidate_slots + voter_slots:candidate_slots + 2 * voter_slots]
+            if voter_count != voter_slots:
+                registry.names = [name or None for name in registry.names]
+                registry.signums = [signum or None for signum in registry.signums]
+            ballot_rankings = {}
+            start = candidate_slots + 2 * voter_slots
+            for voter_id, choice_count in zip(ranked_voters, choice_counts):
+                ballot_rankings[voter_id] = tuple(strings[start:start + choice_count])
+                start += choice_count
+
+            restored = {
+                "data_version": data_version,
+                "candidate_names": candidate_names,
+                "vote_counts": vote_counts,
+                "candidate_order": list(candidate_order),
+                "registry": registry,
+                "vote_order": vote_order,
+                "candidate_voters": candidate_voters,
+                "ballot_rankings": ballot_rankings,
+                "score_width": score_width,
+                "score_matrix": score_matrix,
+                "score_rows": score_rows,
+                "unexported_ballots": unexported_ballots,
+            }
+        finally:
+            # The map cannot be closed while any view into it is still alive
+            for column in columns:
+                column.release()
+            view.release()
+    return restored
+
+def save_checkpoint(file_path=SNAPSHOT_FILE):
+    """
+    Write a snapshot and then drop the journal records it covers.
+
+    Args:
+        file_path (str): Path to the snapshot file
+
+    Returns:
+        bool: True if the snapshot was written, False otherwise
+    """
+    if data_manager.shared_tally is not None:
+        print("\n⚠️ Booths sharing a tally only journal; the snapshot is saved once the election runs on its own.")
+        return False
+    # Booth journals were folded in when the election started
+    booth_paths = journal.booth_journal_paths(journal.journal_file.name if journal.journal_file
+                                              else journal.JOURNAL_FILE)
+    try:
+        covered_length = write_snapshot(file_path)
+    except Exception as e:
+        print(f"\n❌ Error writing election snapshot: {str(e)}")
+        return False
+    journal.truncate_journal(covered_length)
+    for booth_path in booth_paths:
+        os.remove(booth_path)
+    print(f"✅ Election snapshot saved to {file_path}")
+    return True
@@ -0,0 +1,362 @@
+# ------------------------------------------
+# Station Sync Module - Merging the counts of polling stations that sync later
+# ------------------------------------------
+#
+# A polling station may run disconnected and send its count in later. What it
+# sends is part of a mergeable (CRDT) state:
+#
+#   counters   station -> candidate -> [added, withdrawn]
+#              a PN-counter: two grow-only counters per station and candidate,
+#              the candidate's votes at the station being added - withdrawn
+#   voted      station -> voter names
+#              a grow-only set of the voters who cast a ballot at the station
+#
+# Merging keeps the larger value of every counter and the union of every set,
+# so merging exports in any order, any number of times, ends in the same state.
+# The merged tally is adjusted by each change as it is merged rather than
+# summed again, and the central count saves a merge by appending the export to
+# its log (see MergedCountLog), so each merge costs time in proportion to the
+# export, averaged over the merges, not to everything merged before it. A voter found in the voted sets of two
+# stations voted twice; merging reports them as a conflict, since it cannot
+# tell which ballot should stand.
+#
+# Every export carries the station's full counters, a few per candidate, so
+# the newest export merged always brings the central tally up to date. The
+# voters are sent only once each: an export lists the voters since the one
+# before (data_manager.unexported_ballots), and each export is written to a
+# file of its own, numbered in order (A.json -> A.000001.json, A.000002.json,
+# ...), so no export overwrites another whose voters have not been merged yet.
+# The central count must merge every numbered file to see every voter.
+#
+# Exports and saved states are JSON files of the form
+#   {"format": "station_counts", "counters": {...}, "voted": {...}}
+# and the central count's log holds one such document per line.
+
+import json
+import os
+import time
+from collections import Counter
+
+import data_manager
+from registry import NO_VOTE
+
+STATION_COUNTS_FORMAT = "station_counts"
+
+# What this station has exported so far, and what the central count has merged
+STATION_STATE_FILE = "election_station.json"
+MERGED_STATE_FILE = "election_merged.jsonl"
+
+# The central count's log is rewritten in full once the exports appended to it
+# outgrow the full count, and not before it holds this many bytes of them
+MIN_COMPACT_SIZE = 64 * 1024
+
+# Seconds between looks for new exports when following a directory
+FOLLOW_INTERVAL = 2.0
+
+class StationCounts:
+    """
+    The mergeable count of one or more polling stations.
+    """
+
+    def __init__(self):
+        # station -> {candidate name: (added, withdrawn)}
+        self.counters = {}
+        # station -> set of voter names
+        self.voted = {}
+        # voter name -> first station seen with their ballot
+        self.voter_stations = {}
+        # voter name -> every station with their ballot, for voters with more than one
+        self.conflicts = {}
+        # candidate name -> votes over every station
+        self.tally = Counter()
+
+    def merge(self, delta):
+        """
+        Merge an export of another StationCounts into this one.
+
+        Args:
+            delta (dict): Exported counts, as from to_dict() or station_delta()
+
+        Returns:
+            int: Number of counters and set entries that changed
+
+        Raises:
+            ValueError: If delta is not an export of station counts
+        """
+        if not isinstance(delta, dict) or delta.get("format") != STATION_COUNTS_FORMAT:
+            raise ValueError("not an export of station counts")
+
+        changed = 0
+        for station, candidate_counters in delta.get("counters", {}).items():
+            station_counters = self.counters.setdefault(station, {})
+            for candidate_name, (added, withdrawn) in candidate_counters.items():
+                if not (isinstance(added, int) and isinstance(withdrawn, int) and 0 <= withdrawn <= added):
+                    raise ValueError(f"bad counter for {candidate_name} at {station}")
+                old_added, old_withdrawn = station_counters.get(candidate_name, (0, 0))
+                if added <= old_added and withdrawn <= old_withdrawn:
+                    continue
+                added, withdrawn = max(added, old_added), max(withdrawn, old_withdrawn)
+                station_counters[candidate_name] = (added, withdrawn)
+                self.tally[candidate_name] += (added - old_added) - (withdrawn - old_withdrawn)
+                changed += 1
+
+        for station, voter_names in delta.get("voted", {}).items():
+            station_voters = self.voted.setdefault(station, set())
+            new_voters = set(voter_names) - station_voters
+            station_voters |= new_voters
+            changed += len(new_voters)
+            for voter_name in new_voters:
+                first_station = self.voter_stations.setdefault(voter_name, station)
+                if first_station != station:
+                    self.conflicts.setdefault(voter_name, {first_station}).add(station)
+        return changed
+
+    def to_dict(self):
+        """
+        Export the whole state, in the form merge() takes.
+        """
+        return {
+            "format": STATION_COUNTS_FORMAT,
+            "counters": {station: {candidate_name: list(counter) for candidate_name, counter in candidate_counters.items()}
+                         for station, candidate_counters in self.counters.items()},
+            "voted": {station: sorted(voter_names) for station, voter_names in self.voted.items()},
+        }
+
+def station_delta(station, exported):
+    """
+    Export a station's counters and the voters since its last export, and
+    merge them into the exported state.
+
+    A candidate whose votes went up since the last export has their added
+    counter raised by the difference, and one whose votes went down (a removed
+    voter or candidate) their withdrawn counter; every counter is sent, changed
+    or not. The voters sent are those in data_manager.unexported_ballots whose
+    ballot still stands.
+
+    Args:
+        station (str): Name of this polling station
+        exported (StationCounts): What the station has exported so far
+
+    Returns:
+        dict: The delta, in the form StationCounts.merge() takes
+    """
+    with data_manager.state_lock:
+        current_votes = dict(data_manager.candidates.items())
+        registry = data_manager.registry
+        # A voter who voted again after a withdrawal is listed twice but sent once
+        voted_names = list(dict.fromkeys(registry.names[voter_id] for voter_id in data_manager.unexported_ballots
+                                         if registry.ballots[voter_id] != NO_VOTE))
+
+    exported_counters = exported.counters.get(station, {})
+    counters = {}
+    for candidate_name in current_votes.keys() | exported_counters.keys():
+        added, withdrawn = exported_counters.get(candidate_name, (0, 0))
+        change = current_votes.get(candidate_name, 0) - (added - withdrawn)
+        if change > 0:
+            added += change
+        elif change < 0:
+            withdrawn -= change
+        if added or withdrawn:
+            counters[candidate_name] = [added, withdrawn]
+
+    delta = {
+        "format": STATION_COUNTS_FORMAT,
+        "counters": {station: counters},
+        "voted": {station: voted_names},
+    }
+    exported.merge(delta)
+    return delta
+
+def read_counts_file(file_path):
+    """
+    Read an exported delta or saved state.
+
+    Returns:
+        dict: The export, as passed to StationCounts.merge()
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def write_counts_file(file_path, counts):
+    """
+    Write an export under a temporary name and rename it into place, so a
+    reader never sees half of it.
+
+    Args:
+        file_path (str): Path to write
+        counts (dict): The export
+    """
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(counts, file, ensure_ascii=False)
+        file.write("\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, file_path)
+
+class MergedCountLog:
+    """
+    The central count, saved as a log: the full count as of the last
+    compaction on the first line, then each export merged since, one per line.
+
+    A merge appends only the export it merged. The log is rewritten in full
+    only when the appended exports outgrow the full count, so the rewrites
+    cost at most as much again as the appends, and a merge costs time in
+    proportion to its export, averaged over the merges.
+    """
+
+    def __init__(self, file_path):
+        """
+        Load the log, or start an empty count if the file does not exist. A
+        torn last line (a crash in the middle of an append) is cut off, so
+        the next append starts on a line of its own.
+
+        Args:
+            file_path (str): Path of the log
+        """
+        self.file_path = file_path
+        self.counts = StationCounts()
+        self.compacted_size = 0
+        self.appended_size = 0
+        if not os.path.exists(file_path):
+            return
+        with open(file_path, 'rb') as file:
+            for line_number, line in enumerate(file):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self.counts.merge(json.loads(line))
+                except ValueError:
+                    break
+                if line_number == 0:
+                    self.compacted_size = len(line)
+                else:
+                    self.appended_size += len(line)
+        valid_length = self.compacted_size + self.appended_size
+        if valid_length != os.path.getsize(file_path):
+            with open(file_path, 'r+b') as file:
+                file.truncate(valid_length)
+
+    def merge(self, export):
+        """
+        Merge an export into the count and save it.
+
+        Args:
+            export (dict): A station export, as from export_station_delta()
+
+        Returns:
+            int: Number of counters and set entries that changed, as from
+                StationCounts.merge()
+        """
+        changed = self.counts.merge(export)
+        if not changed:
+            return 0
+        line = (json.dumps(export, ensure_ascii=False) + "\n").encode('utf-8')
+        if self.appended_size + len(line) > max(self.compacted_size, MIN_COMPACT_SIZE):
+            self.compact()
+        else:
+            with open(self.file_path, 'ab') as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+            self.appended_size += len(line)
+        return changed
+
+    def compact(self):
+        """
+        Rewrite the log as the full count on a single line.
+        """
+        write_counts_file(self.file_path, self.counts.to_dict())
+        self.compacted_size = os.path.getsize(self.file_path)
+        self.appended_size = 0
+
+def numbered_export_path(file_path, sequence):
+    """
+    Path of a station's numbered export, e.g. exports/A.000003.json for the
+    third export named exports/A.json.
+    """
+    base, extension = os.path.splitext(file_path)
+    return f"{base}.{sequence:06d}{extension}"
+
+def export_station_delta(station, file_path, state_path=STATION_STATE_FILE):
+    """
+    Write this station's counters and the voters since its last export to the
+    next numbered file after file_path, for the central count.
+
+    The station's exported state is saved, and its exported ballots
+    forgotten, only after the export is written. An export that fails is
+    sent again by the next one, and one that is written is never overwritten
+    by a later one. The saved state keeps the counters and the number of
+    exports written; the voters sent are the central count's to keep.
+
+    Args:
+        station (str): Name of this polling station
+        file_path (str): Path the numbered export files are named after
+        state_path (str): File keeping what the station has exported so far
+
+    Returns:
+        tuple: Contains:
+            - dict: The export written
+            - str: Path of the numbered file it was written to
+    """
+    exported_state = read_counts_file(state_path) if os.path.exists(state_path) else {}
+    exported = StationCounts()
+    if exported_state:
+        exported.merge(exported_state)
+    sequence = exported_state.get("exports", 0) + 1
+    with data_manager.state_lock:
+        exported_count = len(data_manager.unexported_ballots)
+        delta = station_delta(station, exported)
+    export_path = numbered_export_path(file_path, sequence)
+    write_counts_file(export_path, delta)
+    exported_state = exported.to_dict()
+    del exported_state["voted"]
+    exported_state["exports"] = sequence
+    write_counts_file(state_path, exported_state)
+    data_manager.forget_exported_ballots(exported_count)
+    return delta, export_path
+
+def merge_station_files(file_paths, state_path=MERGED_STATE_FILE):
+    """
+    Merge station exports into the central count and save it.
+
+    Args:
+        file_paths (iterable): Paths of station exports
+        state_path (str): Log keeping the central count
+
+    Returns:
+        StationCounts: The central count after the merge
+    """
+    merged = MergedCountLog(state_path)
+    for file_path in file_paths:
+        merged.merge(read_counts_file(file_path))
+    return merged.counts
+
+def follow_station_exports(directory, on_change, state_path=MERGED_STATE_FILE, interval=FOLLOW_INTERVAL):
+    """
+    Keep merging the station exports that appear in a directory into the
+    central count until interrupted. Only new or rewritten files are read.
+
+    Args:
+        directory (str): Directory the stations' .json exports arrive in
+        on_change (callable): Called with the central count after each merge that changed it
+        state_path (str): Log keeping the central count
+        interval (float): Seconds between looks at the directory
+    """
+    merged = MergedCountLog(state_path)
+    merged_files = {}
+    try:
+        while True:
+            changed = 0
+            with os.scandir(directory) as entries:
+                arrivals = sorted((entry.path, entry.stat().st_mtime_ns) for entry in entries
+                                  if entry.name.endswith(".json") and entry.is_file())
+            for file_path, modified in arrivals:
+                if merged_files.get(file_path) != modified:
+                    changed += merged.merge(read_counts_file(file_path))
+                    merged_files[file_path] = modified
+            if changed:
+                on_change(merged.counts)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,75 @@
+# ------------------------------------------
+# Recovery Tests - Snapshot and journal replay after a crash
+# ------------------------------------------
+#
+# Run with: python -m unittest test_recovery   (or python -m pytest)
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import data_manager
+import engine
+import journal
+
+class RecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, "snapshot.bin")
+        self.journal_path = os.path.join(self.directory.name, "journal.jsonl")
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        journal.close_journal()
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def start(self):
+        election = engine.ElectionEngine(self.snapshot_path, self.journal_path)
+        election.start()
+        return election
+
+    def vote(self, election, voter_number, candidate_name):
+        voter_name, signum = list(data_manager.voter_credentials.items())[voter_number]
+        self.assertEqual(election.cast_vote(voter_name, signum, candidate_name), engine.OK)
+
+    def test_snapshot_reset_vote_recovers_the_vote(self):
+        election = self.start()
+        for voter_number in range(3):
+            self.vote(election, voter_number, "java")
+        self.assertTrue(election.checkpoint())
+        data_manager.reset_data()
+        self.vote(election, 0, "python")
+        # A crash: nothing more is saved, and the next start recovers
+        election.close()
+
+        recovered = self.start()
+        self.assertEqual(recovered.tally(), {"dup": 0, "python": 1, "java": 0})
+        recovered.close()
+
+    def test_reset_without_snapshot_is_replayed(self):
+        election = self.start()
+        for voter_number in range(3):
+            self.vote(election, voter_number, "java")
+        data_manager.reset_data()
+        self.vote(election, 0, "python")
+        election.close()
+
+        recovered = self.start()
+        self.assertEqual(recovered.tally(), {"dup": 0, "python": 1, "java": 0})
+        recovered.close()
+
+    def test_versions_keep_rising_across_a_reset(self):
+        election = self.start()
+        self.vote(election, 0, "java")
+        version_before_reset = data_manager.data_version
+        data_manager.reset_data()
+        self.assertGreater(data_manager.data_version, version_before_reset)
+        election.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# ------------------------------------------
+# Vote Queue Tests - Results of a batch that fails part way
+# ------------------------------------------
+#
+# Run with: python -m unittest test_vote_queue   (or python -m pytest)
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+
+import data_manager
+import engine
+import journal
+import vote_queue
+
+class ApplyBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = contextlib.redirect_stdout(io.StringIO())
+        self.output.__enter__()
+        self.election = engine.ElectionEngine(os.path.join(self.directory.name, "snapshot.bin"),
+                                              os.path.join(self.directory.name, "journal.jsonl"))
+        self.election.start()
+        self.saved_election = engine.election
+        engine.election = self.election
+
+    def tearDown(self):
+        engine.election = self.saved_election
+        self.election.close()
+        journal.close_journal()
+        self.output.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def intent(self, voter_number, candidate_name, signum=None):
+        voter_name, voter_signum = list(data_manager.voter_credentials.items())[voter_number]
+        return (voter_name, voter_signum if signum is None else signum, candidate_name, (), Future())
+
+    def test_failed_batch_keeps_the_results_of_the_applied_votes(self):
+        batch = [self.intent(0, "java"),
+                 self.intent(1, "nobody"),
+                 # A SIGNUM that is not text stops the batch here
+                 self.intent(2, "java", signum=42),
+                 self.intent(3, "python")]
+        vote_queue.apply_batch(batch)
+
+        self.assertEqual(batch[0][4].result(), engine.OK)
+        self.assertEqual(batch[1][4].result(), engine.UNKNOWN_CANDIDATE)
+        self.assertIsInstance(batch[2][4].exception(), AttributeError)
+        self.assertIsInstance(batch[3][4].exception(), AttributeError)
+        self.assertEqual(self.election.tally()["java"], 1)
+        self.assertEqual(self.election.tally()["python"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
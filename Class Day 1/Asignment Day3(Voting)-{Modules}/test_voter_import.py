@@ -0,0 +1,45 @@
+# ------------------------------------------
+# Voter Import Tests - Header rows in a CSV voter roll
+# ------------------------------------------
+#
+# Run with: python -m unittest test_voter_import   (or python -m pytest)
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import data_manager
+import voter_import
+
+class HeaderRowTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.roll_path = os.path.join(self.directory.name, "roll.csv")
+        self.reject_path = os.path.join(self.directory.name, "rejects.txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_manager.initialize()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, text):
+        with open(self.roll_path, 'w', encoding='utf-8', newline='') as file:
+            file.write(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return voter_import.load_voter_file(self.roll_path, self.reject_path)
+
+    def test_full_header_is_skipped_and_reported(self):
+        self.assertEqual(self.load("Name,SIGNUM\nada,ada01\n"), (1, 1))
+        with open(self.reject_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "line 1: header row, skipped\n")
+        self.assertGreaterEqual(data_manager.registry.find("ada"), 0)
+
+    def test_voter_named_like_a_header_word_is_registered(self):
+        self.assertEqual(self.load("name,name01\nvoter,voter01\n"), (2, 0))
+        self.assertGreaterEqual(data_manager.registry.find("name"), 0)
+
+if __name__ == "__main__":
+    unittest.main()
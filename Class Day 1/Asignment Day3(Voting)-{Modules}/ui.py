@@ -2,6 +2,7 @@
 # User Interface Module
 # ------------------------------------------
 
+import console
 import data_manager
 import results
 
@@ -22,14 +23,46 @@ def display_candidates():
     for candidate in data_manager.candidates.keys():
         print("-", candidate.title())
 
-def display_results():
+def display_results(tally=None):
     """
     Display the current vote tally for all candidates.
+    
+    Args:
+        tally (dict, optional): Copy of the tally to show instead of the live one
     """
+    if tally is None:
+        tally = data_manager.candidates
     print("\n📊 Current Vote Tally:")
-    for candidate, vote_count in data_manager.candidates.items():
+    for candidate, vote_count in tally.items():
         print(f"- {candidate.title()}: {vote_count} votes")
 
+def display_standings(standings, field_size):
+    """
+    Display the leading candidates with their places.
+    
+    Args:
+        standings (list): (place, candidate name, votes) tuples, as from results.top_k()
+        field_size (int): Number of candidates standing
+    """
+    print(f"\n📊 Top {len(standings)} of {field_size} candidates:")
+    for place, candidate, vote_count in standings:
+        print(f"{place}. {candidate.title()}: {vote_count} votes")
+
+def display_station_counts(counts):
+    """
+    Display the central count merged from the polling stations' exports.
+    
+    Args:
+        counts (station_sync.StationCounts): The merged count
+    """
+    print(f"\n🏢 Merged count of {len(counts.counters)} polling stations:")
+    for candidate, vote_count in counts.tally.most_common():
+        print(f"- {candidate.title()}: {vote_count} votes")
+    if counts.conflicts:
+        print(f"\n⚠️ {len(counts.conflicts)} voters cast a ballot at more than one station:")
+        for voter_name, stations in sorted(counts.conflicts.items()):
+            print(f"- {voter_name.title()}: {', '.join(sorted(stations))}")
+
 def display_voting_history():
     """
     Display the complete voting record showing which voter voted for which candidate.
@@ -55,7 +88,7 @@ def display_main_menu():
     print("5. View Current Election Results (Saves state to file)")
     print("6. Exit")
     
-    choice = input("\nEnter your choice (1-6): ")
+    choice = console.ask("\nEnter your choice (1-6): ")
     return choice
 
 def display_admin_menu():
@@ -69,9 +102,10 @@ def display_admin_menu():
     print("3. Add Voter")
     print("4. Remove Voter")
     print("5. Save Current Election State")
-    print("6. Return to Main Menu")
+    print("6. Import Voters From File")
+    print("7. Return to Main Menu")
     
-    choice = input("\nEnter your choice (1-6): ")
+    choice = console.ask("\nEnter your choice (1-7): ")
     return choice
 
 def view_registered_voters():
@@ -111,16 +145,23 @@ def view_current_results():
     print("\n📊 Current Election Results 📊")
     print("===========================")
     
+    # Work from one copy so every figure comes from the same moment, even
+    # while votes are being recorded on other threads
+    state = data_manager.StateCopy(recent_count=5, top_count=results.TOP_CANDIDATES_SHOWN)
+    
     # Check if any votes have been cast
-    if not data_manager.voting_history:
+    if not state.votes_cast:
         print("⚠️ No votes have been cast yet.")
         return
     
-    # Display vote counts
-    display_results()
+    # Display vote counts; a large field shows only the front runners
+    if len(state.candidates) > results.TOP_CANDIDATES_SHOWN:
+        display_standings(state.top_candidates, len(state.candidates))
+    else:
+        display_results(state.candidates)
     
     # Display current leaders
-    winning_candidates, highest_vote_count = results.find_winners()
+    winning_candidates, highest_vote_count = state.leading_candidates, state.highest_vote_count
     
     if len(winning_candidates) == 1:
         print(f"\n🥇 Current leader: {winning_candidates[0].title()} with {highest_vote_count} votes")
@@ -130,9 +171,9 @@ def view_current_results():
             print(f"- {candidate.title()}")
     
     # Display voting progress
-    total_voters = len(data_manager.voter_credentials)
-    votes_cast = len(data_manager.voting_history)
-    votes_remaining = len(data_manager.eligible_voters)
+    total_voters = state.voter_count
+    votes_cast = state.votes_cast
+    votes_remaining = state.eligible_count
     
     if total_voters > 0:
         progress_percentage = (votes_cast / total_voters) * 100
@@ -141,7 +182,6 @@ def view_current_results():
     
     # Display recent voting activity
     print("\n🔄 Recent voting activity:")
-    # Get the last 5 votes (or fewer if there aren't that many)
-    recent_votes = list(data_manager.voting_history.items())[-5:]
-    for voter, candidate in recent_votes:
+    # The last 5 votes (or fewer if there aren't that many)
+    for voter, candidate in state.recent_votes:
         print(f"- {voter.title()} voted for {candidate.title()}")
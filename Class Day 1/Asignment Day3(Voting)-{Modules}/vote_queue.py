@@ -0,0 +1,114 @@
+# ------------------------------------------
+# Vote Queue Module - Thread-safe voting through a single writer thread
+# ------------------------------------------
+#
+# Producer threads (terminals, import workers, ...) submit vote intents and get
+# a Future for the result code. One writer thread takes the intents off the
+# queue in batches and applies each batch with ElectionEngine.cast_votes(), so
+# only the writer changes the tally, and each batch costs one lock acquisition
+# and one journal record instead of one per vote.
+#
+# Readers on other threads use data_manager.StateCopy (as ui.view_current_results
+# and file_manager.save_election_state do), which waits for at most one batch.
+
+import queue
+import threading
+from concurrent.futures import Future
+
+import engine
+
+# Largest number of votes the writer applies in one batch
+WRITER_BATCH_SIZE = 1024
+
+# Writer state
+vote_intents = queue.SimpleQueue()
+writer_thread = None
+
+# Queued in place of a vote intent to stop the writer
+STOP_WRITER = None
+
+def start_writer(batch_size=WRITER_BATCH_SIZE):
+    """
+    Start the writer thread. Until it is stopped, votes should only be cast
+    through submit_vote().
+
+    Args:
+        batch_size (int): Largest number of votes applied in one batch
+    """
+    global writer_thread
+
+    if writer_thread is not None:
+        return
+    writer_thread = threading.Thread(target=run_writer, args=(batch_size,), name="vote-writer", daemon=True)
+    writer_thread.start()
+
+def stop_writer():
+    """
+    Apply every vote already submitted, then stop the writer thread.
+    """
+    global writer_thread
+
+    if writer_thread is None:
+        return
+    vote_intents.put(STOP_WRITER)
+    writer_thread.join()
+    writer_thread = None
+
+def submit_vote(voter_name, signum, candidate_name, later_choices=()):
+    """
+    Queue a vote for the writer thread. Safe to call from any thread.
+
+    Args:
+        voter_name (str): Name of the voter
+        signum (str): SIGNUM given by the voter
+        candidate_name (str): Name of the chosen candidate
+        later_choices (iterable): Further candidates in order, for a ranked ballot
+
+    Returns:
+        Future: Resolves to the vote's result code, as from ElectionEngine.cast_vote()
+
+    Raises:
+        RuntimeError: If the writer thread is not running
+    """
+    if writer_thread is None:
+        raise RuntimeError("the vote writer is not running")
+    result = Future()
+    vote_intents.put((voter_name, signum, candidate_name, later_choices, result))
+    return result
+
+def run_writer(batch_size):
+    """
+    Writer thread body: apply queued votes in batches until told to stop.
+    """
+    stopping = False
+    while not stopping:
+        # Wait for one intent, then take whatever else is already queued
+        batch = [vote_intents.get()]
+        while len(batch) < batch_size:
+            try:
+                batch.append(vote_intents.get_nowait())
+            except queue.Empty:
+                break
+        if STOP_WRITER in batch:
+            stopping = True
+            batch.remove(STOP_WRITER)
+        if batch:
+            apply_batch(batch)
+
+def apply_batch(batch):
+    """
+    Cast a batch of queued votes and resolve their Futures. If the batch
+    fails part way, the votes handled before the failure keep their result
+    codes (those accepted are counted) and only the rest fail.
+
+    Args:
+        batch (list): (voter name, SIGNUM, candidate name, later choices, Future) intents
+    """
+    try:
+        result_codes = engine.election.cast_votes(intent[:4] for intent in batch)
+    except Exception as e:
+        result_codes = getattr(e, "result_codes", [])
+        for intent in batch[len(result_codes):]:
+            intent[4].set_exception(e)
+    for intent, result in zip(batch, result_codes):
+        intent[4].set_result(result)
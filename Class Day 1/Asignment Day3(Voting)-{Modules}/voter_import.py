@@ -0,0 +1,128 @@
+# ------------------------------------------
+# Voter Import Module - Streams voter rolls from CSV or JSONL files
+# ------------------------------------------
+#
+# A roll file is read row by row and registered in batches, so memory use
+# depends on the batch size and not on the size of the file. Bad rows are
+# reported and skipped rather than stopping the import.
+#
+#   CSV:   name,signum           (an optional name,signum header row is
+#                                 skipped and reported with the rejects)
+#   JSONL: {"name": "...", "signum": "..."}
+
+import csv
+import json
+
+import data_manager
+import voter_manager
+import engine
+
+# Number of voters registered per batch
+IMPORT_BATCH_SIZE = 50000
+
+def read_records(file, field_names, list_field=None):
+    """
+    Yield (line number, values, problem) for each record of an open CSV or
+    JSONL file. values holds one string per field, or is None when the record
+    is malformed, in which case problem says why.
+
+    A first CSV row that names every field, in order, is taken as a header:
+    it is yielded with values None so that it shows up among the rejects.
+
+    Args:
+        file: CSV or JSONL file opened in text mode
+        field_names (tuple): JSONL keys, in CSV column order
+        list_field (str, optional): JSONL key of an optional list of strings,
+            held by any CSV columns after the fields; when the record has
+            one, values ends with that list
+    """
+    if file.name.lower().endswith((".jsonl", ".ndjson")):
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                values = [str(record[field]) for field in field_names]
+                if list_field is not None and list_field in record:
+                    items = record[list_field]
+                    if not isinstance(items, list):
+                        raise TypeError(list_field)
+                    values.append([str(item) for item in items])
+                yield line_number, values, None
+            except (ValueError, KeyError, TypeError, AttributeError):
+                yield line_number, None, f"not a JSON object with {', '.join(field_names)}"
+        return
+
+    reader = csv.reader(file)
+    for row in reader:
+        if not "".join(row).strip():
+            continue
+        if len(row) != len(field_names) and (list_field is None or len(row) < len(field_names)):
+            yield reader.line_num, None, f"expected {len(field_names)} columns, found {len(row)}"
+            continue
+        # Only a full header is skipped, so a voter called "Name" is still read
+        if reader.line_num == 1 and [cell.strip().lower() for cell in row[:len(field_names)]] == list(field_names):
+            yield reader.line_num, None, "header row, skipped"
+            continue
+        if len(row) > len(field_names):
+            row[len(field_names):] = [row[len(field_names):]]
+        yield reader.line_num, row, None
+
+def load_voter_file(file_path, reject_path=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Register every valid voter in a roll file.
+
+    Entries are checked the same way as by ElectionEngine.add_voters(): duplicate
+    names, duplicate SIGNUMs (within the file or against the registry) and
+    malformed rows are rejected; the rest are registered in batches.
+
+    Args:
+        file_path (str): Path to a .csv or .jsonl roll file
+        reject_path (str, optional): File to write one line per rejected row to
+        batch_size (int): Number of voters registered at a time
+
+    Returns:
+        tuple: (number of voters added, number of rows rejected)
+    """
+    known_signums = set(filter(None, data_manager.registry.signums))
+    batch_names = []
+    batch_signums = []
+    batch_name_set = set()
+    added_count = 0
+    rejected_count = 0
+
+    reject_file = open(reject_path, 'w', encoding='utf-8') if reject_path else None
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            for line_number, values, reason in read_records(file, ("name", "signum")):
+                if values is not None:
+                    voter_name = engine.normalise(values[0])
+                    signum = engine.normalise(values[1])
+                    result = engine.check_new_voter(voter_name, signum, batch_name_set, known_signums)
+                    reason = None if result == engine.OK else engine.RESULT_MESSAGES[result]
+
+                if reason is not None:
+                    rejected_count += 1
+                    if reject_file is not None:
+                        reject_file.write(f"line {line_number}: {reason}\n")
+                    continue
+
+                batch_names.append(voter_name)
+                batch_signums.append(signum)
+                batch_name_set.add(voter_name)
+                known_signums.add(signum)
+
+                if len(batch_names) >= batch_size:
+                    voter_manager.register_voters(batch_names, batch_signums)
+                    added_count += len(batch_names)
+                    batch_names, batch_signums = [], []
+                    batch_name_set.clear()
+
+        if batch_names:
+            voter_manager.register_voters(batch_names, batch_signums)
+            added_count += len(batch_names)
+    finally:
+        if reject_file is not None:
+            reject_file.close()
+
+    return added_count, rejected_count
@@ -2,8 +2,12 @@
 # Voter Management Module
 # ------------------------------------------
 
+import console
 import data_manager
 import auth
+import journal
+import voter_import
+import engine
 
 def add_voter():
     """
@@ -20,7 +24,7 @@ def add_voter():
         return "🚫 Access denied. Admin authentication required to add voters."
     
     # Get voter details
-    new_voter_name = input("Enter the name of the new voter: ").lower().strip()
+    new_voter_name = console.ask("Enter the name of the new voter: ").lower().strip()
     
     # Validate input
     if not new_voter_name:
@@ -30,14 +34,15 @@ def add_voter():
         return f"⚠️ {new_voter_name.title()} is already registered."
     
     # Get SIGNUM credential
-    signum = input("Enter the SIGNUM credential for this voter: ").lower().strip()
+    signum = console.ask("Enter the SIGNUM credential for this voter: ").lower().strip()
     
     if not signum:
         return "⚠️ SIGNUM credential cannot be empty."
     
     # Add the new voter
-    data_manager.voter_credentials[new_voter_name] = signum
-    data_manager.eligible_voters[new_voter_name] = signum
+    result = engine.election.add_voter(new_voter_name, signum)
+    if result != engine.OK:
+        return f"⚠️ Voter not added: {engine.RESULT_MESSAGES[result]}."
     
     return f"✅ {new_voter_name.title()} has been added as a voter with SIGNUM: {signum}"
 
@@ -62,7 +67,7 @@ def remove_voter():
         print(f"- {voter_name.title()} ({status})")
     
     # Get voter to remove
-    voter_to_remove = input("\nEnter the name of the voter to remove: ").lower().strip()
+    voter_to_remove = console.ask("\nEnter the name of the voter to remove: ").lower().strip()
     
     # Validate input
     if not voter_to_remove:
@@ -73,18 +78,81 @@ def remove_voter():
     
     # Check if voter has already voted
     if voter_to_remove in data_manager.voting_history:
-        confirm = input(f"⚠️ WARNING: {voter_to_remove.title()} has already voted. Removing will affect election results. Continue? (Y/N): ").upper()
+        confirm = console.ask(f"⚠️ WARNING: {voter_to_remove.title()} has already voted. Removing will affect election results. Continue? (Y/N): ").upper()
         if confirm != "Y":
             return "Voter removal cancelled."
-        
-        # Remove their vote
-        voted_for = data_manager.voting_history[voter_to_remove]
-        data_manager.candidates[voted_for] -= 1
-        del data_manager.voting_history[voter_to_remove]
     
     # Remove from voter lists
-    del data_manager.voter_credentials[voter_to_remove]
-    if voter_to_remove in data_manager.eligible_voters:
-        del data_manager.eligible_voters[voter_to_remove]
+    engine.election.remove_voter(voter_to_remove)
+    
+    return f"✅ {voter_to_remove.title()} has been removed from the voter registry."
+
+def register_voter(voter_name, signum):
+    """
+    Add a voter to the registry and make them eligible to vote.
+    
+    Args:
+        voter_name (str): Name of the new voter
+        signum (str): SIGNUM credential for the voter
+    """
+    data_manager.registry.add(voter_name, signum)
+    data_manager.mark_changed("add_voter", voter_name)
+    journal.record("add_voter", voter=voter_name, signum=signum)
+
+def import_voters():
+    """
+    Register voters in bulk from a CSV or JSONL roll file after admin authentication.
+    
+    Returns:
+        str: Status message
+    """
+    print("\n📥 Import Voters From File 📥")
+    print("----------------------------")
+    
+    # First authenticate as admin
+    if not auth.authenticate_admin():
+        return "🚫 Access denied. Admin authentication required to import voters."
+    
+    file_path = console.ask("Enter the path of the voter roll (.csv or .jsonl): ").strip()
+    if not file_path:
+        return "⚠️ File path cannot be empty."
+    
+    reject_path = file_path + ".rejects.txt"
+    try:
+        added_count, rejected_count = voter_import.load_voter_file(file_path, reject_path)
+    except Exception as e:
+        return f"❌ Error importing voters: {str(e)}"
+    
+    message = f"✅ {added_count} voters have been added from {file_path}."
+    if rejected_count:
+        message += f"\n⚠️ {rejected_count} rows were rejected; see {reject_path} for details."
+    return message
+
+def register_voters(voter_names, signums):
+    """
+    Add a batch of new, distinct voters to the registry and make them eligible to vote.
     
-    return f"✅ {voter_to_remove.title()} has been removed from the voter registry."
\ No newline at end of file
+    Args:
+        voter_names (list): Names of the new voters
+        signums (list): SIGNUM credential for each voter
+    """
+    data_manager.registry.add_many(voter_names, signums)
+    data_manager.mark_changed("import_voters", str(len(voter_names)))
+    journal.record("add_voters", voters=voter_names, signums=signums)
+
+def deregister_voter(voter_name):
+    """
+    Remove a voter from the registry, withdrawing their vote if they cast one.
+    
+    Args:
+        voter_name (str): Name of the voter to remove
+    """
+    # Remove their vote
+    voter_id = data_manager.registry.find(voter_name)
+    if data_manager.registry.ballots[voter_id] != data_manager.NO_VOTE:
+        data_manager.withdraw_ballot(voter_id)
+    
+    # Remove from the registry
+    data_manager.registry.remove(voter_id)
+    data_manager.mark_changed("remove_voter", voter_name)
+    journal.record("remove_voter", voter=voter_name)
\ No newline at end of file
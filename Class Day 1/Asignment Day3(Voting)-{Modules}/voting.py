@@ -2,10 +2,12 @@
 # Voting Process Module
 # ------------------------------------------
 
+import console
 import data_manager
-import auth
 import ui
-import candidate_manager
+import journal
+import engine
+import results
 
 def is_eligible_to_vote(voter_name):
     """
@@ -17,7 +19,8 @@ def is_eligible_to_vote(voter_name):
     Returns:
         bool: True if voter is eligible, False otherwise
     """
-    return voter_name in data_manager.eligible_voters
+    voter_id = data_manager.registry.find(voter_name)
+    return voter_id >= 0 and data_manager.registry.is_eligible(voter_id) and not data_manager.voted_elsewhere(voter_id)
 
 def has_already_voted(voter_name):
     """
@@ -29,22 +32,53 @@ def has_already_voted(voter_name):
     Returns:
         bool: True if voter has already voted, False otherwise
     """
-    return voter_name in data_manager.voting_history
+    voter_id = data_manager.registry.find(voter_name)
+    return voter_id >= 0 and data_manager.registry.ballots[voter_id] != data_manager.NO_VOTE
 
-def record_vote(voter_name, candidate_name):
+def record_vote(voter_name, candidate_name, later_choices=(), scores=()):
     """
     Record a vote for a candidate and update the necessary tracking information.
     
     Args:
         voter_name (str): Name of the voter casting the vote
         candidate_name (str): Name of the candidate receiving the vote
+        later_choices (tuple): Further candidates in order of preference, for a ranked ballot
+        scores (tuple): (candidate name, score) pairs, for an approval or score ballot
     """
-    # Increment the vote count for the selected candidate
-    data_manager.candidates[candidate_name] += 1
-    # Record which candidate this voter selected
-    data_manager.voting_history[voter_name] = candidate_name
-    # Remove voter from eligible list to prevent re-voting
-    data_manager.eligible_voters.pop(voter_name)
+    voter_id = data_manager.registry.find(voter_name)
+    candidate_id = data_manager.candidate_ids[candidate_name]
+    # Increment the candidate's tally slot, store the choice by ID and
+    # clear the voter's eligibility bit to prevent re-voting
+    data_manager.cast_ballot(voter_id, candidate_id, later_choices, scores)
+    data_manager.mark_changed("vote", voter_name, candidate_name)
+    # Append the vote to the journal so it survives a crash
+    details = {}
+    if later_choices:
+        details["later_choices"] = list(later_choices)
+    if scores:
+        details["scores"] = scores
+    journal.record("vote", voter=voter_name, candidate=candidate_name, **details)
+
+def log_vote_batch(voter_names, candidate_names, later_choices=None, scores=None):
+    """
+    Journal a batch of votes already counted with data_manager.cast_ballot(),
+    as one change and one journal record.
+    
+    Args:
+        voter_names (list): Names of the voters, in voting order
+        candidate_names (list): Candidate chosen by each voter
+        later_choices (list, optional): Each voter's further choices, if any
+            ballot in the batch is ranked
+        scores (list, optional): Each voter's (candidate name, score) pairs,
+            if any ballot in the batch is an approval or score ballot
+    """
+    data_manager.mark_changed("ballot_batch", str(len(voter_names)))
+    details = {}
+    if later_choices is not None and any(later_choices):
+        details["later_choices"] = later_choices
+    if scores is not None and any(scores):
+        details["scores"] = scores
+    journal.record("votes", voters=voter_names, candidates=candidate_names, **details)
 
 def confirm_user_choice(prompt_message):
     """
@@ -57,7 +91,7 @@ def confirm_user_choice(prompt_message):
         bool: True for 'Y', False for 'N'
     """
     while True:
-        user_choice = input(prompt_message).upper()
+        user_choice = console.ask(prompt_message).upper()
         if user_choice in ["Y", "N"]:
             return user_choice == "Y"
         print("⚠️ Invalid input. Please try again.")
@@ -77,6 +111,41 @@ def handle_early_termination():
     
     return should_terminate
 
+def process_scored_vote(voter_name, signum_credential):
+    """
+    Take an authenticated voter's approval or score ballot.
+    
+    Args:
+        voter_name (str): Name of the voter
+        signum_credential (str): SIGNUM the voter authenticated with
+        
+    Returns:
+        bool: True if the ballot was successfully cast, False otherwise
+    """
+    if results.voting_method == results.APPROVAL:
+        approved = console.ask("Enter every candidate you approve of, separated by commas:\n").lower().split(",")
+        scores = [(candidate.strip(), 1) for candidate in approved if candidate.strip()]
+    else:
+        scores = []
+        for candidate in data_manager.candidates:
+            score = console.ask(f"Score for {candidate.title()} (0-{engine.MAX_SCORE}, Enter for 0): ").strip()
+            scores.append((candidate, int(score) if score.isdigit() else (-1 if score else 0)))
+    summary = ", ".join(f"{candidate.title()}: {score}" for candidate, score in scores if score)
+    if console.ask(f"You marked {summary or 'nobody'}. Confirm ballot? (Y/N): ").lower() != "y":
+        print("Vote cancelled.")
+        return False
+    
+    result = engine.election.cast_scored_vote(voter_name, signum_credential, scores)
+    if result != engine.OK:
+        print(f"❌ Voting failed: {engine.RESULT_MESSAGES[result].capitalize()}.")
+        return False
+    print("\n🎉 Congratulations! Your ballot has been cast.")
+    if not data_manager.eligible_voters:
+        print("🎯 All voters have completed their voting.")
+    else:
+        print("\n➡️ Please allow the next voter to proceed.\n")
+    return True
+
 def process_vote(voter_name):
     """
     Process a complete voting transaction for a voter.
@@ -88,24 +157,34 @@ def process_vote(voter_name):
         bool: True if vote was successfully cast, False otherwise
     """
     # Authentication step
-    signum_credential = input("Please enter your SIGNUM for authentication:\n").lower()
+    signum_credential = console.ask("Please enter your SIGNUM for authentication:\n").lower()
 
-    if auth.authenticate_voter(voter_name, signum_credential):
+    if engine.election.authenticate_voter(voter_name, signum_credential) == engine.OK:
         print("\n✅ Authentication successful! Proceed to vote.")
         ui.display_candidates()
         
         # Vote selection step
-        candidate_choice = input("Enter the name of the candidate you wish to vote for:\n").lower()
-        vote_confirmation = input(f"You chose {candidate_choice.title()}. Confirm vote? (Y/N): ").lower()
+        if results.voting_method in (results.APPROVAL, results.SCORE):
+            return process_scored_vote(voter_name, signum_credential)
+        
+        candidate_choice = console.ask("Enter the name of the candidate you wish to vote for:\n").lower()
+        later_choices = []
+        if results.voting_method != results.PLURALITY:
+            # Ranked ballot: further choices in order of preference
+            later_choices = [choice.strip() for choice in console.ask(
+                "Enter your next choices in order, separated by commas (or press Enter to skip):\n"
+            ).lower().split(",") if choice.strip()]
+        ranking = ", then ".join(choice.title() for choice in [candidate_choice] + later_choices)
+        vote_confirmation = console.ask(f"You chose {ranking}. Confirm vote? (Y/N): ").lower()
         
         if vote_confirmation != "y":
             print("Vote cancelled.")
             return False
         
         # Vote validation and recording
-        if candidate_manager.is_valid_candidate(candidate_choice):
+        result = engine.election.cast_vote(voter_name, signum_credential, candidate_choice, later_choices)
+        if result == engine.OK:
             print("\n🎉 Congratulations! Your vote has been cast for", candidate_choice.title())
-            record_vote(voter_name, candidate_choice)
             
             # Check if all eligible voters have voted
             if not data_manager.eligible_voters:
@@ -114,7 +193,7 @@ def process_vote(voter_name):
                 print("\n➡️ Please allow the next voter to proceed.\n")
             return True
         else:
-            print("❌ Voting failed: Candidate not recognized.")
+            print(f"❌ Voting failed: {engine.RESULT_MESSAGES[result].capitalize()}.")
             return False
     else:
         print("🚫 Authentication failed: SIGNUM mismatch. Vote not recorded.")
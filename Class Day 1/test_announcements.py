@@ -0,0 +1,79 @@
+# ------------------------------------------
+# Announcement Tests - Order of the spoken announcements
+# ------------------------------------------
+#
+# Run with: python -m unittest test_announcements   (or python -m pytest)
+
+import importlib.util
+import os
+import tempfile
+import threading
+import unittest
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "Asignment Day 2(Votting)-{text-to-speach experiment}.py")
+
+class RecordingSpeechEngine:
+    """
+    Speech engine that records what it is asked to say. Saying the first
+    message can be held back until release is set.
+    """
+
+    def __init__(self, hold_first=False):
+        self.spoken = []
+        self.release = threading.Event()
+        if not hold_first:
+            self.release.set()
+
+    def getProperty(self, name):
+        return None
+
+    def say(self, msg):
+        self.spoken.append(msg)
+
+    def runAndWait(self):
+        self.release.wait(5)
+
+def load_script(engine):
+    """
+    Load a fresh copy of the election script, speaking through engine.
+    """
+    spec = importlib.util.spec_from_file_location("tts_election", SCRIPT_PATH)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    script.load_speech_engine = lambda: engine
+    return script
+
+class AnnouncementTest(unittest.TestCase):
+
+    def setUp(self):
+        # No cached WAV files, so every announcement goes to the engine
+        self.directory = tempfile.TemporaryDirectory()
+        self.working_directory = os.getcwd()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.working_directory)
+        self.directory.cleanup()
+
+    def test_informational_messages_are_all_spoken_in_order(self):
+        engine = RecordingSpeechEngine()
+        script = load_script(engine)
+        script.announce("Authentication successful! Proceed to vote.")
+        script.announce("Please select your candidate from the list.")
+        script.finish_announcements()
+        self.assertEqual(engine.spoken, ["Authentication successful! Proceed to vote.",
+                                         "Please select your candidate from the list."])
+
+    def test_waiting_menu_announcement_is_superseded(self):
+        engine = RecordingSpeechEngine(hold_first=True)
+        script = load_script(engine)
+        script.announce("Welcome")
+        script.announce("Displaying registered voters", script.MENU_ANNOUNCEMENT)
+        script.announce("Displaying registered candidates", script.MENU_ANNOUNCEMENT)
+        engine.release.set()
+        script.finish_announcements()
+        self.assertEqual(engine.spoken, ["Welcome", "Displaying registered candidates"])
+
+if __name__ == "__main__":
+    unittest.main()